@@ -6,16 +6,26 @@ ARMY Stay Hub - Agoda 실시간 스크래핑 모듈
 """
 
 import requests
-import random
-import time
 import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
 import re
+from urllib.parse import urlparse
+
+from extraction_specs import get_card_spec
+from http_pool import get_http_session
+from rate_limiter import get_rate_limiter
+from page_parsing import make_soup, strainer, class_strainer, extract_next_data, extract_assigned_json
 
 
 class AgodaScraper:
+    # 카드 폴백용 요소 필터
+    HOTEL_ITEM_STRAINER = strainer('div', attrs={'data-selenium': 'hotel-item'})
+    PROPERTY_CARD_STRAINER = class_strainer('li', r'PropertyCard')
+
+    # 카드 필드 추출 스펙 (extraction_specs.CARD_SPECS["agoda"])
+    CARD_SPEC = get_card_spec("agoda")
+
     def __init__(self):
         # 요청 헤더 (일반 브라우저처럼 보이게)
         self.headers = {
@@ -37,11 +47,6 @@ class AgodaScraper:
         # 체크인/체크아웃 날짜 (콘서트 기준)
         self.concert_date = datetime(2026, 6, 12)  # D-Day 기준
 
-    def _random_delay(self, min_sec: float = 1.0, max_sec: float = 3.0):
-        """사람처럼 보이기 위한 랜덤 딜레이"""
-        delay = random.uniform(min_sec, max_sec)
-        time.sleep(delay)
-
     def _build_search_url(self, checkin: datetime, checkout: datetime, adults: int = 2) -> str:
         """Agoda 검색 URL 생성"""
         checkin_str = checkin.strftime("%Y-%m-%d")
@@ -76,19 +81,22 @@ class AgodaScraper:
         url = self._build_search_url(checkin, checkout)
         print(f"🔍 Agoda 검색 중: {url}")
 
+        host = urlparse(url).netloc
+        limiter = get_rate_limiter()
+
         try:
-            # 랜덤 딜레이 후 요청
-            self._random_delay(2.0, 5.0)
+            # 호스트별 요청 예산 대기
+            limiter.acquire(host)
 
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = get_http_session().get(url, headers=self.headers, timeout=30)
+            if response.status_code in (429, 503):
+                limiter.penalize(host, response.headers.get("Retry-After"))
             response.raise_for_status()
-
-            # HTML 파싱
-            soup = BeautifulSoup(response.text, 'html.parser')
+            limiter.reward(host)
 
             # Agoda는 JavaScript로 데이터를 로드하므로,
             # 초기 HTML에서 JSON 데이터를 추출해야 함
-            hotels = self._extract_hotels_from_html(soup, response.text)
+            hotels = self._extract_hotels_from_html(response.text)
 
             print(f"✅ {len(hotels)}개 호텔 데이터 수집 완료")
             return hotels
@@ -97,42 +105,42 @@ class AgodaScraper:
             print(f"❌ 스크래핑 실패: {e}")
             return []
 
-    def _extract_hotels_from_html(self, soup: BeautifulSoup, html: str) -> List[Dict]:
+    def _extract_hotels_from_html(self, html: str) -> List[Dict]:
         """
         HTML에서 호텔 데이터 추출
 
         Agoda는 서버사이드 렌더링과 클라이언트 하이드레이션을 함께 사용.
         초기 HTML에 __NEXT_DATA__ 또는 window.__STATE__ 형태로 JSON이 포함됨.
+        JSON은 DOM 없이 바로 잘라내고, 카드 폴백에서만 HTML을 파싱한다.
         """
         hotels = []
 
         # 방법 1: __NEXT_DATA__ 스크립트 태그에서 JSON 추출
-        script_tag = soup.find('script', {'id': '__NEXT_DATA__'})
-        if script_tag:
-            try:
-                data = json.loads(script_tag.string)
+        try:
+            data = extract_next_data(html)
+            if data:
                 # Agoda의 데이터 구조에서 호텔 목록 추출
                 hotels = self._parse_next_data(data)
                 if hotels:
                     return hotels
-            except (json.JSONDecodeError, KeyError) as e:
-                print(f"⚠️ __NEXT_DATA__ 파싱 실패: {e}")
-
-        # 방법 2: 페이지 내 JSON 데이터 패턴 검색
-        json_pattern = r'window\.__STATE__\s*=\s*(\{.*?\});'
-        match = re.search(json_pattern, html, re.DOTALL)
-        if match:
-            try:
-                data = json.loads(match.group(1))
+        except (json.JSONDecodeError, KeyError) as e:
+            print(f"⚠️ __NEXT_DATA__ 파싱 실패: {e}")
+
+        # 방법 2: window.__STATE__ JSON 추출
+        try:
+            data = extract_assigned_json(html, 'window.__STATE__')
+            if isinstance(data, dict):
                 hotels = self._parse_state_data(data)
                 if hotels:
                     return hotels
-            except (json.JSONDecodeError, KeyError) as e:
-                print(f"⚠️ __STATE__ 파싱 실패: {e}")
+        except (json.JSONDecodeError, KeyError) as e:
+            print(f"⚠️ __STATE__ 파싱 실패: {e}")
 
-        # 방법 3: HTML 요소에서 직접 추출 (폴백)
+        # 방법 3: HTML 요소에서 직접 추출 (폴백, 카드 요소만 파싱)
+        soup = make_soup(html, self.HOTEL_ITEM_STRAINER)
         hotel_cards = soup.find_all('div', {'data-selenium': 'hotel-item'})
         if not hotel_cards:
+            soup = make_soup(html, self.PROPERTY_CARD_STRAINER)
             hotel_cards = soup.find_all('li', class_=re.compile(r'PropertyCard'))
 
         for card in hotel_cards[:50]:  # 최대 50개
@@ -196,29 +204,12 @@ class AgodaScraper:
     def _parse_hotel_card(self, card) -> Optional[Dict]:
         """HTML 호텔 카드에서 데이터 추출"""
         try:
-            # 호텔명
-            name_el = card.find(['h3', 'span'], class_=re.compile(r'PropertyCard__HotelName|hotel-name'))
-            name = name_el.get_text(strip=True) if name_el else ''
-
-            # 가격
-            price_el = card.find(['span', 'div'], class_=re.compile(r'Price|price'))
-            price_text = price_el.get_text(strip=True) if price_el else '0'
-            price = self._parse_price_text(price_text)
-
-            # 평점
-            rating_el = card.find(['span', 'div'], class_=re.compile(r'Review|rating|score'))
-            rating = 0.0
-            if rating_el:
-                rating_text = rating_el.get_text(strip=True)
-                rating_match = re.search(r'(\d+\.?\d*)', rating_text)
-                if rating_match:
-                    rating = float(rating_match.group(1))
-
-            # 이미지
-            img_el = card.find('img')
-            image_url = ''
-            if img_el:
-                image_url = img_el.get('src') or img_el.get('data-src', '')
+            # 호텔명/가격/평점/이미지를 카드 한 번 순회로 추출
+            fields = self.CARD_SPEC.extract(card)
+            name = fields['name']
+            price = fields['price']
+            rating = float(fields['rating'])
+            image_url = fields['image_url']
 
             if name:
                 return {
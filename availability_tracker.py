@@ -21,6 +21,13 @@ AVAILABILITY_STATE_FILE = "availability_state.json"
 NOTIFICATION_LOG_FILE = "notification_log.json"
 
 
+def hotel_key(hotel: Dict) -> str:
+    """호텔 고유 키 (이름 + 플랫폼 해시, scrape_scheduler / search_planner도 이 키 사용)"""
+    name = hotel.get("name_en", hotel.get("name", ""))
+    platform = hotel.get("platform", "")
+    return hashlib.md5(f"{name}_{platform}".encode()).hexdigest()[:12]
+
+
 class AvailabilityTracker:
     """숙소 가용성 변화 추적"""
 
@@ -45,9 +52,7 @@ class AvailabilityTracker:
 
     def _get_hotel_key(self, hotel: Dict) -> str:
         """호텔 고유 키 생성"""
-        name = hotel.get("name_en", hotel.get("name", ""))
-        platform = hotel.get("platform", "")
-        return hashlib.md5(f"{name}_{platform}".encode()).hexdigest()[:12]
+        return hotel_key(hotel)
 
     def check_changes(self, current_hotels: List[Dict]) -> Dict:
         """
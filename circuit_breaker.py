@@ -0,0 +1,189 @@
+"""
+ARMY Stay Hub - 플랫폼별 서킷 브레이커
+
+플랫폼이 403 / 타임아웃을 연달아 돌려주기 시작하면 도시마다 다시 시도하면서
+매번 timeout(30초) + 요청 대기를 낭비한다. 연속 실패가 쌓이면 그 플랫폼을
+쿨다운 동안 건너뛰고, 쿨다운이 끝나면 요청 하나만 보내 회복 여부를 확인한다.
+
+상태 전이:
+- closed   : 정상. 연속 실패 FAILURE_THRESHOLD회 → open
+- open     : 요청 차단. 쿨다운 경과 → half_open
+- half_open: 프로브 요청 1개만 허용. 성공 → closed / 실패 → open (쿨다운 2배)
+             결과 없이 끝나면(release) half_open 그대로, 다음 요청이 다시 프로브
+
+브레이커 키:
+- 플랫폼 전체 ("Agoda")
+- 도시 × 플랫폼 ("Agoda:busan")
+
+상태는 JSON 파일에 저장해서 크론 실행 간에 유지한다.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+# ===== 서킷 브레이커 설정 =====
+CIRCUIT_STATE_FILE = "circuit_state.json"
+FAILURE_THRESHOLD = 3                 # 연속 실패 횟수
+COOLDOWN_SEC = 2 * 60 * 60            # 첫 쿨다운 (크론 1회 간격 정도)
+MAX_COOLDOWN_SEC = 24 * 60 * 60       # 최대 쿨다운
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_breakers: Optional["CircuitBreakers"] = None
+_breakers_lock = threading.Lock()
+
+
+class CircuitBreakers:
+    """키별 서킷 브레이커 모음 (파일 저장 지원)"""
+
+    def __init__(self, state_file: str = CIRCUIT_STATE_FILE,
+                 failure_threshold: int = FAILURE_THRESHOLD,
+                 cooldown_sec: float = COOLDOWN_SEC,
+                 max_cooldown_sec: float = MAX_COOLDOWN_SEC):
+        self.state_file = state_file
+        self.failure_threshold = failure_threshold
+        self.cooldown_sec = cooldown_sec
+        self.max_cooldown_sec = max_cooldown_sec
+        self._lock = threading.Lock()
+        self._probing = set()   # 이번 실행에서 프로브가 진행 중인 키
+        self.state: Dict[str, Dict] = self._load_state()
+
+    # ----- 저장 -----
+
+    def _load_state(self) -> Dict:
+        """저장된 상태 로드 (없거나 깨졌으면 빈 상태)"""
+        if not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def save(self):
+        """상태 저장 (임시 파일 → 교체)"""
+        with self._lock:
+            tmp_path = f"{self.state_file}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.state_file)
+
+    # ----- 판단 -----
+
+    @staticmethod
+    def keys_for(platform: str, city_key: str = None) -> List[str]:
+        """플랫폼 / 도시×플랫폼 브레이커 키"""
+        keys = [platform]
+        if city_key:
+            keys.append(f"{platform}:{city_key}")
+        return keys
+
+    def _entry(self, key: str) -> Dict:
+        return self.state.setdefault(key, {
+            "state": CLOSED,
+            "failures": 0,
+            "opened_at": 0.0,
+            "cooldown_sec": self.cooldown_sec,
+        })
+
+    def _would_allow(self, key: str, now: float) -> bool:
+        """요청 허용 여부 (상태 변경 없음, lock 보유 상태에서 호출)"""
+        entry = self.state.get(key)
+        if not entry or entry["state"] == CLOSED:
+            return True
+        if key in self._probing:
+            return False
+        return now - entry["opened_at"] >= entry["cooldown_sec"]
+
+    def is_blocked(self, keys: List[str]) -> bool:
+        """한 키라도 요청을 막고 있으면 True (프로브를 소모하지 않는 조회용)"""
+        now = time.time()
+        with self._lock:
+            return not all(self._would_allow(key, now) for key in keys)
+
+    def allow(self, keys: List[str]) -> bool:
+        """
+        모든 키가 허용할 때만 True
+
+        쿨다운이 끝난 브레이커는 half_open으로 바꾸고 이 요청을 프로브로 삼는다.
+        (한 키라도 막히면 어떤 프로브도 소모하지 않음)
+        """
+        now = time.time()
+        with self._lock:
+            if not all(self._would_allow(key, now) for key in keys):
+                return False
+
+            for key in keys:
+                entry = self.state.get(key)
+                if entry and entry["state"] != CLOSED:
+                    entry["state"] = HALF_OPEN
+                    self._probing.add(key)
+            return True
+
+    def record_success(self, keys: List[str]):
+        """성공 → closed 복귀"""
+        with self._lock:
+            for key in keys:
+                entry = self.state.get(key)
+                self._probing.discard(key)
+                if not entry:
+                    continue
+                if entry["state"] != CLOSED:
+                    print(f"✅ [{key}] 서킷 복구")
+                entry.update(state=CLOSED, failures=0, opened_at=0.0, cooldown_sec=self.cooldown_sec)
+
+    def release(self, keys: List[str]):
+        """
+        결과 없이 끝난 요청 (마감 / 요청 슬롯 대기 초과) → 프로브만 반납, 상태는 그대로
+
+        allow()가 half_open 프로브로 잡은 키를 풀지 않으면 이 프로세스가 끝날 때까지
+        그 키는 계속 막힌다.
+        """
+        with self._lock:
+            for key in keys:
+                self._probing.discard(key)
+
+    def record_failure(self, keys: List[str]):
+        """실패 → 연속 실패 누적, 임계치 도달 또는 프로브 실패 시 open"""
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                entry = self._entry(key)
+                entry["failures"] += 1
+
+                if entry["state"] == HALF_OPEN:
+                    # 프로브 실패 → 쿨다운 2배로 다시 차단
+                    entry["cooldown_sec"] = min(self.max_cooldown_sec, entry["cooldown_sec"] * 2)
+                    self._open(key, entry, now)
+                elif entry["state"] == CLOSED and entry["failures"] >= self.failure_threshold:
+                    self._open(key, entry, now)
+                self._probing.discard(key)
+
+    def _open(self, key: str, entry: Dict, now: float):
+        entry["state"] = OPEN
+        entry["opened_at"] = now
+        entry["opened_at_iso"] = datetime.fromtimestamp(now).isoformat()
+        print(f"🚫 [{key}] 서킷 차단 ({entry['failures']}회 연속 실패, "
+              f"{entry['cooldown_sec'] / 60:.0f}분 쿨다운)")
+
+    def open_keys(self) -> List[str]:
+        """현재 차단 중인 키 목록"""
+        with self._lock:
+            return [k for k, v in self.state.items() if v["state"] != CLOSED]
+
+
+def get_circuit_breakers() -> CircuitBreakers:
+    """프로세스 공유 브레이커 (최초 호출 시 파일에서 로드)"""
+    global _breakers
+    if _breakers is None:
+        with _breakers_lock:
+            if _breakers is None:
+                _breakers = CircuitBreakers(CIRCUIT_STATE_FILE)
+    return _breakers
@@ -0,0 +1,59 @@
+"""
+ARMY Stay Hub - 실행 마감 시각
+
+크론이 run_scraper.py를 하루 최대 10회 실행하므로, 느린 수집이 다음 실행과
+겹치지 않도록 실행마다 벽시계 마감 시각을 정하고 아래 단계까지 그대로 넘긴다.
+
+- 수집: 남은 작업은 마감이 지나면 시작하지 않음 (우선순위 순으로 실행)
+- 요청: 요청 타임아웃 / 요청 슬롯 대기 / 헤지 응답 대기를 남은 시간으로 제한
+  → 진행 중인 요청은 본문 청크마다 마감을 확인해서 끊음 (DeadlineExceeded)
+    (requests 타임아웃은 소켓 연산 하나에만 걸리므로 조금씩 계속 오는 응답은
+    타임아웃만으로는 끊기지 않음. 초과는 최대 청크 하나 대기 = MIN_REQUEST_TIMEOUT_SEC)
+- enrichment: 마감이 지나면 나머지 호텔은 이전 데이터 유지
+"""
+
+import time
+from typing import Optional
+
+
+# ===== 실행 시간 예산 =====
+RUN_TIME_BUDGET_SEC = 20 * 60     # 하루 10회 실행 간격보다 충분히 짧게
+PUBLISH_RESERVE_SEC = 30          # 수집 마감 후 enrichment/저장에 남겨둘 시간
+MIN_REQUEST_TIMEOUT_SEC = 1.0     # 마감 직전에도 요청 타임아웃은 이 값 이상
+
+
+class DeadlineExceeded(TimeoutError):
+    """마감 시각이 지나 진행 중인 요청을 중단함 (플랫폼 실패로 세지 않음)"""
+
+
+class Deadline:
+    """벽시계 마감 시각 (time.time() 기준)"""
+
+    def __init__(self, at: float):
+        self.at = at
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.time() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.at - time.time())
+
+    def expired(self) -> bool:
+        return time.time() >= self.at
+
+    def earlier(self, seconds: float) -> "Deadline":
+        """seconds만큼 앞당긴 마감 (다음 단계 몫을 남겨둘 때)"""
+        return Deadline(self.at - seconds)
+
+    def timeout(self, cap: float) -> float:
+        """요청 타임아웃 (기본값 cap과 남은 시간 중 작은 값)"""
+        return max(MIN_REQUEST_TIMEOUT_SEC, min(cap, self.remaining()))
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.0f}s)"
+
+
+def remaining_or_none(deadline: Optional[Deadline]) -> Optional[float]:
+    """마감이 없으면 None (무제한), 있으면 남은 초"""
+    return deadline.remaining() if deadline is not None else None
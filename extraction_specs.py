@@ -0,0 +1,156 @@
+"""
+ARMY Stay Hub - 플랫폼별 카드 추출 스펙
+
+호텔 카드(HTML)에서 이름/가격/평점/이미지/링크를 뽑는 규칙을 코드 대신 데이터로 정의한다.
+셀렉터가 바뀌면 CARD_SPECS만 고치면 된다.
+
+- 스펙은 모듈 로드 시 한 번만 컴파일 (정규식 포함)
+- 카드 하나당 하위 요소를 한 번만 순회하면서 모든 필드를 동시에 매칭
+  (필드마다 card.find()를 따로 부르지 않음. 필드별 결과는 find()와 같다 = 문서 순서상 첫 요소)
+
+필드 규칙:
+    tag      : 태그 이름 또는 리스트 (없으면 모든 태그)
+    attrs    : 정확히 일치해야 하는 속성 {"data-testid": "title"}
+    class    : 클래스 정규식 (대소문자 무시는 "(?i)" 접두사)
+    value    : "text" (get_text(strip=True)) / "@속성" / ["@src", "@data-src"] (앞에서부터 첫 값)
+    remove   : 정규식 적용 전에 지울 문자들 (예: ",₩")
+    pattern  : 값에서 뽑을 정규식, group: 그룹 번호 (기본 0)
+    type     : "int" / "float"
+    default  : 요소가 없거나 패턴이 안 맞을 때 값
+"""
+
+import re
+from typing import Dict, List
+
+
+# ===== 플랫폼별 카드 스펙 =====
+_PRICE = {"remove": ",", "pattern": r"[\d,]+", "type": "int", "default": 0}
+_RATING = {"pattern": r"(\d+\.?\d*)", "group": 1, "type": "float", "default": 0}
+_IMAGE = {"tag": "img", "value": ["@src", "@data-src"], "default": ""}
+
+CARD_SPECS = {
+    "agoda": {
+        "name": {"tag": ["h3", "span"], "class": r"PropertyCard__HotelName|hotel-name", "default": ""},
+        "price": {"tag": ["span", "div"], "class": r"Price|price", **_PRICE},
+        "rating": {"tag": ["span", "div"], "class": r"Review|rating|score", **_RATING},
+        "image_url": _IMAGE,
+    },
+    "booking": {
+        "name": {"tag": "div", "attrs": {"data-testid": "title"}, "default": ""},
+        "price": {"tag": "span", "attrs": {"data-testid": "price-and-discounted-price"}, **_PRICE, "remove": ",₩"},
+        "rating": {"tag": "div", "attrs": {"data-testid": "review-score"}, **_RATING},
+        "image_url": {"tag": "img", "attrs": {"data-testid": "image"}, "value": "@src", "default": ""},
+        "link": {"tag": "a", "attrs": {"data-testid": "title-link"}, "value": "@href", "default": None},
+    },
+    "goodchoice": {
+        "name": {"tag": ["h3", "strong", "a"], "class": r"(?i)name|title", "default": ""},
+        "price": {"tag": ["span", "strong"], "class": r"(?i)price|won", **_PRICE},
+        "rating": {"tag": ["span", "em"], "class": r"(?i)score|rating", **_RATING},
+        "image_url": _IMAGE,
+    },
+    "naver": {
+        "name": {"tag": ["h2", "h3", "span"], "class": r"(?i)name|title", "default": None},
+        "price": {"tag": ["span", "div"], "class": r"(?i)price", **_PRICE},
+    },
+    "yanolja": {
+        "name": {"tag": ["h2", "h3", "a"], "class": r"(?i)name|title", "default": None},
+    },
+    "coupang": {
+        "name": {"tag": ["h2", "h3", "span"], "class": r"(?i)name|title", "default": None},
+    },
+    "tripcom": {
+        "name": {"tag": ["h2", "h3", "a"], "class": r"(?i)name|title", "default": None},
+        "price": {"tag": ["span", "div"], "class": r"(?i)price", **_PRICE},
+    },
+}
+
+
+class FieldRule:
+    """컴파일된 필드 규칙"""
+
+    _CASTS = {"int": int, "float": float}
+
+    def __init__(self, field: str, rule: Dict):
+        self.field = field
+        tags = rule.get("tag")
+        self.tags = {tags} if isinstance(tags, str) else set(tags) if tags else None
+        self.attrs = list(rule.get("attrs", {}).items())
+        self.class_re = re.compile(rule["class"]) if rule.get("class") else None
+
+        value = rule.get("value", "text")
+        self.sources = [value] if isinstance(value, str) else list(value)
+        self.remove = rule.get("remove", "")
+        self.pattern = re.compile(rule["pattern"]) if rule.get("pattern") else None
+        self.group = rule.get("group", 0)
+        self.cast = self._CASTS.get(rule.get("type"))
+        self.default = rule.get("default")
+
+    def matches(self, el) -> bool:
+        if self.tags is not None and el.name not in self.tags:
+            return False
+        for key, expected in self.attrs:
+            if el.get(key) != expected:
+                return False
+        if self.class_re is not None:
+            classes = el.get("class") or []
+            if not any(self.class_re.search(c) for c in classes) and \
+                    not (classes and self.class_re.search(" ".join(classes))):
+                return False
+        return True
+
+    def value(self, el):
+        """매칭된 요소 → 후처리까지 끝난 값"""
+        raw = ""
+        for source in self.sources:
+            raw = el.get_text(strip=True) if source == "text" else el.get(source[1:])
+            if raw:
+                break
+        raw = raw or ""
+
+        if self.remove:
+            for ch in self.remove:
+                raw = raw.replace(ch, "")
+        if self.pattern is not None:
+            m = self.pattern.search(raw)
+            if not m:
+                return self.default
+            raw = m.group(self.group)
+        if self.cast is not None:
+            try:
+                return self.cast(raw)
+            except ValueError:
+                return self.default
+        return raw
+
+
+class CardSpec:
+    """카드 하나를 한 번 순회해서 모든 필드를 추출하는 컴파일된 스펙"""
+
+    def __init__(self, fields: Dict[str, Dict]):
+        self.rules: List[FieldRule] = [FieldRule(field, rule) for field, rule in fields.items()]
+
+    def extract(self, card) -> Dict:
+        result = {rule.field: rule.default for rule in self.rules}
+        pending = self.rules
+
+        for el in card.descendants:
+            if el.name is None:  # 텍스트 노드
+                continue
+            matched = [rule for rule in pending if rule.matches(el)]
+            if not matched:
+                continue
+            for rule in matched:
+                result[rule.field] = rule.value(el)
+            pending = [rule for rule in pending if rule not in matched]
+            if not pending:
+                break
+
+        return result
+
+
+# 모듈 로드 시 한 번만 컴파일
+COMPILED_CARD_SPECS = {name: CardSpec(fields) for name, fields in CARD_SPECS.items()}
+
+
+def get_card_spec(platform: str) -> CardSpec:
+    return COMPILED_CARD_SPECS[platform]
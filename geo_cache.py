@@ -0,0 +1,116 @@
+"""
+ARMY Stay Hub - 좌표 기반 지리 피처 캐시 (실행 간 유지)
+
+대부분의 호텔은 실행마다 좌표가 그대로인데 크론 실행마다 전부 다시 계산한다.
+좌표에서만 나오는 값(공연장 거리, 가장 가까운 지역, 가장 가까운 BTS 스팟,
+로컬 가이드 / 지도 스팟 목록)을 반올림 좌표 키로 JSON 파일에 저장한다.
+
+- 키: 위경도를 COORD_DIGITS 자리로 반올림 (약 0.1m)
+- 버전: 공연장 / LOCAL_SPOTS / AREAS 테이블 + GEO_FEATURE_VERSION 해시
+  → 테이블이 바뀌면 파일 전체를 버리고 새로 시작
+- 값은 스팟 위치(LOCAL_SPOTS 인덱스)와 거리만 저장하고 표시용 dict는 매번 만든다
+- LRU: 조회/저장 시 최근으로 옮기고 max_entries를 넘으면 오래된 것부터 삭제
+  (배치가 max_entries보다 크면 reserve()로 배치 크기까지 늘림 → 한 배치 안에서 서로 밀어내지 않음)
+- 저장된 값과 같은 값을 다시 넣으면 변경으로 치지 않음 → 바뀐 항목이 없으면 save()가 파일을 안 씀
+- 좌표가 없어 임의로 만든 좌표는 캐시하지 않음 (호출하는 쪽 책임)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional
+
+
+# ===== 지리 피처 캐시 설정 =====
+GEO_CACHE_FILE = "geo_features_cache.json"
+GEO_CACHE_CONFIG = {
+    "max_entries": 20000,     # 항목당 수백 바이트
+    "coord_digits": 6,        # 키 좌표 반올림 자릿수
+}
+GEO_FEATURE_VERSION = 1       # 피처 계산 방식이 바뀌면 올림 (캐시 무효화)
+
+
+def tables_version(*tables) -> str:
+    """지리 테이블(공연장 / 스팟 / 지역) 내용 해시"""
+    payload = json.dumps([GEO_FEATURE_VERSION, *tables], ensure_ascii=False, sort_keys=True)
+    return hashlib.md5(payload.encode()).hexdigest()[:12]
+
+
+class GeoFeatureCache:
+    """반올림 좌표 → 지리 피처 (LRU, 파일 저장 지원)"""
+
+    def __init__(self, cache_file: str = GEO_CACHE_FILE, version: str = "", config: Dict = None):
+        self.cache_file = cache_file
+        self.version = version
+        self.config = {**GEO_CACHE_CONFIG, **(config or {})}
+        self._lock = threading.Lock()
+        self.entries: "OrderedDict[str, Dict]" = self._load_entries()
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+
+    def _load_entries(self) -> "OrderedDict[str, Dict]":
+        if not os.path.exists(self.cache_file):
+            return OrderedDict()
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return OrderedDict()
+        if data.get("version") != self.version:
+            print("🗺️ 지리 테이블 변경 → 좌표 캐시 초기화")
+            return OrderedDict()
+        return OrderedDict(data.get("entries", {}))
+
+    def save(self):
+        """캐시 저장 (변경이 있을 때만, 임시 파일 → 교체, LRU 순서 유지)"""
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp_path = f"{self.cache_file}.tmp"
+            # json.dump는 파이썬 인코더로 조금씩 쓰므로 C 인코더(json.dumps)로 한 번에 직렬화
+            payload = json.dumps({"version": self.version, "updated_at": datetime.now().isoformat(),
+                                  "entries": self.entries}, ensure_ascii=False, separators=(',', ':'))
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.cache_file)
+            self._dirty = False
+
+    def key(self, lat: float, lng: float) -> str:
+        digits = self.config["coord_digits"]
+        return f"{round(lat, digits)},{round(lng, digits)}"
+
+    def get(self, lat: float, lng: float) -> Optional[Dict]:
+        key = self.key(lat, lng)
+        with self._lock:
+            features = self.entries.get(key)
+            if features is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return features
+
+    def reserve(self, count: int):
+        """이번 배치 좌표 수(count)만큼은 담을 수 있게 max_entries를 늘림 (줄이지는 않음)"""
+        with self._lock:
+            self.config["max_entries"] = max(self.config["max_entries"], count)
+
+    def put(self, lat: float, lng: float, features: Dict):
+        key = self.key(lat, lng)
+        with self._lock:
+            if self.entries.get(key) != features:
+                self.entries[key] = features
+                self._dirty = True
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.config["max_entries"]:
+                self.entries.popitem(last=False)
+                self._dirty = True
+
+    def report(self):
+        total = self.hits + self.misses
+        if total:
+            print(f"🗺️ 좌표 캐시: {self.hits}/{total} 적중 ({len(self.entries)}개 저장)")
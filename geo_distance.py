@@ -0,0 +1,55 @@
+"""
+ARMY Stay Hub - 호텔 × POI 거리 행렬 (벡터화 haversine)
+
+enrich_hotel은 호텔마다 공연장, LOCAL_SPOTS(가이드 / 지도용으로 두 번), BTS 스팟,
+AREAS까지 스칼라 _calc_distance를 수십 번 부른다. 배치 enrichment는 호텔 좌표를
+배열로 모아 호텔 × POI 거리 행렬을 한 번에 계산하고, 거리 기반 필드는 모두 그
+행렬의 행에서 꺼내 쓴다.
+
+- NumPy가 있으면 청크(ENRICH_CHUNK_SIZE 호텔) 단위 행렬 연산 (처음 행렬을 계산할 때 import)
+- 없으면 같은 식의 순수 파이썬 루프 (결과 형식 동일: 행 = 호텔별 거리 리스트)
+"""
+
+import importlib.util
+import math
+from typing import List, Sequence
+
+
+EARTH_RADIUS_KM = 6371
+ENRICH_CHUNK_SIZE = 10000        # 행렬 한 번에 계산할 호텔 수 (메모리 ≈ 청크 × POI × 8바이트 × 몇 배)
+
+# 선택 의존성 (pandas 설치 시 같이 들어옴)
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Haversine 거리 (km) - ARMYStayHubEngine._calc_distance와 같은 식"""
+    dlat = math.radians(lat2 - lat1)
+    dlng = math.radians(lng2 - lng1)
+    a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng/2)**2
+    return EARTH_RADIUS_KM * 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+
+
+def distance_matrix(lats: Sequence[float], lngs: Sequence[float],
+                    poi_lats: Sequence[float], poi_lngs: Sequence[float]) -> List[List[float]]:
+    """
+    호텔 × POI 거리 행렬 (km)
+
+    Returns:
+        호텔 순서대로 [POI별 거리] (파이썬 float 리스트, JSON 저장 / 정렬에 그대로 사용)
+    """
+    if not NUMPY_AVAILABLE:
+        return [[haversine_km(lat, lng, plat, plng) for plat, plng in zip(poi_lats, poi_lngs)]
+                for lat, lng in zip(lats, lngs)]
+
+    import numpy as np
+    lat1 = np.asarray(lats, dtype=np.float64)[:, None]
+    lng1 = np.asarray(lngs, dtype=np.float64)[:, None]
+    lat2 = np.asarray(poi_lats, dtype=np.float64)[None, :]
+    lng2 = np.asarray(poi_lngs, dtype=np.float64)[None, :]
+
+    # 스칼라 식과 같은 순서로 계산 (차이 → 라디안)
+    dlat = np.radians(lat2 - lat1)
+    dlng = np.radians(lng2 - lng1)
+    a = np.sin(dlat/2)**2 + np.cos(np.radians(lat1)) * np.cos(np.radians(lat2)) * np.sin(dlng/2)**2
+    return (EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))).tolist()
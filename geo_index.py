@@ -0,0 +1,178 @@
+"""
+ARMY Stay Hub - 위경도 공간 인덱스 (KD-tree)
+
+add_nearby가 호텔마다 다른 모든 호텔까지 거리를 계산하고 정렬하면 O(n² log n)이라
+호텔 수천 개만 돼도 실행 시간을 다 잡아먹는다. 좌표를 위경도 KD-tree(잎 노드당
+LEAF_SIZE개)로 나누고, 질의 지점에서 가까운 노드부터(거리 하한 순) 열어서
+k개 최근접 이웃을 찾는다. 공연장 근처처럼 한 곳에 몰린 데이터와 멀리 떨어진
+지방 호텔이 섞여 있어도 노드 크기가 밀도에 맞춰 나뉜다.
+
+정확성 (전수 비교 결과와 동일):
+- 순서는 (표시용 반올림 거리, 입력 순서) → 기존 stable sort와 같은 동점 처리
+- 남은 노드의 거리 하한이 현재 k번째 결과를 반올림해서 이길 수 있는 거리보다
+  크면 중단. 노드 박스까지의 haversine 하한:
+    위도 차 Δφ → 거리 ≥ R·Δφ
+    경도 차 Δλ → 거리 ≥ 2R·asin(cos φmax · sin(Δλ/2))   (φmax: 박스/질의 중 최대 |위도|)
+  (경도 차는 ±180 경계를 넘는 쪽도 고려)
+
+PoiIndex는 POI(LOCAL_SPOTS 같은 dict 목록)를 카테고리별 GeoIndex로 한 번 만들어 두고
+카테고리별 top-k / 반경 질의를 받는다 (호텔당 POI 전체를 훑지 않음).
+"""
+
+import heapq
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from geo_distance import haversine_km, EARTH_RADIUS_KM
+
+
+LEAF_SIZE = 16                   # 잎 노드 최대 점 수
+DISTANCE_EPSILON_KM = 1e-9       # 하한 / 거리 계산의 부동소수점 오차 여유
+
+
+class GeoIndex:
+    """점 목록 → KD-tree (점 번호 = 입력 순서)"""
+
+    def __init__(self, points: Sequence[Tuple[float, float]], leaf_size: int = LEAF_SIZE):
+        self.points = [(float(lat), float(lng)) for lat, lng in points]
+        self.leaf_size = max(1, leaf_size)
+        self.order = list(range(len(self.points)))
+        # 노드: [lat_lo, lat_hi, lng_lo, lng_hi, left, right, start, end] (잎은 left = -1)
+        self.nodes: List[list] = []
+        if self.points:
+            self._build(0, len(self.order))
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _build(self, start: int, end: int) -> int:
+        lats = [self.points[i][0] for i in self.order[start:end]]
+        lngs = [self.points[i][1] for i in self.order[start:end]]
+        node_id = len(self.nodes)
+        node = [min(lats), max(lats), min(lngs), max(lngs), -1, -1, start, end]
+        self.nodes.append(node)
+        if end - start <= self.leaf_size:
+            return node_id
+
+        # 넓은 쪽 축(경도는 위도에 따른 실제 길이로 환산)을 중앙값으로 분할
+        lat_span = node[1] - node[0]
+        lng_span = (node[3] - node[2]) * math.cos(math.radians((node[0] + node[1]) / 2))
+        axis = 0 if lat_span >= lng_span else 1
+        self.order[start:end] = sorted(self.order[start:end], key=lambda i: self.points[i][axis])
+        mid = (start + end) // 2
+        node[4] = self._build(start, mid)
+        node[5] = self._build(mid, end)
+        return node_id
+
+    @staticmethod
+    def _bound_km(node: list, lat: float, lng: float) -> float:
+        """질의 지점 → 노드 박스 안 모든 점까지 거리 하한"""
+        lat_lo, lat_hi, lng_lo, lng_hi = node[0], node[1], node[2], node[3]
+        dlat = max(0.0, lat_lo - lat, lat - lat_hi)
+        dlng = max(0.0, lng_lo - lng, lng - lng_hi)
+        # ±180 경계 건너편으로 더 가까울 수 있음
+        far = max(abs(lng - lng_lo), abs(lng - lng_hi))
+        dlng = max(0.0, min(dlng, 360.0 - far))
+
+        lat_bound = EARTH_RADIUS_KM * math.radians(dlat)
+        if not dlng:
+            return lat_bound
+        cos_min = math.cos(math.radians(max(abs(lat), abs(lat_lo), abs(lat_hi))))
+        lng_bound = 2 * EARTH_RADIUS_KM * math.asin(min(1.0, cos_min * math.sin(math.radians(dlng) / 2)))
+        return max(lat_bound, lng_bound)
+
+    def nearest(self, lat: float, lng: float, k: int,
+                skip: Optional[Callable[[int], bool]] = None,
+                precision: Optional[int] = 1,
+                radius_km: Optional[float] = None) -> List[Tuple[int, float]]:
+        """
+        k개 최근접 점
+
+        Args:
+            skip: skip(점 번호)가 True인 점은 제외 (자기 자신 / 같은 호텔)
+            precision: 정렬에 쓰는 거리 반올림 자릿수 (표시 값과 같은 순서, None이면 원래 거리)
+            radius_km: 이 거리(반올림 전)보다 먼 점은 제외
+
+        Returns:
+            [(점 번호, 거리 km)] - (반올림 거리, 점 번호) 순
+        """
+        if k <= 0 or not self.points:
+            return []
+        # 반올림 후 k번째와 같아질 수 있는 거리까지는 계속 탐색 (동점은 점 번호로 결정)
+        margin = (0.5 * 10 ** -precision if precision is not None else 0.0) + DISTANCE_EPSILON_KM
+
+        found: List[Tuple[Tuple[float, int], float]] = []
+        heap = [(self._bound_km(self.nodes[0], lat, lng), 0)]
+        while heap:
+            bound, node_id = heapq.heappop(heap)
+            if radius_km is not None and bound > radius_km + DISTANCE_EPSILON_KM:
+                break
+            if len(found) >= k and bound > found[k - 1][0][0] + margin:
+                break
+            node = self.nodes[node_id]
+            if node[4] >= 0:
+                for child in (node[4], node[5]):
+                    heapq.heappush(heap, (self._bound_km(self.nodes[child], lat, lng), child))
+                continue
+
+            for index in self.order[node[6]:node[7]]:
+                if skip is not None and skip(index):
+                    continue
+                p_lat, p_lng = self.points[index]
+                dist = haversine_km(lat, lng, p_lat, p_lng)
+                if radius_km is not None and dist > radius_km:
+                    continue
+                found.append(((round(dist, precision) if precision is not None else dist, index), dist))
+            found.sort(key=lambda item: item[0])
+            del found[k:]
+        return [(index, dist) for (_, index), dist in found]
+
+    def within(self, lat: float, lng: float, radius_km: float, k: int = None,
+               precision: Optional[int] = 1) -> List[Tuple[int, float]]:
+        """반경 안의 점 (가까운 순, k개까지)"""
+        return self.nearest(lat, lng, k or len(self.points), precision=precision, radius_km=radius_km)
+
+
+class PoiIndex:
+    """
+    카테고리별 POI 인덱스 (POI dict에는 "lat", "lng", "category" 필요)
+
+    질의 결과는 [(POI 위치, 거리 km)] - POI 위치는 spots 목록의 인덱스
+    """
+
+    def __init__(self, spots: Sequence[Dict], leaf_size: int = LEAF_SIZE):
+        self.spots = list(spots)
+        # 카테고리별 POI 위치 (원래 목록 순서 유지 → 동점 처리 동일)
+        self.positions: Dict[str, List[int]] = {}
+        for position, spot in enumerate(self.spots):
+            self.positions.setdefault(spot["category"], []).append(position)
+        self.indexes: Dict[str, GeoIndex] = {
+            category: GeoIndex([(self.spots[p]["lat"], self.spots[p]["lng"]) for p in positions], leaf_size)
+            for category, positions in self.positions.items()
+        }
+        self.all = GeoIndex([(s["lat"], s["lng"]) for s in self.spots], leaf_size)
+
+    def __len__(self) -> int:
+        return len(self.spots)
+
+    def categories(self) -> List[str]:
+        return list(self.positions)
+
+    def nearest(self, lat: float, lng: float, category: str, k: int,
+                precision: Optional[int] = 1) -> List[Tuple[int, float]]:
+        """카테고리에서 가까운 k개 (없는 카테고리는 빈 리스트)"""
+        index = self.indexes.get(category)
+        if index is None:
+            return []
+        positions = self.positions[category]
+        return [(positions[i], dist) for i, dist in index.nearest(lat, lng, k, precision=precision)]
+
+    def within(self, lat: float, lng: float, radius_km: float, k: int = None,
+               category: str = None, precision: Optional[int] = 1) -> List[Tuple[int, float]]:
+        """반경 안의 POI (category 없으면 전체, 가까운 순)"""
+        if category is None:
+            return self.all.within(lat, lng, radius_km, k, precision)
+        if category not in self.indexes:
+            return []
+        positions = self.positions[category]
+        return [(positions[i], dist) for i, dist in self.indexes[category].within(lat, lng, radius_km, k, precision)]
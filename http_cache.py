@@ -0,0 +1,247 @@
+"""
+ARMY Stay Hub - 디스크 HTTP 응답 캐시
+
+크론(하루 10회)마다 거의 같은 OTA 검색 페이지를 다시 받는 비용을 줄이기 위한 캐시.
+
+- 키: 정규화된 URL + 쿼리 파라미터 (sha256)
+- 저장: 본문 / ETag / Last-Modified / 수집 시각
+- TTL 이내: 네트워크 없이 캐시 응답 반환
+- TTL 경과: If-None-Match / If-Modified-Since 조건부 요청 → 304면 캐시 재사용
+- 용량 예산 초과 시 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+if TYPE_CHECKING:  # requests는 캐시 응답을 만들 때 import
+    import requests
+
+
+# ===== 캐시 설정 =====
+HTTP_CACHE_DIR = ".http_cache"
+HTTP_CACHE_TTL_SEC = 60 * 60                  # 1시간 동안은 재검증 없이 사용
+HTTP_CACHE_MAX_BYTES = 200 * 1024 * 1024      # 200MB
+HTTP_CACHE_ENABLED = True
+
+INDEX_FILE = "index.json"
+
+_cache: Optional["ResponseCache"] = None
+_cache_lock = threading.Lock()
+
+
+def normalize_url(url: str, params: dict = None) -> str:
+    """
+    캐시 키용 URL 정규화
+
+    - scheme/host 소문자
+    - 쿼리 파라미터 병합 후 정렬
+    - fragment 제거
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query.extend((str(k), str(v)) for k, v in params.items() if v is not None)
+    query.sort()
+
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path or "/",
+        urlencode(query),
+        "",
+    ))
+
+
+class ResponseCache:
+    """조건부 재검증을 지원하는 디스크 응답 캐시"""
+
+    def __init__(self, cache_dir: str = HTTP_CACHE_DIR, ttl_sec: float = HTTP_CACHE_TTL_SEC,
+                 max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl_sec = ttl_sec
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.index: Dict[str, Dict] = self._load_index()
+
+    # ----- 인덱스 -----
+
+    def _index_path(self) -> str:
+        return os.path.join(self.cache_dir, INDEX_FILE)
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.body")
+
+    def _load_index(self) -> Dict:
+        """인덱스 로드 (본문 파일이 없는 항목은 버림)"""
+        path = self._index_path()
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return {k: v for k, v in index.items() if os.path.exists(self._body_path(k))}
+
+    def _save_index(self):
+        """인덱스 저장 (임시 파일 → 교체)"""
+        path = self._index_path()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    # ----- 조회 -----
+
+    @staticmethod
+    def make_key(url: str, params: dict = None) -> str:
+        return hashlib.sha256(normalize_url(url, params).encode('utf-8')).hexdigest()
+
+    def lookup(self, url: str, params: dict = None) -> Optional[Dict]:
+        """캐시 항목 메타데이터 (없으면 None)"""
+        key = self.make_key(url, params)
+        with self._lock:
+            entry = self.index.get(key)
+            return dict(entry, key=key) if entry else None
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """TTL 이내인지"""
+        return time.time() - entry["fetched_at"] < self.ttl_sec
+
+    def conditional_headers(self, entry: Dict) -> Dict:
+        """재검증용 조건부 요청 헤더"""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def to_response(self, entry: Dict) -> Optional["requests.Response"]:
+        """캐시 항목을 requests.Response 형태로 복원"""
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        try:
+            with open(self._body_path(entry["key"]), 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+
+        with self._lock:
+            if entry["key"] in self.index:
+                self.index[entry["key"]]["last_used"] = time.time()
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.url = entry["url"]
+        response.encoding = entry.get("encoding")
+        response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+        response.headers["X-Cache"] = "HIT"
+        return response
+
+    # ----- 저장 -----
+
+    def store(self, url: str, params: dict, response: "requests.Response"):
+        """200 응답 저장"""
+        if response.status_code != 200:
+            return
+        if "no-store" in response.headers.get("Cache-Control", "").lower():
+            return
+
+        key = self.make_key(url, params)
+        body = response.content
+        tmp_path = f"{self._body_path(key)}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, self._body_path(key))
+
+        now = time.time()
+        with self._lock:
+            self.index[key] = {
+                "url": normalize_url(url, params),
+                "etag": response.headers.get("ETag", ""),
+                "last_modified": response.headers.get("Last-Modified", ""),
+                "encoding": response.encoding,
+                "headers": {"Content-Type": response.headers.get("Content-Type", "")},
+                "fetched_at": now,
+                "last_used": now,
+                "size": len(body),
+            }
+            self._evict()
+            self._save_index()
+
+    def mark_revalidated(self, entry: Dict, response: "requests.Response" = None):
+        """304 응답 → 수집 시각 갱신 (새 ETag가 오면 반영)"""
+        with self._lock:
+            current = self.index.get(entry["key"])
+            if not current:
+                return
+            current["fetched_at"] = time.time()
+            if response is not None:
+                current["etag"] = response.headers.get("ETag", current["etag"])
+                current["last_modified"] = response.headers.get("Last-Modified", current["last_modified"])
+            self._save_index()
+
+    def _evict(self):
+        """용량 예산 초과 시 LRU 삭제 (lock 보유 상태에서 호출)"""
+        total = sum(e["size"] for e in self.index.values())
+        if total <= self.max_bytes:
+            return
+
+        for key in sorted(self.index, key=lambda k: self.index[k]["last_used"]):
+            total -= self.index[key]["size"]
+            del self.index[key]
+            try:
+                os.remove(self._body_path(key))
+            except OSError:
+                pass
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            for key in list(self.index):
+                try:
+                    os.remove(self._body_path(key))
+                except OSError:
+                    pass
+            self.index = {}
+            self._save_index()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """공유 캐시 반환 (비활성화 시 None)"""
+    global _cache
+    if not HTTP_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache(HTTP_CACHE_DIR, HTTP_CACHE_TTL_SEC, HTTP_CACHE_MAX_BYTES)
+    return _cache
+
+
+def configure_response_cache(enabled: bool = None, cache_dir: str = None,
+                             ttl_sec: float = None, max_bytes: int = None):
+    """캐시 설정 변경 (다음 get_response_cache() 호출부터 적용)"""
+    global _cache, HTTP_CACHE_ENABLED, HTTP_CACHE_DIR, HTTP_CACHE_TTL_SEC, HTTP_CACHE_MAX_BYTES
+    with _cache_lock:
+        if enabled is not None:
+            HTTP_CACHE_ENABLED = enabled
+        if cache_dir is not None:
+            HTTP_CACHE_DIR = cache_dir
+        if ttl_sec is not None:
+            HTTP_CACHE_TTL_SEC = ttl_sec
+        if max_bytes is not None:
+            HTTP_CACHE_MAX_BYTES = max_bytes
+        _cache = None
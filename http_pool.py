@@ -0,0 +1,109 @@
+"""
+ARMY Stay Hub - 공유 HTTP 커넥션 풀
+
+모든 스크래퍼가 하나의 requests.Session을 공유해서
+호스트별 TCP/TLS 커넥션을 재사용한다 (keep-alive).
+
+- 호스트별 풀은 urllib3 PoolManager가 관리 (스레드 안전)
+- 풀 크기 / keep-alive 는 configure_http_pool()로 조정
+"""
+
+import socket
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+
+# ===== 커넥션 풀 설정 =====
+HTTP_POOL_CONFIG = {
+    "pool_connections": 16,     # 풀을 유지할 호스트 수
+    "pool_maxsize": 4,          # 호스트당 최대 동시 커넥션 수
+    "keepalive": True,          # TCP keep-alive 사용
+    "keepalive_idle_sec": 60,   # keep-alive 프로브 시작 전 유휴 시간
+}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """TCP keep-alive 소켓 옵션을 적용하는 HTTPAdapter"""
+
+    def __init__(self, keepalive: bool = True, keepalive_idle_sec: int = 60, **kwargs):
+        # HTTPAdapter.__init__ 안에서 init_poolmanager가 호출되므로 먼저 설정
+        self.keepalive = keepalive
+        self.keepalive_idle_sec = keepalive_idle_sec
+        super().__init__(**kwargs)
+
+    def _socket_options(self) -> list:
+        options = list(HTTPConnection.default_socket_options)
+        if not self.keepalive:
+            return options
+
+        options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        if hasattr(socket, "TCP_KEEPIDLE"):  # Linux
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, self.keepalive_idle_sec))
+        elif hasattr(socket, "TCP_KEEPALIVE"):  # macOS
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, self.keepalive_idle_sec))
+        return options
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self._socket_options()
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _build_session() -> requests.Session:
+    """설정값으로 새 세션 생성"""
+    session = requests.Session()
+    adapter = KeepAliveAdapter(
+        keepalive=HTTP_POOL_CONFIG["keepalive"],
+        keepalive_idle_sec=HTTP_POOL_CONFIG["keepalive_idle_sec"],
+        pool_connections=HTTP_POOL_CONFIG["pool_connections"],
+        pool_maxsize=HTTP_POOL_CONFIG["pool_maxsize"],
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """공유 세션 반환 (최초 호출 시 생성)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def configure_http_pool(pool_connections: int = None, pool_maxsize: int = None,
+                        keepalive: bool = None, keepalive_idle_sec: int = None):
+    """
+    커넥션 풀 설정 변경
+
+    기존 세션은 닫고, 다음 get_http_session() 호출 때 새 설정으로 다시 만든다.
+    """
+    global _session
+    updates = {
+        "pool_connections": pool_connections,
+        "pool_maxsize": pool_maxsize,
+        "keepalive": keepalive,
+        "keepalive_idle_sec": keepalive_idle_sec,
+    }
+    with _session_lock:
+        HTTP_POOL_CONFIG.update({k: v for k, v in updates.items() if v is not None})
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def close_http_session():
+    """공유 세션 종료 (프로세스 종료 전 정리용)"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -12,20 +12,42 @@ ARMY Stay Hub - 다중 플랫폼 한국 OTA 스크래퍼
 주의: 개인 MVP용 소량 스크래핑. 상업적 대규모 사용 금지.
 """
 
-import requests
+import asyncio
+import queue
 import random
-import time
+import threading
 import json
+import math
 import re
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, List, Dict, Optional, Tuple
 from abc import ABC, abstractmethod
-from urllib.parse import urlencode, quote
-
-try:
-    from bs4 import BeautifulSoup
-except ImportError:
-    BeautifulSoup = None
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, quote, urlparse, urlsplit, urlunsplit, parse_qsl
+
+from circuit_breaker import get_circuit_breakers
+from deadline import Deadline, DeadlineExceeded, remaining_or_none
+from extraction_specs import get_card_spec
+from http_cache import get_response_cache, normalize_url
+from rate_limiter import get_rate_limiter
+from request_hedging import get_latency_tracker, hedged_call, retry_delay, HedgeCancelled, RETRY_CONFIG
+from page_parsing import (
+    make_soup, strainer, class_strainer, extract_next_data, extract_assigned_json, JSON_LD_ONLY,
+    BS4_AVAILABLE,
+    NextDataStream,
+)
+from response_archive import get_response_archive
+from scrape_queue import get_scrape_queue, format_date
+from scrape_scheduler import get_scrape_scheduler, cell_key
+from scraper_registry import get_scraper_registry, GLOBAL_PLATFORMS
+from yield_bandit import get_yield_bandit
+
+# requests / bs4는 실제 요청 / 파싱할 때 import (모듈 import만으로는 로드하지 않음)
+if TYPE_CHECKING:
+    import requests
+
+if not BS4_AVAILABLE:
     print("⚠️ BeautifulSoup not installed. Run: pip install beautifulsoup4")
 
 
@@ -84,9 +106,112 @@ CITIES = {
 # 기본 도시 목록 (스크래핑 순서)
 DEFAULT_CITIES = ["goyang", "hongdae", "seongsu", "gwanghwamun", "busan", "paju"]
 
+# 스트리밍 다운로드 청크 크기
+STREAM_CHUNK_BYTES = 64 * 1024
+
+# 페이지 넘김 설정
+PAGINATION = {
+    "max_pages": 5,          # 작업(도시 × 플랫폼)당 최대 페이지 수
+    "city_budget": 150,      # 작업당 최대 호텔 수
+}
+
+# 바가지 기준 (ConcertHotelRecommender와 같은 reddit_fan_analysis.json 값 사용)
+FAN_ANALYSIS_FILE = "reddit_fan_analysis.json"
+DEFAULT_GOUGING_THRESHOLD_USD = 200
+KRW_PER_USD = 1350
+
+_gouging_threshold_krw: Optional[int] = None
+
+
+def get_gouging_threshold_krw() -> int:
+    """팬 분석의 gouging_threshold_usd를 원화로 (파일 없으면 기본 200달러)"""
+    global _gouging_threshold_krw
+    if _gouging_threshold_krw is None:
+        threshold_usd = DEFAULT_GOUGING_THRESHOLD_USD
+        try:
+            with open(FAN_ANALYSIS_FILE, 'r', encoding='utf-8') as f:
+                price_range = json.load(f).get("hotel_matching_criteria", {}).get("price_range_usd", {})
+            threshold_usd = price_range.get("gouging_threshold_usd", threshold_usd)
+        except (OSError, json.JSONDecodeError):
+            pass
+        _gouging_threshold_krw = int(threshold_usd * KRW_PER_USD)
+    return _gouging_threshold_krw
+
+# 파이프라인 엔진 설정 (engine="pipeline")
+PIPELINE_CONFIG = {
+    "parse_workers": None,   # 파싱 프로세스 수 (None: CPU 코어 수)
+    "max_pending": 8,        # 진행 중 + 결과 큐에 쌓일 수 있는 최대 작업 수
+}
+
+
+class PageCollector:
+    """
+    페이지별 결과 누적 + 중단 규칙
+
+    다음 페이지를 받지 않는 경우:
+    - 새 호텔이 하나도 없는 페이지 (마지막 페이지 반복 / 페이지 파라미터 무시)
+    - 가격 오름차순 검색에서 페이지 최고가가 바가지 기준 초과 (뒤는 더 비쌈)
+    - 작업당 호텔 수 예산 도달
+    """
+
+    def __init__(self, scraper: "BaseScraper", budget: int = None):
+        self.scraper = scraper
+        self.budget = budget or PAGINATION["city_budget"]
+        self.hotels: List[Dict] = []
+        self._seen = set()
+
+    @staticmethod
+    def hotel_id(hotel: Dict) -> Tuple[str, str]:
+        return hotel.get("name", ""), hotel.get("booking_url", "").split("?")[0]
+
+    def add(self, page_hotels: List[Dict]) -> bool:
+        """페이지 결과 추가 → 다음 페이지를 받을지 여부"""
+        new_hotels = []
+        for hotel in page_hotels:
+            key = self.hotel_id(hotel)
+            if key not in self._seen:
+                self._seen.add(key)
+                new_hotels.append(hotel)
+
+        if not new_hotels:
+            return False
+
+        self.hotels.extend(new_hotels[:self.budget - len(self.hotels)])
+        if len(self.hotels) >= self.budget:
+            return False
+
+        if self.scraper.SORTED_BY_PRICE:
+            prices = [h["price_krw"] for h in new_hotels if h.get("price_krw")]
+            if prices and max(prices) > get_gouging_threshold_krw():
+                return False
+        return True
+
 
 class BaseScraper(ABC):
-    """모든 OTA 스크래퍼의 베이스 클래스"""
+    """
+    모든 OTA 스크래퍼의 베이스 클래스
+
+    수집은 두 단계로 나뉜다:
+    - fetch: _build_url → _make_request (I/O)
+    - parse: _parse_response (CPU, 원본 HTML만으로 동작 → 다른 프로세스에서도 실행 가능)
+    """
+
+    # 플랫폼별 추가 요청 헤더
+    REQUEST_HEADERS: Dict[str, str] = {}
+
+    # 페이지 파라미터: PAGE_SIZE가 있으면 오프셋(0, 25, 50...), 없으면 페이지 번호(1, 2, 3...)
+    PAGE_PARAM = "page"
+    PAGE_SIZE: Optional[int] = None
+
+    # 검색 URL이 가격 오름차순 정렬인지 (바가지 기준 초과 시 페이지 중단에 사용)
+    SORTED_BY_PRICE = False
+
+    # 스트리밍 다운로드: __NEXT_DATA__가 다 도착하면 나머지 본문은 받지 않음
+    # (파싱이 __NEXT_DATA__만 쓰는 플랫폼만 켬 - HTML 카드 폴백이 있으면 본문 전체가 필요)
+    STREAM_NEXT_DATA = False
+
+    # 응답 본문 최대 크기 (넘으면 거기까지만 받고 연결 종료)
+    MAX_BODY_BYTES = 5 * 1024 * 1024
 
     def __init__(self, city_key: str = "goyang"):
         self.name = "Base"
@@ -94,8 +219,18 @@ class BaseScraper(ABC):
         self.base_url = ""
 
         # 도시 설정
-        self.city_key = city_key
-        self.city_config = CITIES.get(city_key, CITIES["goyang"])
+        self.set_city(city_key)
+
+        # 검색 인원 (성인 수)
+        self.adults = 2
+
+        # 실제 네트워크 요청 수 (캐시 적중 제외, 수익률 통계용)
+        # 헤지 요청은 헤지 풀 스레드에서 세므로 lock으로 보호
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+
+        # 실행 마감 시각 (작업 실행 시 설정, None이면 무제한)
+        self.deadline: Optional[Deadline] = None
 
         # 공통 헤더
         self.headers = {
@@ -107,10 +242,20 @@ class BaseScraper(ABC):
             "Upgrade-Insecure-Requests": "1",
         }
 
+    def set_city(self, city_key: str):
+        """검색 도시 설정 (인스턴스를 도시 간 재사용할 때 호출)"""
+        self.city_key = city_key
+        self.city_config = CITIES.get(city_key, CITIES["goyang"])
+
         # 지역 설정 (도시 기반)
         self.target_coords = {"lat": self.city_config["lat"], "lng": self.city_config["lng"]}
         self.target_areas = self.city_config["keywords"]
 
+    @property
+    def search_keyword(self) -> str:
+        """국내 OTA 검색어 (도시 한글명)"""
+        return self.city_config["name_kr"]
+
     def _get_random_user_agent(self) -> str:
         """랜덤 User-Agent 선택"""
         agents = [
@@ -122,35 +267,288 @@ class BaseScraper(ABC):
         ]
         return random.choice(agents)
 
-    def _random_delay(self, min_sec: float = 2.0, max_sec: float = 5.0):
-        """사람처럼 보이기 위한 랜덤 딜레이"""
-        delay = random.uniform(min_sec, max_sec)
-        time.sleep(delay)
+    def _make_request(self, url: str, params: dict = None, headers: dict = None) -> Optional["requests.Response"]:
+        """안전한 HTTP 요청 (공유 커넥션 풀 + 디스크 캐시 + 서킷 브레이커 + 호스트별 요청 스케줄러)"""
+        import requests
+        from http_pool import get_http_session
+
+        cache = get_response_cache()
+        cached = cache.lookup(url, params) if cache else None
+
+        # TTL 이내 캐시는 네트워크 없이 바로 사용
+        if cached and cache.is_fresh(cached):
+            response = cache.to_response(cached)
+            if response is not None:
+                print(f"💾 [{self.name}] 캐시 사용")
+                # 캐시에서 나온 페이지도 이번 수집 기록으로 남김 (내용 주소 → 본문은 중복 저장 안 됨)
+                self._archive_response(response)
+                return response
+
+        # 실행 마감이 지났으면 새 요청을 보내지 않음
+        if self.deadline is not None and self.deadline.expired():
+            print(f"⏰ [{self.name}] 마감 시간 초과, 요청 건너뜀")
+            return None
+
+        # 연속 실패로 차단된 플랫폼(또는 도시×플랫폼)은 대기 없이 건너뜀
+        breakers = get_circuit_breakers()
+        breaker_keys = breakers.keys_for(self.name, self.city_key)
+        if not breakers.allow(breaker_keys):
+            print(f"🚫 [{self.name}] 서킷 차단 중, 건너뜀")
+            return None
+
+        host = urlparse(url).netloc
+        limiter = get_rate_limiter()
+        latency = get_latency_tracker()
+
+        # 요청마다 헤더 사본 생성 (self.headers는 동시 요청 간 공유되므로 수정 금지)
+        request_headers = {**self.headers, "User-Agent": self._get_random_user_agent()}
+        if headers:
+            request_headers.update(headers)
+        if cached:
+            request_headers.update(cache.conditional_headers(cached))
+
+        def send(cancelled: Optional[threading.Event] = None) -> "requests.Response":
+            # 플랫폼 p99 기반 타임아웃, 마감이 있으면 남은 시간으로 제한
+            # (소켓 연산당 타임아웃 → 본문 수신 중 마감은 _read_body가 확인)
+            timeout = latency.timeout_for(self.name)
+            if self.deadline is not None:
+                timeout = self.deadline.timeout(timeout)
+            started = time.monotonic()
+            try:
+                result = get_http_session().get(url, headers=request_headers, params=params,
+                                                timeout=timeout, stream=True)
+                self._read_body(result, cancelled)
+            except requests.exceptions.Timeout:
+                # 실제 지연은 모름 (타임아웃보다 김) → 지연 값이 아니라 타임아웃으로 기록
+                latency.record_timeout(self.name)
+                raise
+            latency.record(self.name, time.monotonic() - started)
+            return result
+
+        def can_hedge() -> bool:
+            # 헤지 요청은 호스트 토큰이 바로 있을 때만 (요청 예산 초과 금지)
+            if not limiter.try_acquire(host):
+                return False
+            self._count_request()
+            return True
 
-    def _make_request(self, url: str, params: dict = None) -> Optional[requests.Response]:
-        """안전한 HTTP 요청"""
         try:
-            self._random_delay()
-            self.headers["User-Agent"] = self._get_random_user_agent()
-
-            response = requests.get(
-                url,
-                headers=self.headers,
-                params=params,
-                timeout=30
-            )
+            response = None
+            last_error = None
+            for attempt in range(RETRY_CONFIG["max_attempts"]):
+                if attempt:
+                    delay = retry_delay(attempt)
+                    if self.deadline is not None and self.deadline.remaining() <= delay:
+                        break
+                    print(f"🔁 [{self.name}] 재시도 {attempt}/{RETRY_CONFIG['max_attempts'] - 1} ({delay:.1f}초 후)")
+                    time.sleep(delay)
+
+                # 호스트별 요청 예산 대기 (다른 호스트 요청은 막지 않음, 마감까지만)
+                if not limiter.acquire(host, timeout=remaining_or_none(self.deadline)):
+                    print(f"⏰ [{self.name}] 마감 전에 요청 슬롯을 얻지 못해 건너뜀")
+                    break
+                self._count_request()
+
+                try:
+                    response = hedged_call(send, latency.hedge_delay(self.name), can_hedge, self.name,
+                                           deadline=self.deadline)
+                except DeadlineExceeded as e:
+                    # 마감으로 끊은 요청은 플랫폼 실패가 아님 (재시도 없음, 프로브만 반납)
+                    print(f"⏰ [{self.name}] {e}")
+                    breakers.release(breaker_keys)
+                    return None
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    last_error = e
+                    print(f"⚠️ [{self.name}] 요청 실패: {e}")
+                    continue
+
+                # 429 / 503 → 해당 호스트만 백오프 (다음 시도의 토큰 대기에 반영)
+                if response.status_code in (429, 503):
+                    limiter.penalize(host, response.headers.get("Retry-After"))
+                else:
+                    limiter.reward(host)
+
+                if response.status_code in RETRY_CONFIG["retry_statuses"] \
+                        and attempt < RETRY_CONFIG["max_attempts"] - 1:
+                    response.close()
+                    response = None
+                    continue
+                break
+
+            if response is None:
+                if last_error is not None:
+                    print(f"❌ [{self.name}] 요청 실패: {last_error}")
+                    breakers.record_failure(breaker_keys)
+                else:
+                    # 결과 없이 끝남 (요청 슬롯 / 마감) → 서킷 상태는 그대로, 프로브만 반납
+                    breakers.release(breaker_keys)
+                return None
+
+            if response.status_code < 400:
+                breakers.record_success(breaker_keys)
+
+            # 304 Not Modified → 캐시 본문 재사용
+            if response.status_code == 304 and cached:
+                cache.mark_revalidated(cached, response)
+                cached_response = cache.to_response(cached)
+                if cached_response is not None:
+                    print(f"💾 [{self.name}] 변경 없음 (304), 캐시 재사용")
+                    self._archive_response(cached_response)
+                    return cached_response
+
             response.raise_for_status()
+            if cache:
+                cache.store(url, params, response)
+            self._archive_response(response)
             return response
 
         except requests.exceptions.RequestException as e:
             print(f"❌ [{self.name}] 요청 실패: {e}")
+            breakers.record_failure(breaker_keys)
             return None
 
+    def _count_request(self):
+        with self._count_lock:
+            self.request_count += 1
+
+    def _read_body(self, response: "requests.Response", cancelled: Optional[threading.Event] = None):
+        """
+        스트리밍 응답 본문을 청크 단위로 읽기
+
+        - MAX_BODY_BYTES에서 중단
+        - STREAM_NEXT_DATA 플랫폼은 __NEXT_DATA__ 스크립트가 다 도착하면 중단
+        - 실행 마감이 지나면 DeadlineExceeded, 헤지에서 지면(cancelled 설정) HedgeCancelled
+          → 소켓을 닫아서 중단 (잘린 본문은 쓰지 않고, 커넥션도 재사용하지 않음)
+        읽은 만큼을 response.content로 고정하고 연결을 닫는다.
+        """
+        import requests
+        watcher = NextDataStream() if self.STREAM_NEXT_DATA else None
+        body = bytearray()
+        aborted = False
+        try:
+            chunks = self._body_chunks(response)
+            while True:
+                if cancelled is not None and cancelled.is_set():
+                    aborted = True
+                    raise HedgeCancelled(f"[{self.name}] 헤지에서 짐, 본문 수신 중단 ({len(body) // 1024}KB)")
+                if self.deadline is not None and self.deadline.expired():
+                    aborted = True
+                    raise DeadlineExceeded(f"마감 시간 초과, 본문 수신 중단 ({len(body) // 1024}KB)")
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                body += chunk
+                if len(body) >= self.MAX_BODY_BYTES:
+                    print(f"✂️ [{self.name}] 본문 {self.MAX_BODY_BYTES // 1024}KB 초과, 나머지 생략")
+                    del body[self.MAX_BODY_BYTES:]
+                    break
+                if watcher is not None and watcher.feed(chunk):
+                    print(f"✂️ [{self.name}] __NEXT_DATA__ 수신 완료 ({len(body) // 1024}KB), 나머지 생략")
+                    break
+        except requests.exceptions.ChunkedEncodingError as e:
+            raise requests.exceptions.ConnectionError(e)
+        finally:
+            if aborted:
+                response.raw.close()
+            response._content = bytes(body)
+            response._content_consumed = True
+            response.close()
+
+    @staticmethod
+    def _body_chunks(response: "requests.Response"):
+        """
+        도착한 만큼씩 본문 청크 (최대 STREAM_CHUNK_BYTES)
+
+        iter_content는 청크가 다 찰 때까지 막혀서 조금씩 오는 응답은 마감 확인까지
+        오래 걸린다. urllib3 read1은 소켓 읽기 한 번만 기다림 (없으면 iter_content).
+        """
+        raw = response.raw
+        if not hasattr(raw, "read1"):
+            yield from response.iter_content(STREAM_CHUNK_BYTES)
+            return
+
+        import requests
+        from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError
+        while True:
+            # 예외 변환은 iter_content와 같게
+            try:
+                chunk = raw.read1(STREAM_CHUNK_BYTES, decode_content=True)
+            except ProtocolError as e:
+                raise requests.exceptions.ChunkedEncodingError(e)
+            except DecodeError as e:
+                raise requests.exceptions.ContentDecodingError(e)
+            except ReadTimeoutError as e:
+                raise requests.exceptions.ConnectionError(e)
+            if not chunk:
+                return
+            yield chunk
+
+    def _extract_next_data(self, html) -> Optional[Dict]:
+        """__NEXT_DATA__ JSON 추출 (DOM 생성 없음, 깨진 JSON은 None)"""
+        try:
+            return extract_next_data(html)
+        except json.JSONDecodeError as e:
+            print(f"⚠️ [{self.name}] JSON 파싱 실패: {e}")
+            return None
+
+    def _archive_response(self, response: "requests.Response"):
+        """기록 모드일 때 원본 응답 아카이브 (실패해도 수집은 계속)"""
+        archive = get_response_archive()
+        if not archive:
+            return
+        try:
+            archive.store(
+                response.content,
+                platform=self.name,
+                scraper=type(self).__name__,
+                city_key=self.city_key,
+                url=response.url,
+                encoding=response.encoding,
+            )
+        except OSError as e:
+            print(f"⚠️ [{self.name}] 아카이브 저장 실패: {e}")
+
     @abstractmethod
-    def scrape(self, checkin: datetime, checkout: datetime) -> List[Dict]:
-        """호텔 목록 스크래핑 (각 플랫폼별 구현)"""
+    def _build_url(self, checkin: datetime, checkout: datetime) -> str:
+        """검색 페이지 URL 생성 (각 플랫폼별 구현)"""
         pass
 
+    @abstractmethod
+    def _parse_response(self, html: str) -> List[Dict]:
+        """검색 페이지 → 정규화된 호텔 리스트 (각 플랫폼별 구현)"""
+        pass
+
+    def _page_url(self, url: str, page: int) -> str:
+        """검색 URL의 page번째(0부터) 페이지 URL (첫 페이지는 그대로)"""
+        if page == 0:
+            return url
+        value = page * self.PAGE_SIZE if self.PAGE_SIZE else page + 1
+        parts = urlsplit(url)
+        query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != self.PAGE_PARAM]
+        query.append((self.PAGE_PARAM, str(value)))
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+    def fetch(self, checkin: datetime, checkout: datetime, page: int = 0) -> Optional["requests.Response"]:
+        """검색 페이지 요청 (파싱 없음)"""
+        print(f"🔍 [{self.name}] 검색 중..." + (f" ({page + 1}페이지)" if page else ""))
+        url = self._page_url(self._build_url(checkin, checkout), page)
+        return self._make_request(url, headers=self.REQUEST_HEADERS or None)
+
+    def scrape(self, checkin: datetime, checkout: datetime) -> List[Dict]:
+        """호텔 목록 스크래핑 (fetch + parse, 중단 규칙까지 페이지 넘김)"""
+        collector = PageCollector(self)
+        for page in range(PAGINATION["max_pages"]):
+            if page and self.deadline is not None and self.deadline.expired():
+                break
+            response = self.fetch(checkin, checkout, page)
+            if not response:
+                break
+            if not collector.add(self._parse_response(response.text)):
+                break
+
+        print(f"✅ [{self.name}] {len(collector.hotels)}개 호텔 수집")
+        return collector.hotels
+
     def _normalize_hotel(self, raw_data: dict) -> Dict:
         """호텔 데이터 정규화"""
         return {
@@ -217,12 +615,22 @@ class BaseScraper(ABC):
 class AgodaScraper(BaseScraper):
     """Agoda 스크래퍼 - 글로벌 OTA"""
 
+    # 가격 오름차순 검색 (sort 파라미터)
+    SORTED_BY_PRICE = True
+
+    # __NEXT_DATA__만 파싱 → 스크립트가 도착하면 다운로드 중단 (JSON 블롭이 커서 본문 상한도 넉넉히)
+    STREAM_NEXT_DATA = True
+    MAX_BODY_BYTES = 8 * 1024 * 1024
+
     def __init__(self, city_key: str = "goyang"):
         super().__init__(city_key)
         self.name = "Agoda"
         self.name_kr = "아고다"
         self.base_url = "https://www.agoda.com"
-        self.city_id = self.city_config["agoda_id"]
+
+    @property
+    def city_id(self) -> int:
+        return self.city_config["agoda_id"]
 
     def _build_url(self, checkin: datetime, checkout: datetime) -> str:
         """검색 URL 생성"""
@@ -231,40 +639,21 @@ class AgodaScraper(BaseScraper):
             "checkIn": checkin.strftime("%Y-%m-%d"),
             "checkOut": checkout.strftime("%Y-%m-%d"),
             "rooms": 1,
-            "adults": 2,
+            "adults": self.adults,
             "children": 0,
             "los": (checkout - checkin).days,
             "sort": "priceLowToHigh",
         }
         return f"{self.base_url}/search?{urlencode(params)}"
 
-    def scrape(self, checkin: datetime, checkout: datetime) -> List[Dict]:
-        """Agoda 호텔 스크래핑"""
-        url = self._build_url(checkin, checkout)
-        print(f"🔍 [{self.name}] 검색 중...")
-
-        response = self._make_request(url)
-        if not response:
-            return []
-
-        hotels = self._parse_response(response.text)
-        print(f"✅ [{self.name}] {len(hotels)}개 호텔 수집")
-        return hotels
-
     def _parse_response(self, html: str) -> List[Dict]:
         """응답 파싱"""
         hotels = []
 
-        if not BeautifulSoup:
-            return hotels
-
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # __NEXT_DATA__ 파싱 시도
-        script_tag = soup.find('script', {'id': '__NEXT_DATA__'})
-        if script_tag:
+        # __NEXT_DATA__ JSON 구간만 바로 추출 (DOM 생성 없음)
+        data = self._extract_next_data(html)
+        if data:
             try:
-                data = json.loads(script_tag.string)
                 props = data.get('props', {}).get('pageProps', {})
                 search_result = props.get('searchResult', {}) or props.get('initialSearchResult', {})
                 properties = search_result.get('properties', []) or search_result.get('results', [])
@@ -316,55 +705,41 @@ class AgodaScraper(BaseScraper):
 class NaverHotelScraper(BaseScraper):
     """네이버 호텔 스크래퍼"""
 
+    # HTML 폴백용 카드 요소 필터 / 필드 추출 스펙
+    CARD_STRAINER = class_strainer('div', r'hotel|item|card')
+    CARD_SPEC = get_card_spec("naver")
+
     def __init__(self, city_key: str = "goyang"):
         super().__init__(city_key)
         self.name = "NaverHotel"
         self.name_kr = "네이버 호텔"
         self.base_url = "https://hotel.naver.com"
         self.api_url = "https://hotel.naver.com/api"
-        self.search_keyword = self.city_config["name_kr"]
 
-    def _build_url(self, checkin: datetime, checkout: datetime) -> str:
+    def _build_api_url(self, checkin: datetime, checkout: datetime) -> str:
         """API URL 생성"""
         params = {
             "keyword": self.search_keyword,
             "checkIn": checkin.strftime("%Y-%m-%d"),
             "checkOut": checkout.strftime("%Y-%m-%d"),
             "rooms": 1,
-            "adults": 2,
+            "adults": self.adults,
             "children": 0,
         }
         return f"{self.api_url}/search/v2?{urlencode(params)}"
 
-    def scrape(self, checkin: datetime, checkout: datetime) -> List[Dict]:
-        """네이버 호텔 스크래핑"""
-        # 네이버는 검색 결과 페이지에서 데이터 추출
-        search_url = f"{self.base_url}/domestic/search?keyword={quote(self.search_keyword)}&checkIn={checkin.strftime('%Y-%m-%d')}&checkOut={checkout.strftime('%Y-%m-%d')}"
-
-        print(f"🔍 [{self.name}] 검색 중...")
-
-        response = self._make_request(search_url)
-        if not response:
-            return []
-
-        hotels = self._parse_response(response.text)
-        print(f"✅ [{self.name}] {len(hotels)}개 호텔 수집")
-        return hotels
+    def _build_url(self, checkin: datetime, checkout: datetime) -> str:
+        """검색 페이지 URL 생성 (네이버는 검색 결과 페이지에서 데이터 추출)"""
+        return f"{self.base_url}/domestic/search?keyword={quote(self.search_keyword)}&checkIn={checkin.strftime('%Y-%m-%d')}&checkOut={checkout.strftime('%Y-%m-%d')}"
 
     def _parse_response(self, html: str) -> List[Dict]:
         """응답 파싱"""
         hotels = []
 
-        if not BeautifulSoup:
-            return hotels
-
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # 네이버 호텔은 __NEXT_DATA__ 또는 window.__PRELOADED_STATE__ 사용
-        script_tag = soup.find('script', {'id': '__NEXT_DATA__'})
-        if script_tag:
+        # __NEXT_DATA__ JSON 구간만 바로 추출 (DOM 생성 없음)
+        data = self._extract_next_data(html)
+        if data:
             try:
-                data = json.loads(script_tag.string)
                 # 네이버 구조에 맞게 파싱
                 page_props = data.get('props', {}).get('pageProps', {})
                 hotel_list = page_props.get('hotels', []) or page_props.get('searchResult', {}).get('hotels', [])
@@ -386,25 +761,16 @@ class NaverHotelScraper(BaseScraper):
             except (json.JSONDecodeError, KeyError) as e:
                 print(f"⚠️ [{self.name}] JSON 파싱 실패: {e}")
 
-        # HTML 요소 폴백
-        if not hotels:
+        # HTML 요소 폴백 (카드 요소만 다시 파싱)
+        if not hotels and BS4_AVAILABLE:
+            soup = make_soup(html, self.CARD_STRAINER)
             hotel_cards = soup.find_all('div', class_=re.compile(r'hotel|item|card', re.I))
             for card in hotel_cards[:20]:
-                name_el = card.find(['h2', 'h3', 'span'], class_=re.compile(r'name|title', re.I))
-                price_el = card.find(['span', 'div'], class_=re.compile(r'price', re.I))
-
-                if name_el:
-                    name = name_el.get_text(strip=True)
-                    price = 0
-                    if price_el:
-                        price_text = price_el.get_text(strip=True)
-                        price_match = re.search(r'[\d,]+', price_text.replace(',', ''))
-                        if price_match:
-                            price = int(price_match.group())
-
+                fields = self.CARD_SPEC.extract(card)
+                if fields["name"] is not None:
                     hotel = self._normalize_hotel({
-                        "name": name,
-                        "price_krw": price,
+                        "name": fields["name"],
+                        "price_krw": fields["price"],
                     })
                     hotels.append(hotel)
 
@@ -414,39 +780,33 @@ class NaverHotelScraper(BaseScraper):
 class GoodChoiceScraper(BaseScraper):
     """여기어때 스크래퍼"""
 
+    # 목록 카드 요소 필터 (li 우선, 없으면 div) / 필드 추출 스펙
+    CARD_STRAINER = class_strainer(['li', 'div'], r'list_item|hotel_item|accommodation|hotel|room')
+    CARD_SPEC = get_card_spec("goodchoice")
+
+    # 모바일 User-Agent 사용 (더 간단한 HTML)
+    REQUEST_HEADERS = {
+        "User-Agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 16_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.0 Mobile/15E148 Safari/604.1",
+    }
+
     def __init__(self, city_key: str = "goyang"):
         super().__init__(city_key)
         self.name = "GoodChoice"
         self.name_kr = "여기어때"
         self.base_url = "https://www.goodchoice.kr"
-        self.search_keyword = self.city_config["name_kr"]
-
-    def scrape(self, checkin: datetime, checkout: datetime) -> List[Dict]:
-        """여기어때 스크래핑"""
-        # 여기어때 모바일 웹 검색
-        search_url = f"{self.base_url}/search?keyword={quote(self.search_keyword)}&check_in={checkin.strftime('%Y-%m-%d')}&check_out={checkout.strftime('%Y-%m-%d')}"
-
-        print(f"🔍 [{self.name}] 검색 중...")
-
-        # 모바일 User-Agent로 변경 (더 간단한 HTML)
-        self.headers["User-Agent"] = "Mozilla/5.0 (iPhone; CPU iPhone OS 16_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.0 Mobile/15E148 Safari/604.1"
-
-        response = self._make_request(search_url)
-        if not response:
-            return []
 
-        hotels = self._parse_response(response.text)
-        print(f"✅ [{self.name}] {len(hotels)}개 호텔 수집")
-        return hotels
+    def _build_url(self, checkin: datetime, checkout: datetime) -> str:
+        """검색 페이지 URL 생성 (여기어때 모바일 웹 검색)"""
+        return f"{self.base_url}/search?keyword={quote(self.search_keyword)}&check_in={checkin.strftime('%Y-%m-%d')}&check_out={checkout.strftime('%Y-%m-%d')}"
 
     def _parse_response(self, html: str) -> List[Dict]:
         """응답 파싱"""
         hotels = []
 
-        if not BeautifulSoup:
+        if not BS4_AVAILABLE:
             return hotels
 
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html, self.CARD_STRAINER)
 
         # 여기어때 카드 요소 찾기
         hotel_items = soup.find_all('li', class_=re.compile(r'list_item|hotel_item', re.I))
@@ -455,40 +815,16 @@ class GoodChoiceScraper(BaseScraper):
 
         for item in hotel_items[:30]:
             try:
-                # 이름
-                name_el = item.find(['h3', 'strong', 'a'], class_=re.compile(r'name|title', re.I))
-                name = name_el.get_text(strip=True) if name_el else ""
-
-                # 가격
-                price = 0
-                price_el = item.find(['span', 'strong'], class_=re.compile(r'price|won', re.I))
-                if price_el:
-                    price_text = price_el.get_text(strip=True)
-                    price_match = re.search(r'[\d,]+', price_text.replace(',', ''))
-                    if price_match:
-                        price = int(price_match.group())
-
-                # 평점
-                rating = 0
-                rating_el = item.find(['span', 'em'], class_=re.compile(r'score|rating', re.I))
-                if rating_el:
-                    rating_text = rating_el.get_text(strip=True)
-                    rating_match = re.search(r'(\d+\.?\d*)', rating_text)
-                    if rating_match:
-                        rating = float(rating_match.group(1))
-
-                # 이미지
-                img_el = item.find('img')
-                image_url = ""
-                if img_el:
-                    image_url = img_el.get('src') or img_el.get('data-src', '')
+                # 이름/가격/평점/이미지를 카드 한 번 순회로 추출
+                fields = self.CARD_SPEC.extract(item)
+                name = fields["name"]
 
                 if name:
                     hotel = self._normalize_hotel({
                         "name": name,
-                        "price_krw": price,
-                        "rating": rating,
-                        "image_url": image_url,
+                        "price_krw": fields["price"],
+                        "rating": fields["rating"],
+                        "image_url": fields["image_url"],
                     })
                     hotels.append(hotel)
 
@@ -501,42 +837,28 @@ class GoodChoiceScraper(BaseScraper):
 class YanoljaScraper(BaseScraper):
     """야놀자 스크래퍼"""
 
+    # HTML 폴백용 카드 요소 필터 / 필드 추출 스펙
+    CARD_STRAINER = class_strainer(['div', 'article'], r'PlaceCard|accommodation|hotel')
+    CARD_SPEC = get_card_spec("yanolja")
+
     def __init__(self, city_key: str = "goyang"):
         super().__init__(city_key)
         self.name = "Yanolja"
         self.name_kr = "야놀자"
         self.base_url = "https://www.yanolja.com"
-        self.search_keyword = self.city_config["name_kr"]
-
-    def scrape(self, checkin: datetime, checkout: datetime) -> List[Dict]:
-        """야놀자 스크래핑"""
-        # 야놀자 검색
-        search_url = f"{self.base_url}/search/{quote(self.search_keyword)}?checkin={checkin.strftime('%Y-%m-%d')}&checkout={checkout.strftime('%Y-%m-%d')}"
 
-        print(f"🔍 [{self.name}] 검색 중...")
-
-        response = self._make_request(search_url)
-        if not response:
-            return []
-
-        hotels = self._parse_response(response.text)
-        print(f"✅ [{self.name}] {len(hotels)}개 호텔 수집")
-        return hotels
+    def _build_url(self, checkin: datetime, checkout: datetime) -> str:
+        """검색 페이지 URL 생성 (야놀자 검색)"""
+        return f"{self.base_url}/search/{quote(self.search_keyword)}?checkin={checkin.strftime('%Y-%m-%d')}&checkout={checkout.strftime('%Y-%m-%d')}"
 
     def _parse_response(self, html: str) -> List[Dict]:
         """응답 파싱"""
         hotels = []
 
-        if not BeautifulSoup:
-            return hotels
-
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # __NEXT_DATA__ 시도 (Next.js 앱)
-        script_tag = soup.find('script', {'id': '__NEXT_DATA__'})
-        if script_tag:
+        # __NEXT_DATA__ JSON 구간만 바로 추출 (DOM 생성 없음)
+        data = self._extract_next_data(html)
+        if data:
             try:
-                data = json.loads(script_tag.string)
                 page_props = data.get('props', {}).get('pageProps', {})
 
                 # 다양한 키 시도
@@ -564,14 +886,15 @@ class YanoljaScraper(BaseScraper):
             except (json.JSONDecodeError, KeyError) as e:
                 print(f"⚠️ [{self.name}] JSON 파싱 실패: {e}")
 
-        # HTML 폴백
-        if not hotels:
+        # HTML 폴백 (카드 요소만 다시 파싱)
+        if not hotels and BS4_AVAILABLE:
+            soup = make_soup(html, self.CARD_STRAINER)
             cards = soup.find_all(['div', 'article'], class_=re.compile(r'PlaceCard|accommodation|hotel', re.I))
             for card in cards[:20]:
-                name_el = card.find(['h2', 'h3', 'a'], class_=re.compile(r'name|title', re.I))
-                if name_el:
+                fields = self.CARD_SPEC.extract(card)
+                if fields["name"] is not None:
                     hotel = self._normalize_hotel({
-                        "name": name_el.get_text(strip=True),
+                        "name": fields["name"],
                     })
                     hotels.append(hotel)
 
@@ -581,72 +904,59 @@ class YanoljaScraper(BaseScraper):
 class CoupangTravelScraper(BaseScraper):
     """쿠팡 트래블 스크래퍼"""
 
+    # HTML 폴백용 카드 요소 필터 / 필드 추출 스펙
+    CARD_STRAINER = class_strainer('div', r'stay|hotel|item')
+    CARD_SPEC = get_card_spec("coupang")
+
+    # 페이지 상태 JSON 변수명
+    STATE_MARKERS = ['__PRELOADED_STATE__', 'window.__data']
+
     def __init__(self, city_key: str = "goyang"):
         super().__init__(city_key)
         self.name = "CoupangTravel"
         self.name_kr = "쿠팡 트래블"
         self.base_url = "https://travel.coupang.com"
-        self.search_keyword = self.city_config["name_kr"]
-
-    def scrape(self, checkin: datetime, checkout: datetime) -> List[Dict]:
-        """쿠팡 트래블 스크래핑"""
-        # 쿠팡 트래블 검색
-        search_url = f"{self.base_url}/np/search/stays?q={quote(self.search_keyword)}&checkin={checkin.strftime('%Y-%m-%d')}&checkout={checkout.strftime('%Y-%m-%d')}"
-
-        print(f"🔍 [{self.name}] 검색 중...")
-
-        response = self._make_request(search_url)
-        if not response:
-            return []
 
-        hotels = self._parse_response(response.text)
-        print(f"✅ [{self.name}] {len(hotels)}개 호텔 수집")
-        return hotels
+    def _build_url(self, checkin: datetime, checkout: datetime) -> str:
+        """검색 페이지 URL 생성 (쿠팡 트래블 검색)"""
+        return f"{self.base_url}/np/search/stays?q={quote(self.search_keyword)}&checkin={checkin.strftime('%Y-%m-%d')}&checkout={checkout.strftime('%Y-%m-%d')}"
 
     def _parse_response(self, html: str) -> List[Dict]:
         """응답 파싱"""
         hotels = []
 
-        if not BeautifulSoup:
-            return hotels
-
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # JSON 데이터 추출 시도
-        scripts = soup.find_all('script')
-        for script in scripts:
-            if script.string and ('__PRELOADED_STATE__' in script.string or 'window.__data' in script.string):
-                try:
-                    # JSON 추출
-                    match = re.search(r'=\s*(\{.*?\});', script.string, re.DOTALL)
-                    if match:
-                        data = json.loads(match.group(1))
-
-                        # 호텔 데이터 찾기
-                        for key in ['stays', 'hotels', 'accommodations', 'results']:
-                            if key in data:
-                                for item in data[key][:30]:
-                                    hotel = self._normalize_hotel({
-                                        "name": item.get('name', ''),
-                                        "price_krw": item.get('price', item.get('salePrice', 0)),
-                                        "rating": item.get('rating', 0),
-                                        "image_url": item.get('imageUrl', ''),
-                                        "booking_url": f"{self.base_url}/np/stays/{item.get('id', '')}",
-                                    })
-                                    if hotel["name"]:
-                                        hotels.append(hotel)
-                                break
-                except:
-                    continue
-
-        # HTML 폴백
-        if not hotels:
+        # window.__PRELOADED_STATE__ / window.__data JSON 추출 (DOM 생성 없음)
+        try:
+            data = extract_assigned_json(html, self.STATE_MARKERS)
+        except json.JSONDecodeError as e:
+            print(f"⚠️ [{self.name}] JSON 파싱 실패: {e}")
+            data = None
+
+        if isinstance(data, dict):
+            # 호텔 데이터 찾기
+            for key in ['stays', 'hotels', 'accommodations', 'results']:
+                if key in data:
+                    for item in data[key][:30]:
+                        hotel = self._normalize_hotel({
+                            "name": item.get('name', ''),
+                            "price_krw": item.get('price', item.get('salePrice', 0)),
+                            "rating": item.get('rating', 0),
+                            "image_url": item.get('imageUrl', ''),
+                            "booking_url": f"{self.base_url}/np/stays/{item.get('id', '')}",
+                        })
+                        if hotel["name"]:
+                            hotels.append(hotel)
+                    break
+
+        # HTML 폴백 (카드 요소만 다시 파싱)
+        if not hotels and BS4_AVAILABLE:
+            soup = make_soup(html, self.CARD_STRAINER)
             cards = soup.find_all('div', class_=re.compile(r'stay|hotel|item', re.I))
             for card in cards[:20]:
-                name_el = card.find(['h2', 'h3', 'span'], class_=re.compile(r'name|title', re.I))
-                if name_el:
+                fields = self.CARD_SPEC.extract(card)
+                if fields["name"] is not None:
                     hotel = self._normalize_hotel({
-                        "name": name_el.get_text(strip=True),
+                        "name": fields["name"],
                     })
                     hotels.append(hotel)
 
@@ -658,6 +968,10 @@ class CoupangTravelScraper(BaseScraper):
 class TripComScraper(BaseScraper):
     """Trip.com 스크래퍼 - 글로벌 OTA (중국 Ctrip)"""
 
+    # HTML 폴백용 카드 요소 필터 / 필드 추출 스펙
+    CARD_STRAINER = class_strainer('div', r'hotel-card|list-card')
+    CARD_SPEC = get_card_spec("tripcom")
+
     def __init__(self, city_key: str = "goyang"):
         super().__init__(city_key)
         self.name = "Trip.com"
@@ -685,81 +999,53 @@ class TripComScraper(BaseScraper):
             f"city={city}"
             f"&checkin={checkin_str}"
             f"&checkout={checkout_str}"
-            f"&adult=2"
+            f"&adult={self.adults}"
             f"&searchBoxArg=t"
         )
 
-    def scrape(self, checkin: datetime, checkout: datetime) -> List[Dict]:
-        """Trip.com 호텔 스크래핑"""
-        url = self._build_url(checkin, checkout)
-        print(f"🔍 [{self.name}] 검색 중...")
-
-        response = self._make_request(url)
-        if not response:
-            return []
-
-        hotels = self._parse_response(response.text)
-        print(f"✅ [{self.name}] {len(hotels)}개 호텔 수집")
-        return hotels
-
     def _parse_response(self, html: str) -> List[Dict]:
         """응답 파싱"""
         hotels = []
-        if not BeautifulSoup:
-            return hotels
-
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # __NEXT_DATA__ 또는 window.__INITIAL_STATE__ 파싱
-        for script in soup.find_all('script'):
-            if not script.string:
-                continue
+        # window.__INITIAL_STATE__ JSON 추출 (DOM 생성 없음)
+        try:
+            data = extract_assigned_json(html, 'window.__INITIAL_STATE__')
+        except json.JSONDecodeError:
+            data = None
 
-            # JSON 데이터 추출 시도
-            if '__INITIAL_STATE__' in script.string or 'hotelList' in script.string:
-                try:
-                    match = re.search(r'window\.__INITIAL_STATE__\s*=\s*(\{.+?\});', script.string, re.DOTALL)
-                    if match:
-                        data = json.loads(match.group(1))
-                        hotel_list = data.get('hotelList', {}).get('hotels', [])
+        if isinstance(data, dict):
+            try:
+                hotel_list = data.get('hotelList', {}).get('hotels', [])
 
-                        for item in hotel_list[:30]:
-                            hotel = self._normalize_hotel({
-                                "name": item.get('hotelName', ''),
-                                "name_en": item.get('hotelNameEn', item.get('hotelName', '')),
-                                "price_krw": int(item.get('price', 0) * 1350) if item.get('price', 0) < 1000 else item.get('price', 0),
-                                "rating": item.get('score', item.get('rating', 0)),
-                                "review_count": item.get('reviewCount', 0),
-                                "star_rating": item.get('star', 0),
-                                "address": item.get('address', ''),
-                                "latitude": item.get('lat', 0),
-                                "longitude": item.get('lng', 0),
-                                "image_url": item.get('imageUrl', item.get('picture', '')),
-                                "rooms_left": item.get('roomsLeft', -1),
-                                "booking_url": f"{self.base_url}/hotels/detail/?hotelId={item.get('hotelId', '')}",
-                            })
-                            if hotel["name"]:
-                                hotels.append(hotel)
-                except (json.JSONDecodeError, KeyError):
-                    pass
+                for item in hotel_list[:30]:
+                    hotel = self._normalize_hotel({
+                        "name": item.get('hotelName', ''),
+                        "name_en": item.get('hotelNameEn', item.get('hotelName', '')),
+                        "price_krw": int(item.get('price', 0) * 1350) if item.get('price', 0) < 1000 else item.get('price', 0),
+                        "rating": item.get('score', item.get('rating', 0)),
+                        "review_count": item.get('reviewCount', 0),
+                        "star_rating": item.get('star', 0),
+                        "address": item.get('address', ''),
+                        "latitude": item.get('lat', 0),
+                        "longitude": item.get('lng', 0),
+                        "image_url": item.get('imageUrl', item.get('picture', '')),
+                        "rooms_left": item.get('roomsLeft', -1),
+                        "booking_url": f"{self.base_url}/hotels/detail/?hotelId={item.get('hotelId', '')}",
+                    })
+                    if hotel["name"]:
+                        hotels.append(hotel)
+            except (KeyError, AttributeError):
+                pass
 
-        # HTML 폴백
-        if not hotels:
+        # HTML 폴백 (카드 요소만 다시 파싱)
+        if not hotels and BS4_AVAILABLE:
+            soup = make_soup(html, self.CARD_STRAINER)
             cards = soup.find_all('div', class_=re.compile(r'hotel-card|list-card', re.I))
             for card in cards[:20]:
-                name_el = card.find(['h2', 'h3', 'a'], class_=re.compile(r'name|title', re.I))
-                price_el = card.find(['span', 'div'], class_=re.compile(r'price', re.I))
-
-                if name_el:
-                    price = 0
-                    if price_el:
-                        price_match = re.search(r'[\d,]+', price_el.get_text().replace(',', ''))
-                        if price_match:
-                            price = int(price_match.group())
-
+                fields = self.CARD_SPEC.extract(card)
+                if fields["name"] is not None:
                     hotel = self._normalize_hotel({
-                        "name": name_el.get_text(strip=True),
-                        "price_krw": price,
+                        "name": fields["name"],
+                        "price_krw": fields["price"],
                     })
                     hotels.append(hotel)
 
@@ -769,6 +1055,13 @@ class TripComScraper(BaseScraper):
 class HotelsComScraper(BaseScraper):
     """Hotels.com 스크래퍼 - Expedia 그룹"""
 
+    # 가격 오름차순 검색 (sort 파라미터)
+    SORTED_BY_PRICE = True
+
+    # __NEXT_DATA__만 파싱 → 스크립트가 도착하면 다운로드 중단 (JSON 블롭이 커서 본문 상한도 넉넉히)
+    STREAM_NEXT_DATA = True
+    MAX_BODY_BYTES = 8 * 1024 * 1024
+
     def __init__(self, city_key: str = "goyang"):
         super().__init__(city_key)
         self.name = "Hotels.com"
@@ -796,36 +1089,17 @@ class HotelsComScraper(BaseScraper):
             f"destination={quote(query)}"
             f"&startDate={checkin_str}"
             f"&endDate={checkout_str}"
-            f"&adults=2"
+            f"&adults={self.adults}"
             f"&sort=PRICE_LOW_TO_HIGH"
         )
 
-    def scrape(self, checkin: datetime, checkout: datetime) -> List[Dict]:
-        """Hotels.com 호텔 스크래핑"""
-        url = self._build_url(checkin, checkout)
-        print(f"🔍 [{self.name}] 검색 중...")
-
-        response = self._make_request(url)
-        if not response:
-            return []
-
-        hotels = self._parse_response(response.text)
-        print(f"✅ [{self.name}] {len(hotels)}개 호텔 수집")
-        return hotels
-
     def _parse_response(self, html: str) -> List[Dict]:
         """응답 파싱"""
         hotels = []
-        if not BeautifulSoup:
-            return hotels
-
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # __NEXT_DATA__ 파싱 (Hotels.com은 Next.js 사용)
-        script_tag = soup.find('script', {'id': '__NEXT_DATA__'})
-        if script_tag:
+        # __NEXT_DATA__ JSON 구간만 바로 추출 (DOM 생성 없음)
+        data = self._extract_next_data(html)
+        if data:
             try:
-                data = json.loads(script_tag.string)
                 props = data.get('props', {}).get('pageProps', {})
 
                 # 다양한 경로 시도
@@ -862,6 +1136,15 @@ class HotelsComScraper(BaseScraper):
 class BookingComScraper(BaseScraper):
     """Booking.com 스크래퍼 - 세계 최대 OTA"""
 
+    # 25개 단위 오프셋 페이지, 가격 오름차순 검색 (order=price)
+    PAGE_PARAM = "offset"
+    PAGE_SIZE = 25
+    SORTED_BY_PRICE = True
+
+    # 숙소 카드 요소 필터 / 필드 추출 스펙
+    CARD_STRAINER = strainer('div', attrs={'data-testid': 'property-card'})
+    CARD_SPEC = get_card_spec("booking")
+
     def __init__(self, city_key: str = "goyang"):
         super().__init__(city_key)
         self.name = "Booking.com"
@@ -890,73 +1173,35 @@ class BookingComScraper(BaseScraper):
             f"&dest_type=city"
             f"&checkin={checkin_str}"
             f"&checkout={checkout_str}"
-            f"&group_adults=2"
+            f"&group_adults={self.adults}"
             f"&no_rooms=1"
             f"&order=price"
         )
 
-    def scrape(self, checkin: datetime, checkout: datetime) -> List[Dict]:
-        """Booking.com 호텔 스크래핑"""
-        url = self._build_url(checkin, checkout)
-        print(f"🔍 [{self.name}] 검색 중...")
-
-        response = self._make_request(url)
-        if not response:
-            return []
-
-        hotels = self._parse_response(response.text)
-        print(f"✅ [{self.name}] {len(hotels)}개 호텔 수집")
-        return hotels
-
     def _parse_response(self, html: str) -> List[Dict]:
         """응답 파싱"""
         hotels = []
-        if not BeautifulSoup:
+        if not BS4_AVAILABLE:
             return hotels
 
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html, self.CARD_STRAINER)
 
         # Booking.com은 data-testid 속성 사용
         property_cards = soup.find_all('div', {'data-testid': 'property-card'})
 
         for card in property_cards[:30]:
             try:
-                # 호텔명
-                name_el = card.find('div', {'data-testid': 'title'})
-                name = name_el.get_text(strip=True) if name_el else ""
-
-                # 가격
-                price = 0
-                price_el = card.find('span', {'data-testid': 'price-and-discounted-price'})
-                if price_el:
-                    price_text = price_el.get_text(strip=True)
-                    price_match = re.search(r'[\d,]+', price_text.replace(',', '').replace('₩', ''))
-                    if price_match:
-                        price = int(price_match.group())
-
-                # 평점
-                rating = 0
-                rating_el = card.find('div', {'data-testid': 'review-score'})
-                if rating_el:
-                    rating_match = re.search(r'(\d+\.?\d*)', rating_el.get_text())
-                    if rating_match:
-                        rating = float(rating_match.group(1))
-
-                # 이미지
-                img_el = card.find('img', {'data-testid': 'image'})
-                image_url = img_el.get('src', '') if img_el else ""
-
-                # 링크
-                link_el = card.find('a', {'data-testid': 'title-link'})
-                booking_url = self.base_url + link_el.get('href', '') if link_el else ""
+                # 호텔명/가격/평점/이미지/링크를 카드 한 번 순회로 추출
+                fields = self.CARD_SPEC.extract(card)
+                link = fields["link"]
 
-                if name:
+                if fields["name"]:
                     hotel = self._normalize_hotel({
-                        "name": name,
-                        "price_krw": price,
-                        "rating": rating,
-                        "image_url": image_url,
-                        "booking_url": booking_url,
+                        "name": fields["name"],
+                        "price_krw": fields["price"],
+                        "rating": fields["rating"],
+                        "image_url": fields["image_url"],
+                        "booking_url": self.base_url + link if link is not None else "",
                     })
                     hotels.append(hotel)
 
@@ -965,6 +1210,7 @@ class BookingComScraper(BaseScraper):
 
         # JSON-LD 데이터 폴백
         if not hotels:
+            soup = make_soup(html, JSON_LD_ONLY)
             for script in soup.find_all('script', type='application/ld+json'):
                 try:
                     data = json.loads(script.string)
@@ -987,6 +1233,13 @@ class BookingComScraper(BaseScraper):
 class ExpediaScraper(BaseScraper):
     """Expedia 스크래퍼 - 미국 최대 OTA"""
 
+    # 가격 오름차순 검색 (sort 파라미터)
+    SORTED_BY_PRICE = True
+
+    # __NEXT_DATA__만 파싱 → 스크립트가 도착하면 다운로드 중단 (JSON 블롭이 커서 본문 상한도 넉넉히)
+    STREAM_NEXT_DATA = True
+    MAX_BODY_BYTES = 8 * 1024 * 1024
+
     def __init__(self, city_key: str = "goyang"):
         super().__init__(city_key)
         self.name = "Expedia"
@@ -1014,36 +1267,17 @@ class ExpediaScraper(BaseScraper):
             f"destination={quote(query)}"
             f"&startDate={checkin_str}"
             f"&endDate={checkout_str}"
-            f"&adults=2"
+            f"&adults={self.adults}"
             f"&sort=PRICE_LOW_TO_HIGH"
         )
 
-    def scrape(self, checkin: datetime, checkout: datetime) -> List[Dict]:
-        """Expedia 호텔 스크래핑"""
-        url = self._build_url(checkin, checkout)
-        print(f"🔍 [{self.name}] 검색 중...")
-
-        response = self._make_request(url)
-        if not response:
-            return []
-
-        hotels = self._parse_response(response.text)
-        print(f"✅ [{self.name}] {len(hotels)}개 호텔 수집")
-        return hotels
-
     def _parse_response(self, html: str) -> List[Dict]:
         """응답 파싱 (Hotels.com과 유사 - 같은 Expedia 그룹)"""
         hotels = []
-        if not BeautifulSoup:
-            return hotels
-
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # __NEXT_DATA__ 파싱
-        script_tag = soup.find('script', {'id': '__NEXT_DATA__'})
-        if script_tag:
+        # __NEXT_DATA__ JSON 구간만 바로 추출 (DOM 생성 없음)
+        data = self._extract_next_data(html)
+        if data:
             try:
-                data = json.loads(script_tag.string)
                 props = data.get('props', {}).get('pageProps', {})
 
                 search_results = (
@@ -1071,6 +1305,26 @@ class ExpediaScraper(BaseScraper):
         return hotels
 
 
+# ===== 파이프라인 파싱 워커 (프로세스 풀에서 실행) =====
+
+_worker_scrapers: Dict[str, BaseScraper] = {}
+
+
+def parse_page(scraper_class: str, city_key: str, body: bytes, encoding: Optional[str]) -> List[Dict]:
+    """
+    원본 응답 본문 → 정규화된 호텔 리스트
+
+    프로세스 풀로 보내기 위해 최상위 함수로 두고, 인자는 모두 pickle 가능한 값만 받는다.
+    스크래퍼 인스턴스는 워커 프로세스 안에서 클래스별로 하나만 만들어 도시 간 재사용.
+    """
+    if scraper_class not in _worker_scrapers:
+        _worker_scrapers[scraper_class] = globals()[scraper_class](city_key)
+    scraper = _worker_scrapers[scraper_class]
+    scraper.set_city(city_key)
+    html = body.decode(encoding or "utf-8", errors="replace")
+    return scraper._parse_response(html)
+
+
 class KoreanOTAScraper:
     """
     다중 플랫폼/다중 도시 OTA 스크래퍼 매니저
@@ -1097,101 +1351,384 @@ class KoreanOTAScraper:
     - 파주 (Paju)
     """
 
-    def __init__(self, cities: List[str] = None):
+    def __init__(self, cities: List[str] = None, engine: str = "async"):
         # 스크래핑할 도시 목록
         self.cities = cities or DEFAULT_CITIES
 
+        # 수집 엔진: "serial" (도시 × 플랫폼 순차) / "async" (호스트별 동시 수집)
+        #          / "pipeline" (호스트별 동시 수집 + 프로세스 풀 파싱)
+        self.engine = engine
+
         # 콘서트 날짜 (D-Day)
         self.concert_date = datetime(2026, 6, 12)
 
-    def _get_scrapers_for_city(self, city_key: str) -> Dict:
-        """도시별 스크래퍼 생성"""
+        # scrape_distributed가 실행 중인 작업 큐 배치
+        self.batch_id: Optional[int] = None
+
+    def _build_jobs(self, checkin: datetime, checkout: datetime, platforms: List[str]) -> List[Dict]:
+        """도시 × 플랫폼 수집 작업 목록 생성 (도시 순서 → 플랫폼 순서)"""
+        registry = get_scraper_registry()
+        jobs = []
+        for city_key in self.cities:
+            if city_key not in CITIES:
+                print(f"⚠️ 알 수 없는 도시: {city_key}")
+                continue
+
+            for platform_name in platforms:
+                if not registry.has(platform_name):
+                    continue
+                # 플랫폼 인스턴스는 도시 간 공유 (실행 직전에 작업 도시로 맞춤)
+                jobs.append(self._make_job(city_key, platform_name, checkin, checkout,
+                                           registry.get(platform_name)))
+        return jobs
+
+    @staticmethod
+    def _make_job(city_key: str, platform: str, checkin: datetime, checkout: datetime,
+                  scraper: BaseScraper) -> Dict:
         return {
-            # 글로벌 OTA (안정적)
-            'agoda': {'scraper': AgodaScraper(city_key), 'weight': 2},
-            'tripcom': {'scraper': TripComScraper(city_key), 'weight': 2},
-            'hotelscom': {'scraper': HotelsComScraper(city_key), 'weight': 2},
-            'booking': {'scraper': BookingComScraper(city_key), 'weight': 2},
-            'expedia': {'scraper': ExpediaScraper(city_key), 'weight': 2},
-            # 한국 OTA
-            'naver': {'scraper': NaverHotelScraper(city_key), 'weight': 1},
-            'goodchoice': {'scraper': GoodChoiceScraper(city_key), 'weight': 1},
-            'yanolja': {'scraper': YanoljaScraper(city_key), 'weight': 1},
-            'coupang': {'scraper': CoupangTravelScraper(city_key), 'weight': 1},
+            "city_key": city_key,
+            "platform": platform,
+            "checkin": checkin,
+            "checkout": checkout,
+            "scraper": scraper,
+            "host": urlparse(scraper.base_url).netloc,
         }
 
-    def scrape_all(self, checkin: datetime = None, checkout: datetime = None,
-                   platforms: List[str] = None) -> Dict:
+    def _job_from_queue(self, row: Dict) -> Dict:
+        """작업 큐 행 → 작업 (인원이 기본값과 다르면 별도 인스턴스)"""
+        registry = get_scraper_registry()
+        scraper = registry.get(row["platform"])
+        if scraper.adults != row["adults"]:
+            scraper = registry.create(row["platform"], row["city_key"])
+            scraper.adults = row["adults"]
+        job = self._make_job(
+            row["city_key"], row["platform"],
+            datetime.strptime(row["checkin"], "%Y-%m-%d"),
+            datetime.strptime(row["checkout"], "%Y-%m-%d"),
+            scraper,
+        )
+        job["queue_id"] = row["id"]
+        return job
+
+    @staticmethod
+    def _bind_job(job: Dict) -> BaseScraper:
+        """작업의 스크래퍼를 작업 도시/마감으로 맞춰서 반환"""
+        scraper = job["scraper"]
+        scraper.set_city(job["city_key"])
+        scraper.deadline = job.get("deadline")
+        return scraper
+
+    @staticmethod
+    def _past_deadline(job: Dict) -> bool:
+        """마감이 지나 시작하지 않을 작업인지 (건너뛴 작업은 skipped 표시)"""
+        deadline = job.get("deadline")
+        if deadline is None or not deadline.expired():
+            return False
+        job["skipped"] = True
+        print(f"   ⏰ [{job['platform']}] {CITIES[job['city_key']]['name_en']}: 마감 시간 초과, 건너뜀")
+        return True
+
+    @staticmethod
+    def _start_job(job: Dict) -> BaseScraper:
+        """작업 실행 시작 - 도시 바인딩 + 요청 수/소요 시간 측정 시작"""
+        scraper = KoreanOTAScraper._bind_job(job)
+        job["_started"] = (time.monotonic(), scraper.request_count)
+        return scraper
+
+    @staticmethod
+    def _finish_job(job: Dict):
+        """작업 요청 수/소요 시간 기록 (같은 플랫폼 작업은 한 레인에서 순차 실행)"""
+        started_at, start_count = job.pop("_started")
+        job["requests"] = job["scraper"].request_count - start_count
+        job["elapsed_sec"] = time.monotonic() - started_at
+
+    def _run_job(self, job: Dict) -> List[Dict]:
+        """단일 작업 실행 (실패 / 마감 초과 시 빈 리스트)"""
+        if self._past_deadline(job):
+            return []
+        scraper = self._start_job(job)
+        try:
+            hotels = scraper.scrape(job["checkin"], job["checkout"])
+            print(f"   ✅ [{scraper.name}] {CITIES[job['city_key']]['name_en']}: {len(hotels)}개 수집")
+            return hotels
+        except Exception as e:
+            print(f"   ❌ [{job['platform']}] 실패: {e}")
+            return []
+        finally:
+            self._finish_job(job)
+
+    def _run_jobs_serial(self, jobs: List[Dict], on_done: Callable = None) -> List[List[Dict]]:
+        """순차 실행 - 도시별로 플랫폼을 하나씩 수집"""
+        outcomes = []
+        for i, job in enumerate(jobs):
+            if i == 0 or jobs[i - 1]["city_key"] != job["city_key"]:
+                print(f"\n🏙️ [{CITIES[job['city_key']]['name_en']}] 스크래핑 시작...")
+
+            # 요청 간격은 _make_request의 호스트별 스케줄러가 관리
+            outcomes.append(self._run_job(job))
+            if on_done:
+                on_done(i, outcomes[i])
+        return outcomes
+
+    async def _run_host_lane(self, host_jobs: List[Tuple[int, Dict]], outcomes: List[List[Dict]],
+                             on_done: Callable = None):
+        """한 호스트의 작업을 순차 실행 (요청 간격은 호스트별 스케줄러가 유지)"""
+        for index, job in host_jobs:
+            outcomes[index] = await asyncio.to_thread(self._run_job, job)
+            if on_done:
+                on_done(index, outcomes[index])
+
+    async def _run_jobs_async(self, jobs: List[Dict], on_done: Callable = None) -> List[List[Dict]]:
+        """비동기 실행 - 호스트별 레인을 동시에 진행"""
+        lanes: Dict[str, List[Tuple[int, Dict]]] = {}
+        for index, job in enumerate(jobs):
+            lanes.setdefault(job["host"], []).append((index, job))
+
+        print(f"⚡ {len(lanes)}개 호스트 동시 수집 ({len(jobs)}개 작업)")
+
+        outcomes: List[List[Dict]] = [[] for _ in jobs]
+        await asyncio.gather(*(self._run_host_lane(lane, outcomes, on_done) for lane in lanes.values()))
+        return outcomes
+
+    def _run_jobs_pipeline(self, jobs: List[Dict], on_done: Callable = None) -> List[List[Dict]]:
         """
-        모든 도시/플랫폼에서 호텔 정보 수집
+        파이프라인 실행 - I/O와 파싱 분리
+
+        - I/O: 호스트별 스레드가 페이지를 받아 원본 바이트를 프로세스 풀로 넘김
+        - 파싱: 프로세스 풀에서 _parse_response 실행 (GIL 없이 코어 수만큼)
+        - 결과: 작업 단위로 제한된 크기의 큐로 돌아옴. 결과가 소비되지 않고 쌓이면
+          I/O 스레드가 다음 작업을 시작하기 전에 대기 (진행 중 작업 수 ≤ max_pending)
+        """
+        lanes: Dict[str, List[Tuple[int, Dict]]] = {}
+        for index, job in enumerate(jobs):
+            lanes.setdefault(job["host"], []).append((index, job))
+
+        max_pending = PIPELINE_CONFIG["max_pending"]
+        results_queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        slots = threading.BoundedSemaphore(max_pending)
+        outcomes: List[List[Dict]] = [[] for _ in jobs]
+
+        print(f"⚡ {len(lanes)}개 호스트 동시 수집 + 프로세스 풀 파싱 ({len(jobs)}개 작업)")
+
+        def fetch_lane(lane, parse_pool):
+            for index, job in lane:
+                slots.acquire()
+                if self._past_deadline(job):
+                    results_queue.put((index, [], None))
+                    continue
+                scraper = self._start_job(job)
+                collector = PageCollector(scraper)
+                deadline = job.get("deadline")
+                try:
+                    # 다음 페이지 여부는 파싱 결과로 정해지므로 페이지마다 파싱을 기다림
+                    # (그동안 다른 호스트 레인은 계속 진행)
+                    for page in range(PAGINATION["max_pages"]):
+                        if page and deadline is not None and deadline.expired():
+                            break
+                        response = scraper.fetch(job["checkin"], job["checkout"], page)
+                        if not response:
+                            break
+                        future = parse_pool.submit(
+                            parse_page, type(scraper).__name__, job["city_key"],
+                            response.content, response.encoding,
+                        )
+                        if not collector.add(future.result(timeout=remaining_or_none(deadline))):
+                            break
+                except Exception as e:
+                    self._finish_job(job)
+                    results_queue.put((index, collector.hotels, e))
+                    continue
+                self._finish_job(job)
+                results_queue.put((index, collector.hotels, None))
+
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=PIPELINE_CONFIG["parse_workers"]) as parse_pool, \
+                ThreadPoolExecutor(max_workers=len(lanes) or 1) as io_pool:
+            for lane in lanes.values():
+                io_pool.submit(fetch_lane, lane, parse_pool)
+
+            for _ in jobs:
+                index, hotels, error = results_queue.get()
+                slots.release()
+                job = jobs[index]
+                if error is not None:
+                    print(f"   ❌ [{job['platform']}] 실패: {error}")
+                else:
+                    outcomes[index] = hotels
+                    print(f"   ✅ [{job['scraper'].name}] {CITIES[job['city_key']]['name_en']}: {len(hotels)}개 수집")
+                if on_done:
+                    on_done(index, outcomes[index])
+
+        return outcomes
+
+    def run_jobs(self, jobs: List[Dict], engine: str = None,
+                 deadline: Optional[Deadline] = None, on_done: Callable = None) -> List[List[Dict]]:
+        """
+        작업 목록을 선택한 엔진으로 실행
+
+        작업(dict)은 city_key / platform / checkin / checkout / scraper / host 를 가진다.
+        (_build_jobs 또는 search_planner가 생성)
+        작업 순서가 곧 우선순위 (호스트 레인 안에서 앞 작업부터 실행).
 
         Args:
-            checkin: 체크인 날짜 (기본: 콘서트 전날)
-            checkout: 체크아웃 날짜 (기본: 콘서트 다음날)
-            platforms: 사용할 플랫폼 리스트 (기본: agoda만)
+            deadline: 실행 마감. 지나면 남은 작업은 시작하지 않고(skipped 표시)
+                      진행 중인 요청은 남은 시간 타임아웃으로 끊긴다.
+            on_done: on_done(job, hotels) - 작업이 끝날 때마다 바로 호출
+                     (전체가 끝나기 전에 결과를 저장할 때 사용, 레인 스레드에서 호출될 수 있음)
 
         Returns:
-            도시별/플랫폼별 호텔 데이터 딕셔너리
+            작업 순서대로 호텔 리스트 (건너뛴 작업은 빈 리스트)
         """
-        if not checkin:
-            checkin = self.concert_date - timedelta(days=1)
-        if not checkout:
-            checkout = self.concert_date + timedelta(days=1)
+        engine = engine or self.engine
+        if engine == "async":
+            return self._run_coroutine(self.run_jobs_async(jobs, deadline, on_done))
+
+        unique_jobs, groups, unique_done = self._prepare_run(jobs, deadline, on_done)
+        if engine == "pipeline":
+            unique_outcomes = self._run_jobs_pipeline(unique_jobs, unique_done)
+        else:
+            unique_outcomes = self._run_jobs_serial(unique_jobs, unique_done)
+        return self._fan_out(jobs, groups, unique_outcomes)
+
+    async def run_jobs_async(self, jobs: List[Dict], deadline: Optional[Deadline] = None,
+                             on_done: Callable = None) -> List[List[Dict]]:
+        """run_jobs의 async 엔진 (이미 이벤트 루프 안에서 부를 때 await)"""
+        unique_jobs, groups, unique_done = self._prepare_run(jobs, deadline, on_done)
+        return self._fan_out(jobs, groups, await self._run_jobs_async(unique_jobs, unique_done))
+
+    def _prepare_run(self, jobs: List[Dict], deadline: Optional[Deadline],
+                     on_done: Callable = None) -> Tuple[List[Dict], List[List[int]], Optional[Callable]]:
+        """엔진 공통 준비 - 마감 설정, 동일 요청 병합, 병합된 작업별 on_done"""
+        self._set_deadline(jobs, deadline)
+        unique_jobs, groups = self._coalesce_jobs(jobs)
+
+        unique_done = None
+        if on_done:
+            def unique_done(unique_index: int, hotels: List[Dict]):
+                for index, job_hotels in self._split_group(jobs, groups[unique_index], hotels):
+                    on_done(jobs[index], job_hotels)
+        return unique_jobs, groups, unique_done
+
+    @staticmethod
+    def _run_coroutine(coro):
+        """
+        동기 코드에서 코루틴 실행
 
-        if not platforms:
-            platforms = ['agoda']  # 기본은 Agoda만
+        이미 실행 중인 이벤트 루프 안(노트북, 비동기 호출자)에서는 asyncio.run을 쓸 수 없으므로
+        별도 스레드의 새 루프에서 실행한다 (끝날 때까지 호출한 쪽은 대기 →
+        비동기 코드에서는 scrape_all_async / run_jobs_async를 await).
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-engine") as pool:
+            return pool.submit(asyncio.run, coro).result()
 
-        print("=" * 60)
-        print(f"🚀 ARMY Stay Hub - 다중 도시/플랫폼 스크래핑 시작")
-        print(f"📅 체크인: {checkin.strftime('%Y-%m-%d')}")
-        print(f"📅 체크아웃: {checkout.strftime('%Y-%m-%d')}")
-        print(f"🏙️ 도시: {', '.join([CITIES[c]['name_en'] for c in self.cities])}")
-        print(f"🎯 플랫폼: {', '.join(platforms)}")
-        print("=" * 60)
+    @staticmethod
+    def _set_deadline(jobs: List[Dict], deadline: Optional[Deadline]):
+        for job in jobs:
+            job["deadline"] = deadline
 
-        results = {
-            "meta": {
-                "checkin": checkin.isoformat(),
-                "checkout": checkout.isoformat(),
-                "scraped_at": datetime.now().isoformat(),
-                "cities": self.cities,
-                "platforms_used": platforms,
-            },
-            "by_city": {},
-            "all_hotels": [],
-        }
+    # ----- 동일 요청 병합 (single-flight) -----
+
+    def _coalesce_jobs(self, jobs: List[Dict]) -> Tuple[List[Dict], List[List[int]]]:
+        """
+        정규화된 요청이 같은 작업을 하나로 묶음
+
+        예: Booking.com은 홍대/성수/광화문이 모두 dest_id=-716583 → 한 번만 요청
+
+        Returns:
+            (대표 작업 목록, 대표 작업별 원래 작업 인덱스 목록)
+        """
+        unique_jobs: List[Dict] = []
+        groups: List[List[int]] = []
+        seen: Dict[Tuple[str, str], int] = {}
+
+        for index, job in enumerate(jobs):
+            scraper = self._bind_job(job)
+            key = (type(scraper).__name__, normalize_url(scraper._build_url(job["checkin"], job["checkout"])))
+            if key in seen:
+                groups[seen[key]].append(index)
+                continue
+            seen[key] = len(unique_jobs)
+            unique_jobs.append(job)
+            groups.append([index])
+
+        merged = len(jobs) - len(unique_jobs)
+        if merged:
+            print(f"🔗 동일 요청 {merged}개 병합 ({len(jobs)}개 → {len(unique_jobs)}개)")
+        return unique_jobs, groups
+
+    def _fan_out(self, jobs: List[Dict], groups: List[List[int]],
+                 unique_outcomes: List[List[Dict]]) -> List[List[Dict]]:
+        """병합된 결과를 요청한 도시별로 다시 나눔 (호텔 좌표/키워드 기준)"""
+        outcomes: List[List[Dict]] = [[] for _ in jobs]
+        for indices, hotels in zip(groups, unique_outcomes):
+            for index, job_hotels in self._split_group(jobs, indices, hotels):
+                outcomes[index] = job_hotels
+        return outcomes
+
+    def _split_group(self, jobs: List[Dict], indices: List[int],
+                     hotels: List[Dict]) -> List[Tuple[int, List[Dict]]]:
+        """병합된 작업 하나의 결과 → [(원래 작업 인덱스, 호텔 리스트)]"""
+        # 대표 작업이 마감으로 건너뛰어졌으면 병합된 작업도 건너뛴 것
+        if jobs[indices[0]].get("skipped"):
+            for i in indices:
+                jobs[i]["skipped"] = True
+        if len(indices) == 1:
+            return [(indices[0], hotels)]
+
+        city_keys = [jobs[i]["city_key"] for i in indices]
+        by_city = {city_key: i for i, city_key in zip(indices, city_keys)}
+        split = {i: [] for i in indices}
+        for hotel in hotels:
+            # 도시를 판단할 수 없으면 (좌표 / 키워드 없음) 요청한 도시 모두에 넣음 (병합 전과 같은 결과)
+            city_key = self._match_city(hotel, city_keys)
+            for target in ([city_key] if city_key else city_keys):
+                city_config = CITIES[target]
+                split[by_city[target]].append({
+                    **hotel,
+                    "city_key": target,
+                    "city_en": city_config["name_en"],
+                    "city_kr": city_config["name_kr"],
+                })
+        return list(split.items())
+
+    @staticmethod
+    def _match_city(hotel: Dict, city_keys: List[str]) -> Optional[str]:
+        """
+        호텔이 속한 도시 판단
+
+        1. 좌표가 있으면 가장 가까운 도시
+        2. 이름/주소에 도시 키워드가 있으면 그 도시
+        3. 둘 다 없으면 None (판단 불가)
+        """
+        lat, lng = hotel.get("latitude") or 0, hotel.get("longitude") or 0
+        if lat and lng:
+            return min(city_keys, key=lambda c: (CITIES[c]["lat"] - lat) ** 2 +
+                       ((CITIES[c]["lng"] - lng) * math.cos(math.radians(lat))) ** 2)
+
+        text = f"{hotel.get('name', '')} {hotel.get('name_en', '')} {hotel.get('address', '')}".lower()
+        for city_key in city_keys:
+            if any(keyword.lower() in text for keyword in CITIES[city_key]["keywords"]):
+                return city_key
+        return None
+
+    def _collect_results(self, results: Dict, jobs: List[Dict], outcomes: List[List[Dict]]) -> Dict:
+        """작업 결과를 도시별/전체 결과로 정리 (서킷 브레이커 / 지연 통계도 저장)"""
+        get_circuit_breakers().save()
+        get_latency_tracker().save()
 
-        # 도시별 스크래핑
         for city_key in self.cities:
             city_config = CITIES.get(city_key)
             if not city_config:
-                print(f"⚠️ 알 수 없는 도시: {city_key}")
                 continue
 
-            print(f"\n🏙️ [{city_config['name_en']}] 스크래핑 시작...")
             city_hotels = []
-
-            # 해당 도시의 스크래퍼 생성
-            city_scrapers = self._get_scrapers_for_city(city_key)
-
-            # 플랫폼별 스크래핑
-            for platform_name in platforms:
-                if platform_name not in city_scrapers:
-                    continue
-
-                scraper = city_scrapers[platform_name]['scraper']
-
-                try:
-                    hotels = scraper.scrape(checkin, checkout)
+            for job, hotels in zip(jobs, outcomes):
+                if job["city_key"] == city_key:
                     city_hotels.extend(hotels)
-                    print(f"   ✅ [{scraper.name}] {len(hotels)}개 수집")
-
-                    # 플랫폼 간 딜레이
-                    delay = random.uniform(3, 6)
-                    time.sleep(delay)
-
-                except Exception as e:
-                    print(f"   ❌ [{platform_name}] 실패: {e}")
 
             results["by_city"][city_key] = {
                 "name_en": city_config["name_en"],
@@ -1201,59 +1738,179 @@ class KoreanOTAScraper:
             }
             results["all_hotels"].extend(city_hotels)
 
-            # 도시 간 딜레이
-            if city_key != self.cities[-1]:
-                delay = random.uniform(5, 10)
-                print(f"⏳ 다음 도시까지 {delay:.1f}초 대기...")
-                time.sleep(delay)
-
         # 통계
         total = len(results["all_hotels"])
         print("\n" + "=" * 60)
         print(f"✅ 스크래핑 완료! 총 {total}개 호텔 수집")
         for city_key, city_data in results["by_city"].items():
             print(f"   - {city_data['name_en']}: {city_data['count']}개")
+        open_circuits = get_circuit_breakers().open_keys()
+        if open_circuits:
+            print(f"🚫 차단 중인 서킷: {', '.join(open_circuits)}")
         print("=" * 60)
 
         return results
 
-    def scrape_distributed(self, checkin: datetime = None, checkout: datetime = None) -> List[Dict]:
-        """
-        분산 스크래핑 - 매 실행마다 다른 도시/플랫폼 선택
+    def _start_results(self, checkin: datetime, checkout: datetime, platforms: List[str]) -> Dict:
+        """결과 딕셔너리 초기화 + 시작 로그"""
+        print("=" * 60)
+        print(f"🚀 ARMY Stay Hub - 다중 도시/플랫폼 스크래핑 시작")
+        print(f"📅 체크인: {checkin.strftime('%Y-%m-%d')}")
+        print(f"📅 체크아웃: {checkout.strftime('%Y-%m-%d')}")
+        print(f"🏙️ 도시: {', '.join([CITIES[c]['name_en'] for c in self.cities if c in CITIES])}")
+        print(f"🎯 플랫폼: {', '.join(platforms)}")
+        print("=" * 60)
 
-        분산 전략:
-        - 1~2개 도시 랜덤 선택
-        - 2~3개 글로벌 OTA 랜덤 선택
-        - 요청 간 충분한 딜레이
-        """
+        return {
+            "meta": {
+                "checkin": checkin.isoformat(),
+                "checkout": checkout.isoformat(),
+                "scraped_at": datetime.now().isoformat(),
+                "cities": self.cities,
+                "platforms_used": platforms,
+            },
+            "by_city": {},
+            "all_hotels": [],
+        }
+
+    def _resolve_dates(self, checkin: datetime, checkout: datetime) -> Tuple[datetime, datetime]:
+        """기본 날짜: 콘서트 전날 체크인 ~ 다음날 체크아웃"""
         if not checkin:
             checkin = self.concert_date - timedelta(days=1)
         if not checkout:
             checkout = self.concert_date + timedelta(days=1)
+        return checkin, checkout
 
-        # 1~2개 도시 랜덤 선택
-        num_cities = random.randint(1, 2)
-        selected_cities = random.sample(self.cities, min(num_cities, len(self.cities)))
+    def scrape_all(self, checkin: datetime = None, checkout: datetime = None,
+                   platforms: List[str] = None, engine: str = None,
+                   deadline: Optional[Deadline] = None) -> Dict:
+        """
+        모든 도시/플랫폼에서 호텔 정보 수집
+
+        Args:
+            checkin: 체크인 날짜 (기본: 콘서트 전날)
+            checkout: 체크아웃 날짜 (기본: 콘서트 다음날)
+            platforms: 사용할 플랫폼 리스트 (기본: agoda만)
+            engine: "serial" / "async" / "pipeline" (기본: self.engine)
+            deadline: 실행 마감 (지나면 끝난 결과까지만 반환)
 
-        # 2~3개 글로벌 OTA 랜덤 선택
-        global_otas = ['agoda', 'tripcom', 'hotelscom', 'booking', 'expedia']
-        num_platforms = random.randint(2, 3)
-        selected_platforms = random.sample(global_otas, num_platforms)
+        Returns:
+            도시별/플랫폼별 호텔 데이터 딕셔너리
+        """
+        checkin, checkout = self._resolve_dates(checkin, checkout)
+        if not platforms:
+            platforms = ['agoda']  # 기본은 Agoda만
 
-        print(f"🎲 이번 실행 도시: {', '.join([CITIES[c]['name_en'] for c in selected_cities])}")
-        print(f"🎯 이번 실행 플랫폼: {', '.join(selected_platforms)}")
+        results = self._start_results(checkin, checkout, platforms)
+        jobs = self._build_jobs(checkin, checkout, platforms)
+        outcomes = self.run_jobs(jobs, engine, deadline)
+        return self._collect_results(results, jobs, outcomes)
 
-        # 임시로 선택된 도시만 스크래핑
-        original_cities = self.cities
-        self.cities = selected_cities
+    async def scrape_all_async(self, checkin: datetime = None, checkout: datetime = None,
+                               platforms: List[str] = None,
+                               deadline: Optional[Deadline] = None) -> Dict:
+        """
+        scrape_all의 asyncio 버전
 
-        # 선택된 글로벌 OTA 사용
-        results = self.scrape_all(checkin, checkout, platforms=selected_platforms)
+        호스트(플랫폼)마다 하나의 레인에서 자기 속도로 요청하고,
+        서로 다른 호스트는 동시에 수집한다. 전체 소요 시간 ≈ 가장 느린 플랫폼 하나.
+        반환 구조는 scrape_all과 동일.
+        """
+        checkin, checkout = self._resolve_dates(checkin, checkout)
+        if not platforms:
+            platforms = ['agoda']  # 기본은 Agoda만
 
-        # 원래 도시 목록 복원
-        self.cities = original_cities
+        results = self._start_results(checkin, checkout, platforms)
+        jobs = self._build_jobs(checkin, checkout, platforms)
+        outcomes = await self.run_jobs_async(jobs, deadline)
+        return self._collect_results(results, jobs, outcomes)
 
-        return results["all_hotels"]
+    def scrape_distributed(self, checkin: datetime = None, checkout: datetime = None,
+                           budget: int = None, deadline: Optional[Deadline] = None) -> List[Dict]:
+        """
+        분산 스크래핑 - 매 실행마다 갱신이 가장 급한 도시 × 플랫폼 셀 선택
+
+        분산 전략 (scrape_scheduler):
+        - 셀별 마지막 갱신 시각 + 관찰된 가격/재고 변동률로 staleness 비용 계산
+        - 공연이 가까울수록 변동률 가중
+        - 실행당 요청 예산(budget) 안에서 비용이 큰 셀부터, 오래 방치된 셀은 무조건 먼저
+        - 비용에 셀별 수익률 UCB(yield_bandit)를 곱해 잘 나오는 셀에 예산을 더 배분
+        - 셀은 우선순위 순으로 실행, 마감(deadline)이 지나면 끝난 셀까지만 반환
+
+        선택한 셀은 작업 큐(scrape_queue)에 배치로 저장하고 작업이 끝날 때마다 결과를
+        기록한다. 게시(mark_published) 전에 프로세스가 죽으면 다음 실행이 그 배치를
+        이어서 실행하고, 이미 끝난 셀은 다시 요청하지 않는다.
+        """
+        checkin, checkout = self._resolve_dates(checkin, checkout)
+
+        registry = get_scraper_registry()
+        scheduler = get_scrape_scheduler()
+        bandit = get_yield_bandit()
+        queue = get_scrape_queue()
+
+        # 게시되지 않은 배치(이전 실행이 중간에 죽음)가 있으면 이어서 실행
+        batch_id = queue.open_batch()
+        if batch_id is not None:
+            counts = queue.counts(batch_id)
+            print(f"♻️ 미완료 배치 #{batch_id} 이어서 실행 "
+                  f"(완료 {counts.get('done', 0)}개, 남은 작업 {counts.get('pending', 0) + counts.get('running', 0)}개)")
+        else:
+            candidates = [(c, p) for c in self.cities if c in CITIES for p in GLOBAL_PLATFORMS]
+            breaker_names = {p: registry.get(p).name for p in GLOBAL_PLATFORMS}
+            weights = bandit.weights([cell_key(c, p) for c, p in candidates])
+            selected = scheduler.select(candidates, self.concert_date, budget, breaker_names, weights)
+            if not selected:
+                print("🚫 갱신할 수 있는 셀이 없습니다 (모든 서킷 차단 중)")
+                return []
+
+            print(f"🗓️ 이번 실행 셀: {', '.join(f'{c}:{p}' for c, p in selected)}")
+            batch_id = queue.create_batch([{
+                "city_key": c,
+                "platform": p,
+                "checkin": format_date(checkin),
+                "checkout": format_date(checkout),
+                "adults": registry.get(p).adults,
+            } for c, p in selected])
+        self.batch_id = batch_id
+
+        # 남은 작업만 큐 우선순위 순으로 실행, 끝나는 대로 결과를 큐에 기록
+        jobs = [self._job_from_queue(row) for row in queue.pending_jobs(batch_id)]
+        queue.mark_running([job["queue_id"] for job in jobs])
+
+        def on_done(job: Dict, hotels: List[Dict]):
+            if job.get("skipped"):
+                # 마감으로 시작하지 못한 셀은 다음 실행에서 다시 후보
+                queue.release(job["queue_id"])
+                return
+            queue.complete(job["queue_id"], hotels)
+            # 셀마다 바로 기록/저장 (도중에 죽어도 끝난 셀은 다시 고르지 않음)
+            yielded = scheduler.observe(job["city_key"], job["platform"], hotels)
+            # 병합되어 요청 없이 결과만 나눠 받은 작업은 수익률 기록에서 제외
+            if "requests" in job:
+                bandit.record(cell_key(job["city_key"], job["platform"]),
+                              yielded, job["requests"], job["elapsed_sec"])
+            scheduler.save()
+            bandit.save()
+
+        if jobs:
+            original_cities = self.cities
+            self.cities = list(dict.fromkeys(job["city_key"] for job in jobs))
+            platforms = list(dict.fromkeys(job["platform"] for job in jobs))
+            try:
+                results = self._start_results(jobs[0]["checkin"], jobs[0]["checkout"], platforms)
+                outcomes = self.run_jobs(jobs, deadline=deadline, on_done=on_done)
+                self._collect_results(results, jobs, outcomes)
+            finally:
+                self.cities = original_cities
+            bandit.report([cell_key(job["city_key"], job["platform"]) for job in jobs])
+
+        # 이전 실행에서 끝난 셀까지 포함한 배치 전체 결과
+        return queue.batch_results(batch_id)
+
+    def mark_published(self):
+        """이번 배치 결과 게시 완료 (다음 실행은 새 배치로 시작)"""
+        if self.batch_id is not None:
+            get_scrape_queue().mark_published(self.batch_id)
 
     def merge_with_simulation(self, scraped_hotels: List[Dict], simulated_hotels: List[Dict]) -> List[Dict]:
         """
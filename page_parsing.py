@@ -0,0 +1,252 @@
+"""
+ARMY Stay Hub - OTA 페이지 파싱 공통 도구
+
+HTML 파서 백엔드 선택:
+- lxml (C 구현, 가장 빠름) → 설치 안 되어 있으면 내장 html.parser로 폴백
+- 환경변수 HTML_PARSER로 강제 지정 가능 (예: HTML_PARSER=html.parser)
+
+부분 파싱 (SoupStrainer):
+- 필요한 서브트리(카드 요소, JSON-LD 스크립트)만 트리로 만든다
+- 수 MB짜리 OTA 페이지에서 파싱 CPU와 최대 메모리를 줄인다
+
+임베디드 JSON 추출:
+- __NEXT_DATA__ / window.__STATE__ 같은 JSON 블롭은 DOM 없이 바로 잘라낸다
+- NextDataStream: 스트리밍 다운로드 중 __NEXT_DATA__가 다 도착했는지 청크 단위로 판단
+"""
+
+import importlib.util
+import json
+import os
+import re
+from typing import Optional
+
+# bs4는 처음 파싱할 때 import (스크래퍼 모듈을 import만 해서는 로드하지 않음)
+BS4_AVAILABLE = importlib.util.find_spec("bs4") is not None
+
+
+# 선호 순서 (앞에 있을수록 빠름)
+PARSER_BACKENDS = ["lxml", "html.parser"]
+
+
+def resolve_parser_backend(preferred: str = None) -> Optional[str]:
+    """
+    사용 가능한 파서 백엔드 이름 반환
+
+    preferred가 설치되어 있으면 그것을, 아니면 PARSER_BACKENDS 순서대로 선택
+    """
+    if not BS4_AVAILABLE:
+        return None
+    from bs4.builder import builder_registry
+
+    candidates = ([preferred] if preferred else []) + PARSER_BACKENDS
+    for name in candidates:
+        if builder_registry.lookup(name) is not None:
+            return name
+    return "html.parser"
+
+
+HTML_PARSER: Optional[str] = None     # 처음 파싱할 때 결정 (configure_parser_backend로 변경)
+
+
+def parser_backend() -> Optional[str]:
+    """현재 파서 백엔드 (처음 호출 시 환경변수 HTML_PARSER / 설치된 백엔드로 결정)"""
+    global HTML_PARSER
+    if HTML_PARSER is None:
+        HTML_PARSER = resolve_parser_backend(os.environ.get("HTML_PARSER") or None)
+    return HTML_PARSER
+
+
+def configure_parser_backend(name: str) -> Optional[str]:
+    """파서 백엔드 변경 (설치 안 된 경우 폴백된 이름 반환)"""
+    global HTML_PARSER
+    HTML_PARSER = resolve_parser_backend(name)
+    return HTML_PARSER
+
+
+class Strainer:
+    """SoupStrainer 인자만 들고 있다가 처음 파싱할 때 생성 (클래스 속성으로 둬도 bs4 로드 안 함)"""
+
+    def __init__(self, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        self._strainer = None
+
+    def build(self):
+        if self._strainer is None:
+            from bs4 import SoupStrainer
+            self._strainer = SoupStrainer(*self.args, **self.kwargs)
+        return self._strainer
+
+
+def make_soup(html, parse_only=None):
+    """선택된 백엔드로 BeautifulSoup 생성 (parse_only로 서브트리만 파싱)"""
+    from bs4 import BeautifulSoup
+    if isinstance(parse_only, Strainer):
+        parse_only = parse_only.build()
+    return BeautifulSoup(html, parser_backend(), parse_only=parse_only)
+
+
+def strainer(*args, **kwargs) -> Optional[Strainer]:
+    """부분 파싱 필터 (bs4가 없으면 None)"""
+    return Strainer(*args, **kwargs) if BS4_AVAILABLE else None
+
+
+def class_strainer(names, pattern: str) -> Optional[Strainer]:
+    """클래스 정규식으로 카드 요소만 남기는 필터"""
+    return strainer(names, class_=re.compile(pattern, re.I))
+
+
+# ===== 자주 쓰는 부분 파싱 필터 (한 번만 생성) =====
+JSON_LD_ONLY = strainer('script', type='application/ld+json')
+
+
+# ===== 임베디드 JSON 추출 (DOM 없이) =====
+#
+# 페이지 전체를 트리로 만들지 않고, 마커 위치에서 시작해 중괄호 균형을
+# 문자열/이스케이프를 인식하며 스캔한 뒤 그 구간만 json.loads 한다.
+# - 선형 시간 (정규식으로 관심 문자만 건너뛰며 스캔)
+# - 문자열 안의 "};" 같은 내용에 속지 않음
+# - bytes / str 모두 지원 (bytes면 디코딩 없이 바로 스캔)
+
+_PATTERNS = {}
+
+
+def _patterns(data):
+    """입력 타입(bytes/str)에 맞는 스캔용 정규식/토큰"""
+    kind = bytes if isinstance(data, (bytes, bytearray)) else str
+    if kind not in _PATTERNS:
+        enc = (lambda x: x.encode()) if kind is bytes else (lambda x: x)
+        _PATTERNS[kind] = {
+            "struct": re.compile(enc(r'[{}\[\]"]')),
+            "string_end": re.compile(enc(r'["\\]')),
+            "next_data": re.compile(enc(r'<script[^>]*\bid\s*=\s*["\']?__NEXT_DATA__["\']?[^>]*>\s*')),
+            "space": re.compile(enc(r'\s*')),
+            "quote": enc('"'),
+            "backslash": enc('\\'),
+            "open": (enc('{'), enc('[')),
+        }
+    return _PATTERNS[kind]
+
+
+def find_json_end(data, start: int) -> int:
+    """
+    data[start]의 '{' 또는 '['와 짝이 맞는 닫는 괄호 다음 위치 반환
+
+    끝까지 균형이 맞지 않으면(잘린 문서 등) -1
+    """
+    p = _patterns(data)
+    struct_re, string_end_re = p["struct"], p["string_end"]
+    quote, backslash, opens = p["quote"], p["backslash"], p["open"]
+
+    depth = 0
+    pos = start
+    while True:
+        m = struct_re.search(data, pos)
+        if not m:
+            return -1
+        token = m.group()
+
+        if token == quote:
+            # 문자열 건너뛰기 (\" 이스케이프 처리)
+            pos = m.end()
+            while True:
+                s = string_end_re.search(data, pos)
+                if not s:
+                    return -1
+                if s.group() == backslash:
+                    pos = s.end() + 1
+                    continue
+                pos = s.end()
+                break
+            continue
+
+        depth += 1 if token in opens else -1
+        pos = m.end()
+        if depth == 0:
+            return pos
+
+
+def _decode_json_at(data, start: int):
+    """start 위치의 JSON 값 디코딩 (객체/배열이 아니거나 잘렸으면 None)"""
+    p = _patterns(data)
+    start = p["space"].match(data, start).end()
+    if data[start:start + 1] not in p["open"]:
+        return None
+
+    end = find_json_end(data, start)
+    if end < 0:
+        return None
+    return json.loads(data[start:end])
+
+
+def extract_next_data(html):
+    """
+    <script id="__NEXT_DATA__"> JSON 추출
+
+    Returns:
+        dict (없거나 잘린 경우 None)
+    Raises:
+        json.JSONDecodeError: 구간은 찾았지만 JSON이 깨진 경우
+    """
+    m = _patterns(html)["next_data"].search(html)
+    if not m:
+        return None
+    return _decode_json_at(html, m.end())
+
+
+def extract_assigned_json(html, markers):
+    """
+    `window.__STATE__ = {...};` 형태의 할당 JSON 추출
+
+    Args:
+        markers: 변수명 (문자열 또는 리스트, 앞에서부터 시도)
+    """
+    if isinstance(markers, str):
+        markers = [markers]
+
+    for marker in markers:
+        if isinstance(html, (bytes, bytearray)):
+            marker = marker.encode()
+        assign = rb'\s*=\s*' if isinstance(marker, bytes) else r'\s*=\s*'
+        pattern = re.compile(re.escape(marker) + assign)
+
+        for m in pattern.finditer(html):
+            data = _decode_json_at(html, m.end())
+            if data is not None:
+                return data
+    return None
+
+
+class NextDataStream:
+    """
+    스트리밍 응답용 __NEXT_DATA__ 도착 감지기
+
+    청크를 feed()로 넣으면, <script id="__NEXT_DATA__"> 시작 태그와 그 뒤의
+    </script>가 모두 도착했을 때 True를 반환한다 (그 뒤 본문은 받을 필요 없음).
+    Next.js는 JSON 안의 '<'를 \\u003c로 이스케이프하므로 </script>가 JSON 끝이다.
+    새 청크만 (경계 겹침 포함) 검색하므로 전체 선형 시간.
+    """
+
+    _END = re.compile(rb'</script', re.I)
+    _OVERLAP = 256    # 청크 경계에 걸친 태그를 놓치지 않도록 다시 보는 길이
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.json_start = -1    # __NEXT_DATA__ 시작 태그 다음 위치
+        self._scanned = 0       # 여기까지는 마커 / 끝 태그 검색 완료
+
+    def feed(self, chunk: bytes) -> bool:
+        self.buffer += chunk
+        search_from = max(0, self._scanned - self._OVERLAP)
+
+        if self.json_start < 0:
+            m = _patterns(b"")["next_data"].search(self.buffer, search_from)
+            if not m:
+                self._scanned = len(self.buffer)
+                return False
+            self.json_start = m.end()
+            search_from = self.json_start
+
+        done = self._END.search(self.buffer, max(search_from, self.json_start)) is not None
+        self._scanned = len(self.buffer)
+        return done
@@ -0,0 +1,164 @@
+"""
+ARMY Stay Hub - 호스트별 토큰 버킷 요청 스케줄러
+
+흩어져 있던 time.sleep(random.uniform(...)) 딜레이를 하나로 모은 중앙 스케줄러.
+
+- 호스트마다 "window 초당 N회" 예산의 토큰 버킷
+- 대기는 해당 호스트를 요청하는 스레드만 → 다른 호스트는 병렬 진행
+- 429 / 503 응답 시 지수 백오프 + Retry-After 헤더 준수
+- 성공하면 백오프를 점차 원래대로 회복
+- 버킷 통과 후 작은 랜덤 지터 (사람처럼 보이도록 요청 간격을 불규칙하게)
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+
+# ===== 요청 예산 설정: (window 당 요청 수, window 초) =====
+DEFAULT_RATE = (1, 3.5)          # 기존 2~5초 랜덤 딜레이와 비슷한 평균 간격
+HOST_RATES = {
+    "www.reddit.com": (1, 2.0),  # Reddit public API (2초 간격)
+}
+
+JITTER_SEC = (0.0, 1.0)          # 토큰 획득 후 추가 랜덤 지터
+BASE_BACKOFF_SEC = 10.0          # 첫 429/503 백오프
+MAX_BACKOFF_SEC = 300.0          # 최대 백오프
+
+_limiter: Optional["HostRateLimiter"] = None
+_limiter_lock = threading.Lock()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP 날짜) → 대기 초"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """단일 호스트 토큰 버킷"""
+
+    def __init__(self, requests: int, window_sec: float):
+        self.capacity = float(requests)
+        self.refill_per_sec = requests / window_sec
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0    # 백오프 종료 시각 (monotonic)
+        self.backoff_sec = 0.0      # 현재 백오프 크기
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_sec)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """토큰을 가져가면 0, 아니면 기다려야 할 초 (lock 보유 상태에서 호출)"""
+        now = time.monotonic()
+        self._refill(now)
+
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.refill_per_sec
+
+
+class HostRateLimiter:
+    """호스트별 토큰 버킷 모음"""
+
+    def __init__(self, rates: Dict[str, Tuple[int, float]] = None,
+                 default_rate: Tuple[int, float] = DEFAULT_RATE,
+                 jitter_sec: Tuple[float, float] = JITTER_SEC):
+        self.rates = dict(HOST_RATES if rates is None else rates)
+        self.default_rate = default_rate
+        self.jitter_sec = jitter_sec
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            if host not in self._buckets:
+                requests, window = self.rates.get(host, self.default_rate)
+                self._buckets[host] = TokenBucket(requests, window)
+            return self._buckets[host]
+
+    def set_rate(self, host: str, requests: int, window_sec: float):
+        """호스트 예산 변경 (기존 버킷은 새로 생성)"""
+        with self._lock:
+            self.rates[host] = (requests, window_sec)
+            self._buckets.pop(host, None)
+
+    def acquire(self, host: str, timeout: float = None) -> bool:
+        """
+        호스트 요청 슬롯 획득 (필요하면 이 스레드만 대기)
+
+        Returns:
+            timeout 안에 획득하면 True
+        """
+        bucket = self._bucket(host)
+        give_up_at = time.monotonic() + timeout if timeout is not None else None
+
+        while True:
+            with bucket.lock:
+                wait = bucket.reserve()
+            if wait <= 0:
+                break
+            if give_up_at is not None and time.monotonic() + wait > give_up_at:
+                return False
+            time.sleep(wait)
+
+        if self.jitter_sec[1] > 0:
+            time.sleep(random.uniform(*self.jitter_sec))
+        return True
+
+    def try_acquire(self, host: str) -> bool:
+        """대기 없이 슬롯 획득 시도"""
+        bucket = self._bucket(host)
+        with bucket.lock:
+            return bucket.reserve() <= 0
+
+    def penalize(self, host: str, retry_after: Optional[str] = None) -> float:
+        """
+        429 / 503 응답 반영 - 지수 백오프 (Retry-After가 더 길면 그 값)
+
+        Returns:
+            적용된 대기 초
+        """
+        bucket = self._bucket(host)
+        with bucket.lock:
+            bucket.backoff_sec = min(MAX_BACKOFF_SEC, max(BASE_BACKOFF_SEC, bucket.backoff_sec * 2))
+            wait = max(bucket.backoff_sec, parse_retry_after(retry_after) or 0.0)
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + wait)
+            bucket.tokens = 0.0
+        print(f"⏳ [{host}] 요청 제한 감지 → {wait:.0f}초 대기")
+        return wait
+
+    def reward(self, host: str):
+        """성공 응답 반영 - 백오프 절반으로 회복"""
+        bucket = self._bucket(host)
+        with bucket.lock:
+            bucket.backoff_sec = bucket.backoff_sec / 2 if bucket.backoff_sec >= BASE_BACKOFF_SEC else 0.0
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """프로세스 공유 스케줄러"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = HostRateLimiter()
+    return _limiter
@@ -6,21 +6,24 @@ Reddit r/bangtan, r/kpop 등에서 해외 아미들의 숙소 관련 니즈를 
 Agoda 숙소 매칭에 활용할 인사이트를 추출하는 모듈.
 
 사용: Reddit JSON API (인증 불필요한 public endpoint)
-주의: 개인 MVP용. rate limit 준수 (2초 간격).
+주의: 개인 MVP용. rate limit 준수 (호스트별 요청 스케줄러, 2초 간격).
 """
 
 import requests
-import time
 import re
 import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from collections import Counter
 
+from rate_limiter import get_rate_limiter
+
 
 class RedditFanAnalyzer:
     """Reddit에서 해외 ARMY의 숙소 니즈를 분석"""
 
+    API_HOST = "www.reddit.com"
+
     SUBREDDITS = ["bangtan", "kpop", "kpophelp", "koreatravel"]
 
     SEARCH_QUERIES = [
@@ -120,8 +123,8 @@ class RedditFanAnalyzer:
         self.collected_comments: List[Dict] = []
 
     def _rate_limit(self):
-        """Reddit API rate limit 준수"""
-        time.sleep(2.0)
+        """Reddit API rate limit 준수 (공유 스케줄러의 reddit 예산 대기)"""
+        get_rate_limiter().acquire(self.API_HOST)
 
     def fetch_subreddit_posts(self, subreddit: str, query: str, limit: int = 25) -> List[Dict]:
         """Reddit JSON API로 서브레딧 검색"""
@@ -139,8 +142,9 @@ class RedditFanAnalyzer:
             response = self.session.get(url, params=params, timeout=15)
 
             if response.status_code == 429:
-                print(f"  Rate limited on r/{subreddit}. Waiting 60s...")
-                time.sleep(60)
+                print(f"  Rate limited on r/{subreddit}. Backing off...")
+                get_rate_limiter().penalize(self.API_HOST, response.headers.get("Retry-After"))
+                self._rate_limit()
                 response = self.session.get(url, params=params, timeout=15)
 
             if response.status_code != 200:
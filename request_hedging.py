@@ -0,0 +1,212 @@
+"""
+ARMY Stay Hub - 플랫폼별 지연 통계 / 헤지 요청 / 재시도
+
+_make_request가 timeout=30 한 번으로 끝나면 느린 응답 하나가 워커를 30초 붙잡고,
+일시적 실패 한 번에 그 셀은 이번 실행에서 사라진다.
+
+- 플랫폼별 최근 응답 시간으로 p95 / p99 계산 (실행 간 JSON 저장)
+- 타임아웃은 중도 절단 표본(null)으로 저장: 실제 지연은 타임아웃보다 길다는 것만 앎
+  → 백분위 순위가 절단 표본에 걸리면 값을 모르는 것으로 보고 최대 타임아웃 / 헤지 안 함
+  (타임아웃 값을 지연으로 저장하면 p99 → 다음 타임아웃 → p99로 계속 부풀어 오름)
+- 요청 타임아웃 = p99 × timeout_multiplier (min~max 사이, 표본이 적으면 max)
+- p95가 지나도 응답이 없으면 같은 요청을 하나 더 보내고(헤지) 먼저 온 응답 사용,
+  진 쪽은 취소 이벤트로 본문 수신을 중단하고 연결을 닫음 (HedgeCancelled)
+- 헤지 요청은 호스트 토큰이 바로 있을 때만 (rate_limiter 예산을 넘기지 않음)
+- 재시도는 최대 max_attempts회, 지수 백오프 + 지터 (매 시도마다 호스트 토큰 획득)
+- 응답 대기는 실행 마감까지만 (지나면 DeadlineExceeded, 진행 중인 요청은 모두 취소)
+"""
+
+import json
+import math
+import os
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from deadline import Deadline, DeadlineExceeded, remaining_or_none
+
+# ===== 지연 / 타임아웃 설정 =====
+LATENCY_STATS_FILE = "latency_stats.json"
+LATENCY_CONFIG = {
+    "window": 50,                 # 플랫폼별 최근 표본 수
+    "min_samples": 5,             # 이보다 적으면 기본 타임아웃 / 헤지 안 함
+    "hedge_percentile": 95,       # 헤지 요청 발사 시점
+    "timeout_percentile": 99,
+    "timeout_multiplier": 2.0,    # 타임아웃 = p99 × 배수
+    "min_timeout_sec": 5.0,
+    "max_timeout_sec": 30.0,      # 기존 고정 타임아웃
+}
+
+# ===== 재시도 설정 =====
+RETRY_CONFIG = {
+    "max_attempts": 3,                              # 첫 요청 포함
+    "base_delay_sec": 1.0,                          # 재시도 대기 = uniform(0, base × 2^시도)
+    "retry_statuses": (429, 500, 502, 503, 504),
+}
+
+HEDGE_WORKERS = 16               # 호스트 레인 수(플랫폼 9개) + 헤지 여유
+
+_tracker: Optional["LatencyTracker"] = None
+_hedge_pool: Optional[ThreadPoolExecutor] = None
+_singleton_lock = threading.Lock()
+
+
+def percentile(samples: List[Optional[float]], q: float) -> Optional[float]:
+    """
+    최근접 순위 백분위수
+
+    None은 중도 절단 표본(타임아웃, 어떤 관측값보다 크다고 봄). 순위가 절단
+    표본에 걸리면 None (그 백분위수는 모름).
+    """
+    ordered = sorted(v for v in samples if v is not None)
+    rank = max(1, math.ceil(q / 100 * len(samples)))
+    return ordered[rank - 1] if rank <= len(ordered) else None
+
+
+def retry_delay(attempt: int) -> float:
+    """attempt번째 재시도 전 대기 (full jitter)"""
+    return random.uniform(0, RETRY_CONFIG["base_delay_sec"] * (2 ** attempt))
+
+
+class LatencyTracker:
+    """플랫폼별 최근 응답 시간 (파일 저장 지원)"""
+
+    def __init__(self, stats_file: str = LATENCY_STATS_FILE, config: Dict = None):
+        self.stats_file = stats_file
+        self.config = {**LATENCY_CONFIG, **(config or {})}
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[Optional[float]]] = self._load_stats()
+
+    def _load_stats(self) -> Dict:
+        if not os.path.exists(self.stats_file):
+            return {}
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get("samples", {})
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def save(self):
+        """표본 저장 (임시 파일 → 교체)"""
+        with self._lock:
+            tmp_path = f"{self.stats_file}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"updated_at": datetime.now().isoformat(), "samples": self.samples},
+                          f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.stats_file)
+
+    def record(self, platform: str, seconds: float):
+        """응답 시간 기록"""
+        self._append(platform, round(seconds, 3))
+
+    def record_timeout(self, platform: str):
+        """타임아웃 기록 (중도 절단 표본)"""
+        self._append(platform, None)
+
+    def _append(self, platform: str, sample: Optional[float]):
+        with self._lock:
+            samples = self.samples.setdefault(platform, [])
+            samples.append(sample)
+            del samples[:-self.config["window"]]
+
+    def _percentile(self, platform: str, q: float) -> Optional[float]:
+        with self._lock:
+            samples = list(self.samples.get(platform, []))
+        if len(samples) < self.config["min_samples"]:
+            return None
+        return percentile(samples, q)
+
+    def timeout_for(self, platform: str) -> float:
+        """플랫폼 요청 타임아웃 (p99를 모르면 최대값)"""
+        p = self._percentile(platform, self.config["timeout_percentile"])
+        if p is None:
+            return self.config["max_timeout_sec"]
+        return min(self.config["max_timeout_sec"],
+                   max(self.config["min_timeout_sec"], p * self.config["timeout_multiplier"]))
+
+    def hedge_delay(self, platform: str) -> Optional[float]:
+        """헤지 요청 발사 시점 (표본이 부족하거나 p95를 모르면 None = 헤지 안 함)"""
+        return self._percentile(platform, self.config["hedge_percentile"])
+
+
+class HedgeCancelled(Exception):
+    """헤지에서 진 요청을 중단함 (취소 이벤트가 설정됨)"""
+
+
+def _close_response(future):
+    """헤지에서 진 쪽 응답 정리 (취소되기 전에 끝난 경우)"""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def hedged_call(send: Callable[[Optional[threading.Event]], object], hedge_delay: Optional[float],
+                can_hedge: Callable[[], bool], label: str = "",
+                deadline: Optional[Deadline] = None):
+    """
+    send(cancelled)를 실행하고, hedge_delay 안에 끝나지 않으면 can_hedge()가 허용할 때
+    한 번 더 실행해서 먼저 성공한 결과를 반환한다.
+
+    send는 본문을 읽는 동안 cancelled(threading.Event, 헤지 안 하면 None)를 확인해서
+    설정되면 연결을 닫고 HedgeCancelled를 던져야 한다. 승자가 정해지면 나머지는 바로 취소.
+
+    둘 다 실패하면 첫 예외를 다시 던진다. deadline까지 아무 응답도 없으면
+    DeadlineExceeded (진행 중인 send는 모두 취소).
+    """
+    if hedge_delay is None:
+        return send(None)
+
+    pool = get_hedge_pool()
+    cancels = [threading.Event()]
+    futures = [pool.submit(send, cancels[0])]
+    done, _ = wait(futures, timeout=hedge_delay)
+    if not done and can_hedge():
+        print(f"🪝 [{label}] {hedge_delay:.1f}초 동안 응답 없음 → 헤지 요청")
+        cancels.append(threading.Event())
+        futures.append(pool.submit(send, cancels[-1]))
+
+    winner = None
+    error = None
+    pending = set(futures)
+    while pending and winner is None:
+        done, pending = wait(pending, timeout=remaining_or_none(deadline), return_when=FIRST_COMPLETED)
+        if not done:
+            error = DeadlineExceeded(f"[{label}] 마감까지 응답 없음")
+            break
+        for future in done:
+            if future.exception() is not None:
+                error = error or future.exception()
+            elif winner is None:
+                winner = future
+
+    # 진 쪽은 바로 취소 (본문 수신 중단 → 헤지 스레드 / 커넥션 반환), 이미 끝났으면 응답만 닫기
+    for future, cancel in zip(futures, cancels):
+        if future is not winner:
+            cancel.set()
+            future.add_done_callback(_close_response)
+
+    if winner is None:
+        raise error
+    return winner.result()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """프로세스 공유 지연 통계 (최초 호출 시 파일에서 로드)"""
+    global _tracker
+    if _tracker is None:
+        with _singleton_lock:
+            if _tracker is None:
+                _tracker = LatencyTracker(LATENCY_STATS_FILE)
+    return _tracker
+
+
+def get_hedge_pool() -> ThreadPoolExecutor:
+    """헤지 요청용 스레드 풀"""
+    global _hedge_pool
+    if _hedge_pool is None:
+        with _singleton_lock:
+            if _hedge_pool is None:
+                _hedge_pool = ThreadPoolExecutor(max_workers=HEDGE_WORKERS,
+                                                 thread_name_prefix="hedge")
+    return _hedge_pool
@@ -0,0 +1,250 @@
+"""
+ARMY Stay Hub - OTA 원본 응답 아카이브 (기록 & 재생)
+
+기록 모드: 스크래퍼가 받은 원본 HTML/JSON을 내용 주소(sha256) 기반으로
+gzip 압축 저장하고, 언제/어디서/어떤 플랫폼에서 받았는지 manifest에 남긴다.
+
+재생 모드: 네트워크 없이 아카이브된 페이지를 각 플랫폼의 _parse_response에
+다시 넣어 정규화 결과를 만든다. 파서 수정 후 과거 데이터 재처리, 파서 벤치마크용.
+
+사용:
+    RESPONSE_ARCHIVE=1 python run_scraper.py       # 기록
+    python response_archive.py replay --platform Agoda --since 2026-04-01
+    python response_archive.py bench
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# ===== 아카이브 설정 =====
+ARCHIVE_DIR = "response_archive"
+ARCHIVE_ENABLED = os.environ.get("RESPONSE_ARCHIVE", "") == "1"
+
+MANIFEST_FILE = "manifest.jsonl"
+
+_archive: Optional["ResponseArchive"] = None
+_archive_lock = threading.Lock()
+
+
+class ResponseArchive:
+    """내용 주소 기반 압축 응답 저장소"""
+
+    def __init__(self, archive_dir: str = ARCHIVE_DIR):
+        self.archive_dir = archive_dir
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(self.archive_dir, "objects"), exist_ok=True)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.archive_dir, "objects", digest[:2], f"{digest}.gz")
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.archive_dir, MANIFEST_FILE)
+
+    def store(self, body: bytes, platform: str, scraper: str, city_key: str,
+              url: str, encoding: Optional[str] = None) -> str:
+        """
+        원본 응답 저장
+
+        같은 내용은 한 번만 저장되고, manifest에는 수집 기록이 매번 추가된다.
+
+        Returns:
+            본문 sha256
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp.{threading.get_ident()}"
+            with gzip.open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+
+        record = {
+            "sha256": digest,
+            "platform": platform,
+            "scraper": scraper,
+            "city_key": city_key,
+            "url": url,
+            "encoding": encoding,
+            "size": len(body),
+            "fetched_at": datetime.now().isoformat(),
+        }
+        with self._lock:
+            with open(self._manifest_path(), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        return digest
+
+    def load(self, digest: str) -> bytes:
+        """sha256으로 원본 본문 로드"""
+        with gzip.open(self._object_path(digest), 'rb') as f:
+            return f.read()
+
+    def iter_records(self, platform: str = None, city_key: str = None,
+                     since: str = None, until: str = None) -> Iterator[Dict]:
+        """manifest 기록 순회 (필터: 플랫폼 / 도시 / 수집 시각 ISO 문자열 범위)"""
+        path = self._manifest_path()
+        if not os.path.exists(path):
+            return
+
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                if platform and record["platform"] != platform:
+                    continue
+                if city_key and record["city_key"] != city_key:
+                    continue
+                if since and record["fetched_at"] < since:
+                    continue
+                if until and record["fetched_at"] >= until:
+                    continue
+                yield record
+
+    def load_text(self, record: Dict) -> str:
+        """기록의 본문을 문자열로 디코딩"""
+        body = self.load(record["sha256"])
+        return body.decode(record.get("encoding") or "utf-8", errors="replace")
+
+
+def get_response_archive() -> Optional[ResponseArchive]:
+    """기록 모드일 때 공유 아카이브 반환 (아니면 None)"""
+    global _archive
+    if not ARCHIVE_ENABLED:
+        return None
+    if _archive is None:
+        with _archive_lock:
+            if _archive is None:
+                _archive = ResponseArchive(ARCHIVE_DIR)
+    return _archive
+
+
+def configure_response_archive(enabled: bool = None, archive_dir: str = None):
+    """기록 모드 설정 변경"""
+    global _archive, ARCHIVE_ENABLED, ARCHIVE_DIR
+    with _archive_lock:
+        if enabled is not None:
+            ARCHIVE_ENABLED = enabled
+        if archive_dir is not None:
+            ARCHIVE_DIR = archive_dir
+        _archive = None
+
+
+def _get_scraper(record: Dict, scrapers: Dict):
+    """기록에 해당하는 스크래퍼 인스턴스 (도시/클래스별 재사용)"""
+    key = (record["scraper"], record["city_key"])
+    if key not in scrapers:
+        import korean_ota_scraper
+        scraper_cls = getattr(korean_ota_scraper, record["scraper"], None)
+        scrapers[key] = scraper_cls(record["city_key"]) if scraper_cls else None
+    return scrapers[key]
+
+
+def replay(archive: ResponseArchive = None, platform: str = None, city_key: str = None,
+           since: str = None, until: str = None) -> Iterator[Tuple[Dict, List[Dict]]]:
+    """
+    아카이브 재생 - 네트워크 없이 _parse_response 재실행
+
+    Yields:
+        (manifest 기록, 정규화된 호텔 리스트)
+        호텔의 scraped_at은 원래 수집 시각으로 맞춘다.
+    """
+    archive = archive or ResponseArchive(ARCHIVE_DIR)
+    scrapers: Dict = {}
+
+    for record in archive.iter_records(platform, city_key, since, until):
+        scraper = _get_scraper(record, scrapers)
+        if scraper is None:
+            print(f"⚠️ 알 수 없는 스크래퍼: {record['scraper']}")
+            continue
+
+        try:
+            html = archive.load_text(record)
+        except OSError as e:
+            print(f"⚠️ 아카이브 본문 없음: {record['sha256'][:12]} ({e})")
+            continue
+
+        hotels = scraper._parse_response(html)
+        for hotel in hotels:
+            hotel["scraped_at"] = record["fetched_at"]
+        yield record, hotels
+
+
+def benchmark(archive: ResponseArchive = None, platform: str = None) -> Dict:
+    """플랫폼별 파서 성능 측정 (아카이브 페이지 기준)"""
+    archive = archive or ResponseArchive(ARCHIVE_DIR)
+    scrapers: Dict = {}
+    stats: Dict[str, Dict] = {}
+
+    for record in archive.iter_records(platform):
+        scraper = _get_scraper(record, scrapers)
+        if scraper is None:
+            continue
+        html = archive.load_text(record)
+
+        start = time.perf_counter()
+        hotels = scraper._parse_response(html)
+        elapsed = time.perf_counter() - start
+
+        s = stats.setdefault(record["platform"], {"pages": 0, "bytes": 0, "hotels": 0, "seconds": 0.0})
+        s["pages"] += 1
+        s["bytes"] += record["size"]
+        s["hotels"] += len(hotels)
+        s["seconds"] += elapsed
+
+    return stats
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="OTA 응답 아카이브 재생/벤치마크")
+    parser.add_argument("command", choices=["replay", "bench"])
+    parser.add_argument("--dir", default=ARCHIVE_DIR)
+    parser.add_argument("--platform")
+    parser.add_argument("--city")
+    parser.add_argument("--since")
+    parser.add_argument("--until")
+    parser.add_argument("--output", help="재생 결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    archive = ResponseArchive(args.dir)
+
+    if args.command == "bench":
+        for name, s in benchmark(archive, args.platform).items():
+            per_page = s["seconds"] / s["pages"] * 1000
+            print(f"📊 {name}: {s['pages']}페이지, {s['hotels']}개 호텔, "
+                  f"{s['bytes'] / 1024 / 1024:.1f}MB, 페이지당 {per_page:.1f}ms")
+        return
+
+    all_hotels = []
+    pages = 0
+    for record, hotels in replay(archive, args.platform, args.city, args.since, args.until):
+        pages += 1
+        all_hotels.extend(hotels)
+        print(f"🔁 [{record['platform']}] {record['city_key']} {record['fetched_at']}: {len(hotels)}개")
+
+    print(f"✅ 재생 완료: {pages}페이지, 총 {len(all_hotels)}개 호텔")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(all_hotels, f, ensure_ascii=False, indent=2)
+        print(f"✅ 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
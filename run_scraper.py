@@ -8,18 +8,41 @@ ARMY Stay Hub - 데이터 엔진 v5.0
 - 📁 정적: army_local_guide, booking_guide, venue
 """
 
+import gc
+import hashlib
 import json
+import os
 import random
 import math
-from datetime import datetime
-from typing import List, Dict
+import importlib.util
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Tuple
 
-# 스크래핑 모듈
-try:
-    from korean_ota_scraper import KoreanOTAScraper
-    SCRAPING_ENABLED = True
-except ImportError:
-    SCRAPING_ENABLED = False
+from deadline import Deadline, RUN_TIME_BUDGET_SEC, PUBLISH_RESERVE_SEC
+from geo_distance import distance_matrix, ENRICH_CHUNK_SIZE
+from geo_index import GeoIndex, PoiIndex
+from geo_cache import GeoFeatureCache, GEO_CACHE_FILE, tables_version
+
+# 스크래핑 모듈 (실제 스크래핑할 때만 import → 샘플/비상 모드는 requests/bs4 로드 없이 바로 시작)
+# 설치 여부만 확인: 하나라도 없으면 전처럼 샘플 모드
+SCRAPING_DEPENDENCIES = ("korean_ota_scraper", "requests", "bs4")
+SCRAPING_ENABLED = all(importlib.util.find_spec(name) is not None for name in SCRAPING_DEPENDENCIES)
+
+# 이번 실행에서 갱신하지 못한 호텔은 이전 데이터를 이 시간까지 유지
+PREVIOUS_MAX_AGE_HOURS = 48
+
+# LOCAL_SPOTS가 이 개수 이하면 배치 거리 행렬에 같이 넣고, 넘으면 POI 인덱스로 질의
+POI_MATRIX_MAX_SPOTS = 64
+
+# 로컬 가이드에 보여주는 스팟 카테고리
+LOCAL_GUIDE_CATEGORIES = ("bts", "restaurant", "cafe", "hotspot")
+
+# 증분 enrichment - 스크래핑 레코드 해시 규칙
+VOLATILE_SOURCE_FIELDS = ("scraped_at",)                       # 해시에서 제외 (매번 바뀜)
+PRICE_SOURCE_FIELDS = ("price_krw", "price_usd", "rooms_left")  # 바뀌면 가격 필드만 다시 계산
+ENRICH_VERSION = 1                                              # enrichment 계산이 바뀌면 올림 (전체 재계산)
+CHANGES_FILE = "korean_ota_changes.json"
+SOURCE_HASHES_FILE = "korean_ota_source_hashes.json"            # 호텔별 해시 (공개 JSON에는 넣지 않음)
 
 
 class ARMYStayHubEngine:
@@ -153,6 +176,16 @@ class ARMYStayHubEngine:
             {"name_en": "Paju", "name_kr": "파주", "lat": 37.7600, "lng": 126.7800, "radius_km": 5},
         ]
 
+        # POI 인덱스 (카테고리별, 엔진당 한 번 생성)
+        self.poi_index = PoiIndex(self.LOCAL_SPOTS)
+
+        # 좌표 → 지리 피처 캐시 (처음 쓸 때 파일에서 로드)
+        self.geo_cache: Optional[GeoFeatureCache] = None
+        # 증분 enrichment용 테이블 버전 (처음 쓸 때 계산)
+        self._enrich_version: Optional[str] = None
+        # 이번 실행에서 enrich / 재사용한 호텔의 스크래핑 레코드 해시 (_hotel_key → {"content", "price"})
+        self.source_hashes: Dict[Tuple[str, str], Dict] = {}
+
     def _calc_distance(self, lat1, lng1, lat2, lng2) -> float:
         """Haversine 거리 (km)"""
         R = 6371
@@ -161,6 +194,60 @@ class ARMYStayHubEngine:
         a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng/2)**2
         return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
 
+    def _spots_in_matrix(self) -> bool:
+        return len(self.LOCAL_SPOTS) <= POI_MATRIX_MAX_SPOTS
+
+    def _geo_targets(self) -> List[Dict]:
+        """거리 행렬 열 순서: 공연장, (LOCAL_SPOTS), AREAS"""
+        spots = self.LOCAL_SPOTS if self._spots_in_matrix() else []
+        return [self.VENUE] + spots + self.AREAS
+
+    def _split_geo_row(self, row: List[float]):
+        """거리 행렬 한 행 → (공연장 거리, 스팟별 거리 또는 None, 지역별 거리)"""
+        if not self._spots_in_matrix():
+            return row[0], None, row[1:]
+        n_spots = len(self.LOCAL_SPOTS)
+        return row[0], row[1:1 + n_spots], row[1 + n_spots:]
+
+    def _nearest_spots(self, lat: float, lng: float, category: str, k: int,
+                       spot_dists: List[float] = None) -> List:
+        """카테고리에서 가까운 k개 [(LOCAL_SPOTS 위치, 거리)] - 반올림 거리 순, 동점은 목록 순서"""
+        if spot_dists is None:
+            return self.poi_index.nearest(lat, lng, category, k)
+        pairs = [(i, spot_dists[i]) for i in self.poi_index.positions.get(category, [])]
+        return sorted(pairs, key=lambda p: round(p[1], 1))[:k]
+
+    def _spots_within(self, lat: float, lng: float, radius_km: float, k: int,
+                      spot_dists: List[float] = None) -> List:
+        """반경 안의 스팟 k개 [(LOCAL_SPOTS 위치, 거리)] - 반올림 거리 순, 동점은 목록 순서"""
+        if spot_dists is None:
+            return self.poi_index.within(lat, lng, radius_km, k)
+        pairs = [(i, d) for i, d in enumerate(spot_dists) if d <= radius_km]
+        return sorted(pairs, key=lambda p: round(p[1], 1))[:k]
+
+    def _get_geo_cache(self) -> GeoFeatureCache:
+        if self.geo_cache is None:
+            version = tables_version(self.VENUE, self.LOCAL_SPOTS, self.AREAS)
+            self.geo_cache = GeoFeatureCache(GEO_CACHE_FILE, version)
+        return self.geo_cache
+
+    def _geo_features(self, lat: float, lng: float, row: List[float]) -> Dict:
+        """
+        좌표에서만 나오는 지리 피처 (거리 행렬 한 행에서 계산, geo_cache에 그대로 저장)
+
+        스팟은 LOCAL_SPOTS 위치 + 원래 거리로 저장하고 표시용 dict는 enrichment 때 만든다.
+        """
+        distance_km, spot_dists, area_dists = self._split_geo_row(row)
+        nearest_bts = self._nearest_spots(lat, lng, "bts", 1, spot_dists)
+        return {
+            "venue_km": distance_km,
+            "area": self._nearest_area(lat, lng, area_dists),
+            "bts_km": nearest_bts[0][1] if nearest_bts else None,
+            "guide": {category: self._nearest_spots(lat, lng, category, 3, spot_dists)
+                      for category in LOCAL_GUIDE_CATEGORIES},
+            "map": self._spots_within(lat, lng, 5, 5, spot_dists),
+        }
+
     def _get_distance_display(self, distance_km: float) -> Dict:
         """거리 표시 (도보 30분 이내 / 차로)"""
         walk_min = int(distance_km / 5 * 60)
@@ -208,29 +295,44 @@ class ARMYStayHubEngine:
             "taxi_krw": int(distance_km * 1200 + 4800) if transport == "taxi" else 0
         }
 
-    def _get_local_guide(self, lat: float, lng: float) -> Dict:
-        """Army Local Guide (좌표 기반)"""
-        result = {"bts": [], "restaurant": [], "cafe": [], "hotspot": []}
-
-        for spot in self.LOCAL_SPOTS:
-            dist = self._calc_distance(lat, lng, spot["lat"], spot["lng"])
-            item = {
-                "name_en": spot["name_en"],
-                "spot_tag": spot["spot_tag"],
-                "description_en": spot["description_en"],
-                "distance_km": round(dist, 1),
-                "lat": spot["lat"],
-                "lng": spot["lng"]
-            }
-            result[spot["category"]].append(item)
+    def _get_local_guide(self, lat: float, lng: float, spot_dists: List[float] = None) -> Dict:
+        """
+        Army Local Guide (좌표 기반, 카테고리별 가까운 순 최대 3개)
 
-        # 가까운 순 정렬, 최대 3개
-        for key in result:
-            result[key] = sorted(result[key], key=lambda x: x["distance_km"])[:3]
+        spot_dists: 배치 거리 행렬의 스팟별 거리 (없으면 POI 인덱스로 질의)
+        """
+        return self._build_local_guide({
+            category: self._nearest_spots(lat, lng, category, 3, spot_dists)
+            for category in LOCAL_GUIDE_CATEGORIES
+        })
 
+    def _build_local_guide(self, nearest: Dict[str, List]) -> Dict:
+        """카테고리별 [(스팟 위치, 거리)] → 로컬 가이드 표시 데이터"""
+        result = {}
+        for category, pairs in nearest.items():
+            result[category] = []
+            for position, dist in pairs:
+                spot = self.LOCAL_SPOTS[position]
+                result[category].append({
+                    "name_en": spot["name_en"],
+                    "spot_tag": spot["spot_tag"],
+                    "description_en": spot["description_en"],
+                    "distance_km": round(dist, 1),
+                    "lat": spot["lat"],
+                    "lng": spot["lng"]
+                })
         return result
 
-    def _get_army_density(self, lat: float, lng: float, hotel_type: str, distance_km: float) -> Dict:
+    def _get_army_density(self, lat: float, lng: float, hotel_type: str, distance_km: float,
+                          spot_dists: List[float] = None, area_dists: List[float] = None) -> Dict:
+        """아미 밀집도 (좌표에서 BTS 스팟 거리 / 지역을 구해서 계산)"""
+        nearest_bts = self._nearest_spots(lat, lng, "bts", 1, spot_dists)
+        area_en = self._area_location(self._nearest_area(lat, lng, area_dists))["area_en"]
+        return self._score_army_density(hotel_type, distance_km,
+                                        nearest_bts[0][1] if nearest_bts else None, area_en)
+
+    def _score_army_density(self, hotel_type: str, distance_km: float,
+                            min_bts_dist: Optional[float], area_en: str) -> Dict:
         """
         아미 밀집도 계산
 
@@ -265,8 +367,8 @@ class ARMYStayHubEngine:
         base += type_bonus.get(hotel_type, 5)
 
         # 3. BTS 스팟 근접도 (0~15점)
-        bts_spots = [s for s in self.LOCAL_SPOTS if s["category"] == "bts"]
-        min_bts_dist = min(self._calc_distance(lat, lng, s["lat"], s["lng"]) for s in bts_spots)
+        if min_bts_dist is None:
+            min_bts_dist = float('inf')
         if min_bts_dist <= 2:
             base += 15
         elif min_bts_dist <= 5:
@@ -275,13 +377,12 @@ class ARMYStayHubEngine:
             base += 5
 
         # 4. 지역 특성 (0~10점)
-        location = self._get_location(lat, lng)
         area_bonus = {
             "Ilsan": 10,    # 공연장 근처
             "Hongdae": 8,   # 외국인 팬 인기
             "Sangam": 5,    # 방송국
         }
-        base += area_bonus.get(location["area_en"], 0)
+        base += area_bonus.get(area_en, 0)
 
         # 최종값 (35~95 범위)
         density = min(95, max(35, base))
@@ -308,23 +409,27 @@ class ARMYStayHubEngine:
             "label_kr": f"아미 {density}%"
         }
 
-    def _get_nearby_spots_for_map(self, lat: float, lng: float) -> List[Dict]:
-        """상세 지도용 근처 스팟 (5km 이내)"""
-        nearby = []
-        for spot in self.LOCAL_SPOTS:
-            dist = self._calc_distance(lat, lng, spot["lat"], spot["lng"])
-            if dist <= 5:  # 5km 이내만
-                nearby.append({
-                    "name_en": spot["name_en"],
-                    "category": spot["category"],
-                    "spot_tag": spot["spot_tag"],
-                    "lat": spot["lat"],
-                    "lng": spot["lng"],
-                    "distance_km": round(dist, 1)
-                })
-        return sorted(nearby, key=lambda x: x["distance_km"])[:5]  # 최대 5개
+    def _get_nearby_spots_for_map(self, lat: float, lng: float, spot_dists: List[float] = None) -> List[Dict]:
+        """상세 지도용 근처 스팟 (5km 이내, 최대 5개)"""
+        return self._build_map_spots(self._spots_within(lat, lng, 5, 5, spot_dists))
+
+    def _build_map_spots(self, nearby: List) -> List[Dict]:
+        """[(스팟 위치, 거리)] → 지도용 스팟 표시 데이터"""
+        spots = []
+        for position, dist in nearby:
+            spot = self.LOCAL_SPOTS[position]
+            spots.append({
+                "name_en": spot["name_en"],
+                "category": spot["category"],
+                "spot_tag": spot["spot_tag"],
+                "lat": spot["lat"],
+                "lng": spot["lng"],
+                "distance_km": round(dist, 1)
+            })
+        return spots
 
-    def _get_location(self, lat: float, lng: float, scraped: Dict = None) -> Dict:
+    def _get_location(self, lat: float, lng: float, scraped: Dict = None,
+                      area_dists: List[float] = None) -> Dict:
         """좌표 기반 위치 정보 (스크래핑 데이터 우선)"""
         # 스크래핑된 도시 정보가 있으면 사용
         if scraped and scraped.get("city_en"):
@@ -349,16 +454,24 @@ class ARMYStayHubEngine:
                 "address_kr": f"{region[1]} {city_kr}"
             }
 
-        # 좌표 기반 가장 가까운 지역 찾기
+        return self._area_location(self._nearest_area(lat, lng, area_dists))
+
+    def _nearest_area(self, lat: float, lng: float, area_dists: List[float] = None) -> Optional[int]:
+        """좌표 기반 가장 가까운 지역 (반경 안, AREAS 위치 / 없으면 None)"""
         nearest_area = None
         min_dist = float('inf')
 
-        for area in self.AREAS:
-            dist = self._calc_distance(lat, lng, area["lat"], area["lng"])
+        if area_dists is None:
+            area_dists = [self._calc_distance(lat, lng, a["lat"], a["lng"]) for a in self.AREAS]
+        for i, (area, dist) in enumerate(zip(self.AREAS, area_dists)):
             if dist < min_dist and dist <= area["radius_km"]:
                 min_dist = dist
-                nearest_area = area
+                nearest_area = i
+        return nearest_area
 
+    def _area_location(self, area_index: Optional[int]) -> Dict:
+        """AREAS 위치 → 위치 정보 (None이면 서울 기본값)"""
+        nearest_area = self.AREAS[area_index] if area_index is not None else None
         if nearest_area:
             # 지역명 매핑
             region_map = {
@@ -527,19 +640,62 @@ class ARMYStayHubEngine:
             "display_kr": " ".join(tags_kr[:3])
         }
 
-    def enrich_hotel(self, scraped: Dict) -> Dict:
-        """스크래핑 데이터 + 계산 데이터 결합"""
+    def _price_fields(self, scraped: Dict) -> Dict:
+        """가격·재고에서만 나오는 필드 (증분 enrichment에서 가격만 바뀐 호텔은 이것만 갱신)"""
+        return {
+            "price_krw": scraped.get("price_krw", 0),
+            "rooms_left": scraped.get("rooms_left", -1),
+            "is_available": scraped.get("rooms_left", 1) != 0,
+        }
+
+    def _source_hashes(self, scraped: Dict) -> Dict:
+        """
+        정규화한 스크래핑 레코드 해시
 
-        # 좌표 (없으면 기본값 - 공연장 근처)
+        - content: 가격·재고 / 수집 시각을 뺀 나머지 + enrichment 테이블 버전
+        - price: 가격·재고 필드
+        """
+        if self._enrich_version is None:
+            self._enrich_version = tables_version(ENRICH_VERSION, self.VENUE, self.LOCAL_SPOTS, self.AREAS,
+                                                  self.BOOKING_GUIDES, self.SUBWAY_ROUTES)
+        skip = VOLATILE_SOURCE_FIELDS + PRICE_SOURCE_FIELDS
+        content = {k: v for k, v in scraped.items() if k not in skip}
+        price = {k: scraped.get(k) for k in PRICE_SOURCE_FIELDS}
+        return {
+            "content": _digest([self._enrich_version, content]),
+            "price": _digest(price),
+        }
+
+    def _hotel_coords(self, scraped: Dict):
+        """좌표 (없으면 기본값 - 공연장 근처) + 임의 좌표 여부 (임의 좌표는 캐시하지 않음)"""
         lat = scraped.get("latitude") or self.VENUE["lat"] + random.uniform(-0.01, 0.01)
         lng = scraped.get("longitude") or self.VENUE["lng"] + random.uniform(-0.01, 0.01)
+        synthetic = not (scraped.get("latitude") and scraped.get("longitude"))
+        return lat, lng, synthetic
 
-        # 거리 계산
-        distance_km = self._calc_distance(lat, lng, self.VENUE["lat"], self.VENUE["lng"])
+    def enrich_hotel(self, scraped: Dict) -> Dict:
+        """스크래핑 데이터 + 계산 데이터 결합"""
+        lat, lng, synthetic = self._hotel_coords(scraped)
+        cache = None if synthetic else self._get_geo_cache()
+        geo = cache.get(lat, lng) if cache else None
+        if geo is None:
+            row = [self._calc_distance(lat, lng, t["lat"], t["lng"]) for t in self._geo_targets()]
+            geo = self._geo_features(lat, lng, row)
+            if cache:
+                cache.put(lat, lng, geo)
+        return self._enrich_with_features(scraped, lat, lng, geo)
+
+    def _enrich_with_features(self, scraped: Dict, lat: float, lng: float, geo: Dict) -> Dict:
+        """enrich_hotel 본체 - 거리 기반 필드는 모두 지리 피처(geo)에서 만듦 (거리 계산 없음)"""
+        distance_km = geo["venue_km"]
+        area_location = self._area_location(geo["area"])
 
         # 플랫폼
         platform = scraped.get("platform", "Agoda")
 
+        # 가격 / 재고
+        price = self._price_fields(scraped)
+
         # 호텔 타입
         hotel_type = self._get_hotel_type_display(
             scraped.get("hotel_type", ""),
@@ -547,10 +703,11 @@ class ARMYStayHubEngine:
         )
 
         # 위치 정보 (스크래핑된 도시 정보 우선 사용)
-        location = self._get_location(lat, lng, scraped)
+        location = self._get_location(lat, lng, scraped) if scraped.get("city_en") else area_location
 
-        # 아미 밀집도
-        army_density = self._get_army_density(lat, lng, hotel_type["label_en"], distance_km)
+        # 아미 밀집도 (지역 보너스는 좌표 기반 지역)
+        army_density = self._score_army_density(hotel_type["label_en"], distance_km,
+                                                geo["bts_km"], area_location["area_en"])
 
         # 취소 정책 (스크래핑 데이터 또는 플랫폼 기본값)
         cancellation = self._get_cancellation_policy(scraped, platform)
@@ -562,11 +719,11 @@ class ARMYStayHubEngine:
             # === 스크래핑 데이터 ===
             "id": f"hotel_{abs(hash(scraped.get('name', ''))) % 100000:05d}",
             "name_en": scraped.get("name_en") or scraped.get("name", ""),
-            "price_krw": scraped.get("price_krw", 0),
+            "price_krw": price["price_krw"],
             "rating": scraped.get("rating", 0),
             "image_url": scraped.get("image_url", ""),
-            "rooms_left": scraped.get("rooms_left", -1),
-            "is_available": scraped.get("rooms_left", 1) != 0,
+            "rooms_left": price["rooms_left"],
+            "is_available": price["is_available"],
             "hotel_type": hotel_type,
             "cancellation": cancellation,
             "tags": tags,
@@ -580,13 +737,13 @@ class ARMYStayHubEngine:
             "distance": self._get_distance_display(distance_km),
             "transport": self._get_transport(),
             "safe_return": self._get_safe_return(scraped.get("name", ""), distance_km),
-            "army_local_guide": self._get_local_guide(lat, lng),
+            "army_local_guide": self._build_local_guide(geo["guide"]),
 
             # === 상세 페이지용 지도 데이터 ===
             "map_detail": {
                 "hotel": {"name_en": scraped.get("name_en") or scraped.get("name", ""), "lat": lat, "lng": lng},
                 "venue": {"name_en": self.VENUE["name_en"], "lat": self.VENUE["lat"], "lng": self.VENUE["lng"]},
-                "nearby_spots": self._get_nearby_spots_for_map(lat, lng)
+                "nearby_spots": self._build_map_spots(geo["map"])
             },
 
             # === 정적 데이터 ===
@@ -600,21 +757,213 @@ class ARMYStayHubEngine:
             "last_update": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         }
 
+    def enrich_hotels(self, raw_hotels: List[Dict], deadline: Deadline = None,
+                      chunk_size: int = ENRICH_CHUNK_SIZE) -> List[Dict]:
+        """
+        배치 enrichment - 수집 순서(우선순위)대로, 마감이 지나면 나머지는 건너뜀
+
+        청크마다 좌표 캐시(geo_cache)에 없는 호텔만 모아 호텔 × (공연장 + 스팟 + 지역)
+        거리 행렬을 한 번에 계산하고(geo_distance), 호텔별 필드는 지리 피처에서 만든다.
+        결과는 enrich_hotel과 같다.
+        """
+        targets = self._geo_targets()
+        target_lats = [t["lat"] for t in targets]
+        target_lngs = [t["lng"] for t in targets]
+        cache = self._get_geo_cache()
+        cache.reserve(len(raw_hotels))     # 배치가 max_entries보다 크면 서로 밀어내며 매번 다시 계산함
+
+        hotels = []
+        # 호텔 dict 수십만 개를 만드는 동안 순환 GC가 살아있는 결과를 반복해서 훑지 않도록 잠시 끔
+        # (결과에는 순환 참조가 없음)
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for start in range(0, len(raw_hotels), chunk_size):
+                if deadline is not None and deadline.expired():
+                    print(f"⏰ 마감 시간 초과, {len(raw_hotels) - len(hotels)}개 호텔 enrichment 건너뜀")
+                    break
+                chunk = raw_hotels[start:start + chunk_size]
+                coords = [self._hotel_coords(scraped) for scraped in chunk]
+                geos = [None if synthetic else cache.get(lat, lng) for lat, lng, synthetic in coords]
+
+                missing = [i for i, geo in enumerate(geos) if geo is None]
+                if missing:
+                    matrix = distance_matrix([coords[i][0] for i in missing], [coords[i][1] for i in missing],
+                                             target_lats, target_lngs)
+                    for i, row in zip(missing, matrix):
+                        lat, lng, synthetic = coords[i]
+                        geos[i] = self._geo_features(lat, lng, row)
+                        if not synthetic:
+                            cache.put(lat, lng, geos[i])
+
+                for scraped, (lat, lng, _), geo in zip(chunk, coords, geos):
+                    hotels.append(self._enrich_with_features(scraped, lat, lng, geo))
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        cache.save()
+        cache.report()
+        return hotels
+
+    def load_previous(self, filename: str = "korean_ota_hotels.json") -> List[Dict]:
+        """이전 실행에서 저장한 호텔 목록 (없거나 깨졌으면 빈 리스트)"""
+        if not os.path.exists(filename):
+            return []
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                return json.load(f).get("hotels", [])
+        except (OSError, json.JSONDecodeError):
+            return []
+
+    def load_source_hashes(self, filename: str = SOURCE_HASHES_FILE) -> Dict[Tuple[str, str], Dict]:
+        """이전 실행의 호텔별 해시 (없거나 깨졌으면 빈 dict → 전체 재계산)"""
+        if not os.path.exists(filename):
+            return {}
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                entries = json.load(f).get("hotels", [])
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return {(e["name_en"], e["platform"]): {"content": e["content"], "price": e["price"]} for e in entries}
+
+    def save_source_hashes(self, hotels: List[Dict], previous_hashes: Dict[Tuple[str, str], Dict],
+                           filename: str = SOURCE_HASHES_FILE):
+        """게시한 호텔의 해시 저장 (이번에 갱신 못 한 호텔은 이전 해시 유지, 임시 파일 → 교체)"""
+        entries = []
+        for hotel in hotels:
+            key = self._hotel_key(hotel)
+            hashes = self.source_hashes.get(key) or previous_hashes.get(key)
+            if hashes:
+                entries.append({**_change_entry(key), **hashes})
+        tmp_path = f"{filename}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"updated_at": datetime.now().isoformat(), "hotels": entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, filename)
+
+    def merge_with_previous(self, hotels: List[Dict], previous: List[Dict],
+                            max_age_hours: float = PREVIOUS_MAX_AGE_HOURS) -> List[Dict]:
+        """
+        이번 실행 결과 + 이전 데이터 병합
+
+        같은 호텔(이름 + 플랫폼)은 이번 결과로 교체하고, 이번에 갱신하지 못한 호텔은
+        max_age_hours 이내에 갱신된 것만 유지한다. 이번 결과가 하나도 없을 때는
+        부르지 않는다 (run이 이전 파일을 그대로 둠).
+        """
+        fresh_keys = {self._hotel_key(h) for h in hotels}
+        cutoff = (datetime.now() - timedelta(hours=max_age_hours)).strftime('%Y-%m-%d %H:%M:%S')
+        stale = [h for h in previous if self._hotel_key(h) not in fresh_keys]
+        kept = [h for h in stale if h.get("last_update", "") >= cutoff]
+        if kept:
+            print(f"🔁 이전 데이터 {len(kept)}개 유지 (이번 실행에서 갱신 안 됨)")
+        if len(stale) > len(kept):
+            print(f"🗑️ {max_age_hours:g}시간 넘게 갱신 안 된 이전 데이터 {len(stale) - len(kept)}개 제외")
+        return hotels + kept
+
+    @staticmethod
+    def _hotel_key(hotel: Dict) -> Tuple[str, str]:
+        """enrich된 호텔 키 (이름 + 플랫폼)"""
+        return hotel.get("name_en", ""), hotel.get("platform", {}).get("name", "")
+
+    @staticmethod
+    def _scraped_key(scraped: Dict) -> Tuple[str, str]:
+        """스크래핑 레코드 키 (enrich 후 _hotel_key와 같은 값)"""
+        return scraped.get("name_en") or scraped.get("name", ""), scraped.get("platform", "Agoda")
+
+    def enrich_incremental(self, raw_hotels: List[Dict], previous: List[Dict],
+                           deadline: Deadline = None,
+                           previous_hashes: Dict[Tuple[str, str], Dict] = None) -> Tuple[List[Dict], Dict]:
+        """
+        증분 enrichment - 이전 결과(previous)에서 바뀐 호텔만 다시 계산
+
+        스크래핑 레코드 해시를 이전 실행 해시(previous_hashes, load_source_hashes)와 비교해서:
+        - 내용·가격 모두 같음 → 이전 레코드 재사용 (last_update만 갱신)
+        - 가격·재고만 바뀜   → 이전 레코드 + 가격 필드만 갱신
+        - 내용이 바뀜 / 새 호텔 → enrich_hotels로 전체 계산 (마감이 지나면 건너뜀)
+
+        Returns:
+            (호텔 목록 - 수집 순서, 변경 내역 {"added", "changed", "price_changed", "unchanged", "removed"})
+        """
+        previous_hashes = previous_hashes or {}
+        previous_by_key = {self._hotel_key(h): h for h in previous if self._hotel_key(h) in previous_hashes}
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        changes = {"added": [], "changed": [], "price_changed": [], "unchanged": 0, "removed": []}
+
+        slots = []          # 재사용 레코드, 또는 None (다시 계산할 자리)
+        to_enrich = []
+        pending_hashes = {}  # 다시 계산할 호텔의 해시 (실제로 계산된 호텔만 source_hashes에 반영)
+        for scraped in raw_hotels:
+            key = self._scraped_key(scraped)
+            prev = previous_by_key.get(key)
+            hashes = self._source_hashes(scraped)
+            if prev is None or previous_hashes[key]["content"] != hashes["content"]:
+                slots.append(None)
+                to_enrich.append(scraped)
+                pending_hashes[key] = hashes
+                continue
+
+            record = dict(prev)
+            record["last_update"] = now
+            self.source_hashes[key] = hashes
+            if previous_hashes[key]["price"] == hashes["price"]:
+                changes["unchanged"] += 1
+            else:
+                record.update(self._price_fields(scraped))
+                changes["price_changed"].append(_change_entry(key))
+            slots.append(record)
+
+        enriched = self.enrich_hotels(to_enrich, deadline) if to_enrich else []
+        previous_keys = {self._hotel_key(h) for h in previous}
+        for record in enriched:
+            key = self._hotel_key(record)
+            self.source_hashes[key] = pending_hashes[key]
+            changes["changed" if key in previous_keys else "added"].append(_change_entry(key))
+
+        # 수집 순서대로 (마감으로 계산 못 한 호텔은 빠짐 → merge_with_previous가 이전 데이터 유지)
+        fresh = iter(enriched)
+        hotels = []
+        for record in slots:
+            record = record if record is not None else next(fresh, None)
+            if record is not None:
+                hotels.append(record)
+
+        print(f"♻️ 증분 enrichment: 재사용 {changes['unchanged']}개, 가격만 갱신 {len(changes['price_changed'])}개, "
+              f"다시 계산 {len(enriched)}/{len(to_enrich)}개")
+        return hotels, changes
+
+    def record_removed(self, changes: Dict, previous: List[Dict], hotels: List[Dict]) -> Dict:
+        """병합 후 최종 목록에서 빠진 이전 호텔을 변경 내역에 기록"""
+        current = {self._hotel_key(h) for h in hotels}
+        changes["removed"] = [_change_entry(key) for key in dict.fromkeys(self._hotel_key(h) for h in previous)
+                              if key not in current]
+        return changes
+
+    @staticmethod
+    def has_changes(changes: Dict) -> bool:
+        return any(changes[kind] for kind in ("added", "changed", "price_changed", "removed"))
+
+    def save_changes(self, changes: Dict, filename: str = CHANGES_FILE):
+        """변경 내역 저장 (다음 단계에서 바뀐 호텔만 처리할 때 사용)"""
+        output = {"timestamp": datetime.now().isoformat(), **changes}
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(output, f, ensure_ascii=False, indent=2)
+        print(f"🧾 변경: 추가 {len(changes['added'])}, 변경 {len(changes['changed'])}, "
+              f"가격 {len(changes['price_changed'])}, 삭제 {len(changes['removed'])}")
+
     def add_nearby(self, hotels: List[Dict]) -> List[Dict]:
-        """추천 숙소 추가"""
+        """추천 숙소 추가 (공간 인덱스로 가까운 3개, 같은 id 제외, 동점은 목록 순서)"""
+        index = GeoIndex([(h["lat"], h["lng"]) for h in hotels])
         for hotel in hotels:
-            nearby = []
-            for other in hotels:
-                if other["id"] != hotel["id"]:
-                    dist = self._calc_distance(hotel["lat"], hotel["lng"], other["lat"], other["lng"])
-                    nearby.append({
-                        "id": other["id"],
-                        "name_en": other["name_en"],
-                        "price_krw": other["price_krw"],
-                        "distance_km": round(dist, 1),
-                        "image_url": other["image_url"]
-                    })
-            hotel["nearby"] = sorted(nearby, key=lambda x: x["distance_km"])[:3]
+            hotel_id = hotel["id"]
+            hits = index.nearest(hotel["lat"], hotel["lng"], 3,
+                                 skip=lambda i: hotels[i]["id"] == hotel_id)
+            hotel["nearby"] = [{
+                "id": hotels[i]["id"],
+                "name_en": hotels[i]["name_en"],
+                "price_krw": hotels[i]["price_krw"],
+                "distance_km": round(dist, 1),
+                "image_url": hotels[i]["image_url"]
+            } for i, dist in hits]
         return hotels
 
     def generate_home(self, hotels: List[Dict]) -> Dict:
@@ -651,6 +1000,16 @@ class ARMYStayHubEngine:
         print(f"✅ {len(hotels)}개 저장: {filename}")
 
 
+def _digest(value) -> str:
+    """JSON 정규화(키 정렬) 후 해시"""
+    payload = json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.md5(payload.encode()).hexdigest()[:16]
+
+
+def _change_entry(key: Tuple[str, str]) -> Dict:
+    return {"name_en": key[0], "platform": key[1]}
+
+
 def generate_sample_data() -> List[Dict]:
     """실제 호텔 데이터 기반 샘플 (40개+ 호텔)"""
     samples = [
@@ -861,60 +1220,101 @@ def generate_sample_data() -> List[Dict]:
     return samples
 
 
-def run():
-    """메인 실행"""
+def run(deadline: Deadline = None, incremental: bool = True):
+    """
+    메인 실행
+
+    Args:
+        deadline: 실행 마감 (기본: 지금부터 RUN_TIME_BUDGET_SEC).
+                  수집은 PUBLISH_RESERVE_SEC 먼저 끝내고, 마감까지 끝난 결과만
+                  이전 데이터와 병합해서 저장한다.
+        incremental: 이전 결과에서 바뀐 호텔만 다시 계산 (False면 전체 재계산)
+    """
+    deadline = deadline or Deadline.after(RUN_TIME_BUDGET_SEC)
     try:
         print("🚀 ARMY Stay Hub v5.0 - 스크래핑 기반 구조")
+        print(f"⏱️ 실행 마감까지 {deadline.remaining():.0f}초")
         print("=" * 50)
 
         engine = ARMYStayHubEngine()
 
         # 스크래핑 또는 샘플 데이터
         raw_hotels = []
+        previous = []
+        scraper = None
         if SCRAPING_ENABLED:
             print("🌐 스크래핑 모드...")
             try:
+                from korean_ota_scraper import KoreanOTAScraper
                 scraper = KoreanOTAScraper()
-                raw_hotels = scraper.scrape_distributed()
+                raw_hotels = scraper.scrape_distributed(deadline=deadline.earlier(PUBLISH_RESERVE_SEC))
             except Exception as e:
                 print(f"⚠️ 스크래핑 에러: {e}")
                 raw_hotels = []
 
-            if not raw_hotels:
+            previous = engine.load_previous()
+            if not raw_hotels and not previous:
                 print("⚠️ 스크래핑 실패, 샘플 데이터 사용")
                 raw_hotels = generate_sample_data()
+            elif not raw_hotels:
+                print("⚠️ 스크래핑 결과 없음, 이전 데이터 유지")
         else:
             print("📁 샘플 데이터 모드...")
             raw_hotels = generate_sample_data()
 
-        # 데이터 enrichment
-        hotels = [engine.enrich_hotel(h) for h in raw_hotels]
-        hotels = engine.add_nearby(hotels)
+        # 데이터 enrichment (증분, 수집 우선순위 순, 마감까지)
+        previous_hashes = engine.load_source_hashes() if incremental else {}
+        hotels, changes = engine.enrich_incremental(raw_hotels, previous, deadline, previous_hashes)
+
+        # 새로 받은 호텔이 없으면 이전 파일 그대로 (오래된 데이터를 잘라내면 빈 목록이 게시됨)
+        # 작업 큐 배치도 닫지 않음 → 다음 실행이 이어서 수집
+        if not hotels and previous:
+            print(f"📁 새로 수집된 호텔 없음 → 이전 데이터 {len(previous)}개 그대로 유지 (저장 / 알림 건너뜀)")
+            return 0
+
+        if previous:
+            hotels = engine.merge_with_previous(hotels, previous)
+        engine.record_removed(changes, previous, hotels)
+        has_changes = engine.has_changes(changes) or not previous
+
+        # 바뀐 호텔이 없으면 이전 nearby 그대로 (가격 / 좌표 / 목록이 모두 같음)
+        if has_changes:
+            hotels = engine.add_nearby(hotels)
         hotels.sort(key=lambda x: x["distance"]["distance_km"])
 
-        # 저장
+        # 저장 후 작업 큐 배치 닫기 (저장 전에 죽으면 다음 실행이 이어서 수집)
         engine.save_json(hotels)
+        engine.save_source_hashes(hotels, previous_hashes)
+        engine.save_changes(changes)
+        if scraper is not None:
+            scraper.mark_published()
 
         print(f"📊 예약가능: {sum(1 for h in hotels if h['is_available'])}/{len(hotels)}")
 
-        # 재입고 알림 발송
-        try:
-            from availability_tracker import check_and_notify
-            print("\n📢 재입고 알림 확인 중...")
-            check_and_notify(hotels)
-        except ImportError:
-            print("⚠️ 알림 모듈 없음 (availability_tracker.py)")
-        except Exception as e:
-            print(f"⚠️ 알림 발송 실패: {e}")
+        # 재입고 알림 발송 (가격·재고가 바뀐 호텔이 없으면 건너뜀)
+        if not has_changes:
+            print("📭 변경된 호텔 없음, 알림 확인 건너뜀")
+        else:
+            try:
+                from availability_tracker import check_and_notify
+                print("\n📢 재입고 알림 확인 중...")
+                check_and_notify(hotels)
+            except ImportError:
+                print("⚠️ 알림 모듈 없음 (availability_tracker.py)")
+            except Exception as e:
+                print(f"⚠️ 알림 발송 실패: {e}")
 
         print("✨ 완료!")
         return 0  # 성공
 
     except Exception as e:
         print(f"❌ 치명적 에러: {e}")
-        # 에러가 나도 샘플 데이터로 최소한의 JSON 생성
+        # 에러가 나도 최소한의 JSON 생성 (이전 실제 데이터가 있으면 그대로 둠)
         try:
             engine = ARMYStayHubEngine()
+            if engine.load_previous():
+                print("📁 비상 모드: 이전 데이터 유지")
+                return 0
             raw_hotels = generate_sample_data()
             hotels = [engine.enrich_hotel(h) for h in raw_hotels]
             engine.save_json(hotels)
@@ -925,5 +1325,13 @@ def run():
 
 
 if __name__ == "__main__":
+    import argparse
     import sys
-    sys.exit(run())
+
+    parser = argparse.ArgumentParser(description="ARMY Stay Hub 데이터 엔진")
+    parser.add_argument("--time-budget", type=float, default=RUN_TIME_BUDGET_SEC,
+                        help="실행 시간 예산 (초, 다음 크론 실행과 겹치지 않게)")
+    parser.add_argument("--full", action="store_true",
+                        help="증분 enrichment 끄기 (모든 호텔 다시 계산)")
+    args = parser.parse_args()
+    sys.exit(run(Deadline.after(args.time_budget), incremental=not args.full))
@@ -0,0 +1,209 @@
+"""
+ARMY Stay Hub - 재개 가능한 수집 작업 큐 (SQLite)
+
+run_scraper.run이 수집 도중 죽거나 종료되면 그때까지 받은 결과가 모두 사라진다.
+수집 작업(도시 × 플랫폼 × 날짜 × 인원)을 로컬 SQLite 큐에 배치 단위로 저장하고,
+작업이 끝날 때마다 결과를 바로 기록한다. 다시 실행하면 게시(저장)되지 않은
+마지막 배치를 이어서, 이미 끝난 셀은 다시 요청하지 않는다.
+
+작업 상태:
+- pending : 아직 실행 안 함 (마감으로 건너뛴 작업 포함)
+- running : 실행 중 (프로세스가 죽으면 이 상태로 남음 → 재개 시 다시 실행)
+- done    : 완료 (결과 JSON 저장, 빈 결과 포함)
+- failed  : max_attempts번 실행했는데 끝나지 않음
+
+배치 상태:
+- open      : 수집 중 / 게시 전
+- published : 결과를 korean_ota_hotels.json에 저장 완료
+- expired   : resume_max_age_hours 안에 재개되지 않아 버림
+
+페이지 넘김은 작업 안에서 처리한다 (셀 도중에 끊긴 작업은 처음 페이지부터 다시 받지만
+대부분 HTTP 캐시에서 바로 나온다).
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+# ===== 작업 큐 설정 =====
+SCRAPE_QUEUE_DB = "scrape_queue.db"
+QUEUE_CONFIG = {
+    "max_attempts": 3,             # running으로 남은 작업 재시도 횟수
+    "resume_max_age_hours": 6,     # 이보다 오래된 미게시 배치는 재개하지 않음
+    "keep_days": 7,                # 이보다 오래된 배치는 삭제
+}
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_queue: Optional["ScrapeQueue"] = None
+_queue_lock = threading.Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    status      TEXT NOT NULL DEFAULT 'open',
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch_id    INTEGER NOT NULL REFERENCES batches(id) ON DELETE CASCADE,
+    priority    INTEGER NOT NULL,
+    city_key    TEXT NOT NULL,
+    platform    TEXT NOT NULL,
+    checkin     TEXT NOT NULL,
+    checkout    TEXT NOT NULL,
+    adults      INTEGER NOT NULL,
+    status      TEXT NOT NULL DEFAULT 'pending',
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    result      TEXT,
+    error       TEXT,
+    updated_at  REAL NOT NULL,
+    UNIQUE (batch_id, city_key, platform, checkin, checkout, adults)
+);
+CREATE INDEX IF NOT EXISTS jobs_batch_status ON jobs (batch_id, status);
+"""
+
+
+class ScrapeQueue:
+    """배치 / 작업 상태와 결과를 SQLite에 저장하는 작업 큐"""
+
+    def __init__(self, db_path: str = SCRAPE_QUEUE_DB, config: Dict = None):
+        self.db_path = db_path
+        self.config = {**QUEUE_CONFIG, **(config or {})}
+        self._lock = threading.Lock()
+        # 엔진 레인(스레드)에서 완료 기록이 들어오므로 연결 하나를 lock으로 보호해서 공유
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute("PRAGMA foreign_keys = ON")
+            self._conn.executescript(_SCHEMA)
+
+    def _execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        with self._lock, self._conn:
+            return self._conn.execute(sql, params)
+
+    def _query(self, sql: str, params=()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # ----- 배치 -----
+
+    def create_batch(self, cells: List[Dict]) -> int:
+        """
+        새 배치 생성 (cells 순서 = 우선순위)
+
+        cell: {"city_key", "platform", "checkin", "checkout", "adults"} (날짜는 YYYY-MM-DD)
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            batch_id = self._conn.execute(
+                "INSERT INTO batches (created_at, updated_at) VALUES (?, ?)", (now, now)
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO jobs (batch_id, priority, city_key, platform, checkin, checkout,"
+                " adults, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(batch_id, priority, c["city_key"], c["platform"], c["checkin"], c["checkout"],
+                  c["adults"], now) for priority, c in enumerate(cells)],
+            )
+        return batch_id
+
+    def open_batch(self) -> Optional[int]:
+        """
+        재개할 미게시 배치 (없으면 None)
+
+        resume_max_age_hours보다 오래된 미게시 배치는 expired 처리, keep_days보다
+        오래된 배치는 삭제한다.
+        """
+        now = time.time()
+        self._execute(
+            "UPDATE batches SET status = 'expired', updated_at = ? WHERE status = 'open' AND created_at < ?",
+            (now, now - self.config["resume_max_age_hours"] * 3600),
+        )
+        self._execute("DELETE FROM batches WHERE created_at < ?", (now - self.config["keep_days"] * 86400,))
+
+        rows = self._query("SELECT id FROM batches WHERE status = 'open' ORDER BY id DESC LIMIT 1")
+        return rows[0]["id"] if rows else None
+
+    def mark_published(self, batch_id: int):
+        self._execute("UPDATE batches SET status = 'published', updated_at = ? WHERE id = ?",
+                      (time.time(), batch_id))
+
+    # ----- 작업 -----
+
+    def pending_jobs(self, batch_id: int) -> List[Dict]:
+        """
+        실행할 작업 (우선순위 순)
+
+        이전 실행에서 running으로 남은 작업은 시도 횟수가 남았으면 다시 실행,
+        다 썼으면 failed 처리.
+        """
+        max_attempts = self.config["max_attempts"]
+        self._execute(
+            "UPDATE jobs SET status = ?, error = 'max attempts', updated_at = ?"
+            " WHERE batch_id = ? AND status = ? AND attempts >= ?",
+            (FAILED, time.time(), batch_id, RUNNING, max_attempts),
+        )
+        rows = self._query(
+            "SELECT * FROM jobs WHERE batch_id = ? AND status IN (?, ?) ORDER BY priority",
+            (batch_id, PENDING, RUNNING),
+        )
+        return [dict(row) for row in rows]
+
+    def counts(self, batch_id: int) -> Dict[str, int]:
+        rows = self._query("SELECT status, COUNT(*) AS n FROM jobs WHERE batch_id = ? GROUP BY status",
+                           (batch_id,))
+        return {row["status"]: row["n"] for row in rows}
+
+    def mark_running(self, job_ids: List[int]):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                [(RUNNING, now, job_id) for job_id in job_ids],
+            )
+
+    def complete(self, job_id: int, hotels: List[Dict]):
+        """작업 완료 + 결과 저장 (작업이 끝나는 즉시 호출)"""
+        self._execute(
+            "UPDATE jobs SET status = ?, result = ?, error = NULL, updated_at = ? WHERE id = ?",
+            (DONE, json.dumps(hotels, ensure_ascii=False), time.time(), job_id),
+        )
+
+    def release(self, job_id: int):
+        """시작하지 못한 작업(마감 초과)을 pending으로 되돌림 (시도 횟수도 복구)"""
+        self._execute(
+            "UPDATE jobs SET status = ?, attempts = MAX(attempts - 1, 0), updated_at = ? WHERE id = ?",
+            (PENDING, time.time(), job_id),
+        )
+
+    def batch_results(self, batch_id: int) -> List[Dict]:
+        """배치의 완료된 작업 결과 (우선순위 순으로 이어붙임)"""
+        hotels = []
+        for row in self._query(
+            "SELECT result FROM jobs WHERE batch_id = ? AND status = ? ORDER BY priority",
+            (batch_id, DONE),
+        ):
+            hotels.extend(json.loads(row["result"] or "[]"))
+        return hotels
+
+
+def format_date(value: datetime) -> str:
+    return value.strftime("%Y-%m-%d")
+
+
+def get_scrape_queue() -> ScrapeQueue:
+    """프로세스 공유 작업 큐"""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = ScrapeQueue(SCRAPE_QUEUE_DB)
+    return _queue
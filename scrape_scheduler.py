@@ -0,0 +1,225 @@
+"""
+ARMY Stay Hub - 도시 × 플랫폼 셀 갱신 스케줄러
+
+scrape_distributed가 매번 도시/플랫폼을 랜덤으로 고르면 어떤 셀은 여러 실행 동안
+한 번도 갱신되지 않고, 어떤 셀은 연달아 요청된다. 셀마다 마지막 갱신 시각과
+관찰된 변동률(가격 / rooms_left 변화)을 기록해 두고, 실행당 요청 예산 안에서
+"지금 갱신하지 않으면 놓치는 변화량"이 가장 큰 셀부터 고른다.
+
+셀 점수 (기대 staleness 비용):
+    변동률(시간당 변한 호텔 비율) × 마지막 갱신 후 경과 시간 × 공연 임박 가중치
+
+- 한 번도 갱신 안 된 셀 / MAX_STALENESS_HOURS를 넘긴 셀은 점수와 무관하게 먼저 선택
+  → 모든 셀의 staleness 상한 보장
+- 변동률은 EWMA, 하한 MIN_CHANGE_RATE (변화 없는 셀도 시간이 지나면 차례가 온다)
+- 공연이 가까울수록 가중치 증가 (URGENCY_WINDOW_DAYS 안에서 선형, 최대 MAX_URGENCY배)
+- 서킷이 열린 셀은 건너뜀 (예산 낭비 방지)
+- 셀별 가중치(yield_bandit의 수익률 UCB)를 받으면 점수에 곱함
+
+상태는 JSON 파일에 저장해서 크론 실행 간에 유지한다.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from availability_tracker import hotel_key
+from circuit_breaker import get_circuit_breakers
+
+
+# ===== 스케줄러 설정 =====
+SCHEDULE_STATE_FILE = "scrape_schedule.json"
+SCHEDULER_CONFIG = {
+    "request_budget": 4,            # 실행당 셀 수 (기존 랜덤 1~2 도시 × 2~3 플랫폼 평균과 비슷)
+    "max_staleness_hours": 24,      # 이보다 오래된 셀은 무조건 먼저 갱신
+    "default_change_rate": 0.05,    # 관찰 전 변동률 (시간당 변한 호텔 비율)
+    "min_change_rate": 0.005,       # 변동률 하한
+    "ewma_alpha": 0.3,              # 변동률 EWMA 가중치
+    "urgency_window_days": 30,      # 공연 D-30부터 가중치 증가
+    "max_urgency": 4.0,             # 공연 당일 가중치
+}
+
+_scheduler: Optional["ScrapeScheduler"] = None
+_scheduler_lock = threading.Lock()
+
+
+def cell_key(city_key: str, platform: str) -> str:
+    return f"{city_key}:{platform}"
+
+
+def snapshot(hotels: List[Dict]) -> Dict[str, List]:
+    """호텔 목록 → {호텔 키: [가격, 남은 객실]}"""
+    return {
+        hotel_key(h): [h.get("price_krw", 0), h.get("rooms_left", -1)]
+        for h in hotels
+    }
+
+
+def changed_count(before: Dict[str, List], after: Dict[str, List]) -> int:
+    """새로 생기거나 가격·재고가 바뀐 호텔 수"""
+    return sum(1 for k, v in after.items() if before.get(k) != v)
+
+
+def change_fraction(before: Dict[str, List], after: Dict[str, List]) -> float:
+    """두 스냅샷 사이에 바뀐 호텔 비율 (새로 생김/사라짐/가격·재고 변경)"""
+    keys = set(before) | set(after)
+    if not keys:
+        return 0.0
+    changed = sum(1 for k in keys if before.get(k) != after.get(k))
+    return changed / len(keys)
+
+
+class ScrapeScheduler:
+    """셀별 갱신 시각/변동률 기록 + 예산 내 셀 선택"""
+
+    def __init__(self, state_file: str = SCHEDULE_STATE_FILE, config: Dict = None):
+        self.state_file = state_file
+        self.config = {**SCHEDULER_CONFIG, **(config or {})}
+        self._lock = threading.Lock()
+        self.cells: Dict[str, Dict] = self._load_state()
+
+    # ----- 저장 -----
+
+    def _load_state(self) -> Dict:
+        if not os.path.exists(self.state_file):
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get("cells", {})
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def save(self):
+        """상태 저장 (임시 파일 → 교체)"""
+        with self._lock:
+            tmp_path = f"{self.state_file}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"updated_at": datetime.now().isoformat(), "cells": self.cells},
+                          f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.state_file)
+
+    # ----- 점수 -----
+
+    def urgency(self, concert_date: datetime, now: datetime = None) -> float:
+        """공연 임박 가중치 (D-window 밖 1.0 → 공연 당일 max_urgency)"""
+        now = now or datetime.now()
+        window = self.config["urgency_window_days"]
+        days_left = (concert_date - now).total_seconds() / 86400
+        if days_left >= window or days_left < 0:
+            return 1.0
+        return 1.0 + (self.config["max_urgency"] - 1.0) * (1 - days_left / window)
+
+    def staleness_hours(self, key: str, now: float = None) -> Optional[float]:
+        """
+        마지막 갱신(또는 빈 결과로 끝난 시도) 후 경과 시간 (기록이 없으면 None)
+
+        빈 결과만 돌려주는 셀(JS 전용 렌더링 등)이 매 실행 "미갱신"으로 예산을
+        차지하지 않도록 시도 시각도 센다.
+        """
+        entry = self.cells.get(key)
+        checked_at = max(entry.get("refreshed_at", 0), entry.get("attempted_at", 0)) if entry else 0
+        if not checked_at:
+            return None
+        return ((now or time.time()) - checked_at) / 3600
+
+    def score(self, key: str, urgency: float = 1.0, now: float = None) -> float:
+        """기대 staleness 비용 (갱신 기록이 없으면 무한대)"""
+        age = self.staleness_hours(key, now)
+        if age is None:
+            return float("inf")
+        rate = self.cells[key].get("change_rate", self.config["default_change_rate"])
+        return max(rate, self.config["min_change_rate"]) * age * urgency
+
+    # ----- 선택 / 기록 -----
+
+    def select(self, cells: List[Tuple[str, str]], concert_date: datetime,
+               budget: int = None, breaker_names: Dict[str, str] = None,
+               weights: Dict[str, float] = None) -> List[Tuple[str, str]]:
+        """
+        이번 실행에서 갱신할 (도시, 플랫폼) 셀 선택
+
+        Args:
+            cells: 후보 (city_key, platform) 목록
+            concert_date: 공연 날짜 (임박 가중치)
+            budget: 선택할 셀 수 (기본: request_budget)
+            breaker_names: 플랫폼 → 서킷 브레이커 이름 (열린 서킷 셀 제외용)
+            weights: 셀 키 → 점수 가중치 (기한 초과 셀 순서에는 영향 없음)
+
+        Returns:
+            우선순위 순 셀 목록
+        """
+        budget = budget or self.config["request_budget"]
+        now = time.time()
+        urgency = self.urgency(concert_date)
+        max_age = self.config["max_staleness_hours"]
+        breakers = get_circuit_breakers()
+
+        ranked = []
+        for order, (city_key, platform) in enumerate(cells):
+            if breaker_names and breakers.is_blocked(
+                    breakers.keys_for(breaker_names.get(platform, platform), city_key)):
+                continue
+            key = cell_key(city_key, platform)
+            age = self.staleness_hours(key, now)
+            overdue = age is None or age >= max_age
+            # 기한 초과 셀 먼저 (오래된 순), 나머지는 점수 순, 동점은 입력 순서
+            ranked.append((
+                0 if overdue else 1,
+                -(age if age is not None else float("inf")) if overdue
+                else -self.score(key, urgency, now) * (weights or {}).get(key, 1.0),
+                order,
+                (city_key, platform),
+            ))
+
+        ranked.sort(key=lambda r: r[:3])
+        return [r[3] for r in ranked[:budget]]
+
+    def observe(self, city_key: str, platform: str, hotels: List[Dict]) -> int:
+        """
+        셀 수집 결과 기록
+
+        빈 결과(차단/실패)는 데이터 갱신으로 치지 않고 시도 시각만 남긴다.
+
+        Returns:
+            새로 생기거나 가격·재고가 바뀐 호텔 수
+        """
+        key = cell_key(city_key, platform)
+        now = time.time()
+
+        if not hotels:
+            with self._lock:
+                self.cells.setdefault(key, {"change_rate": self.config["default_change_rate"]})
+                self.cells[key]["attempted_at"] = now
+            return 0
+
+        current = snapshot(hotels)
+
+        with self._lock:
+            entry = self.cells.get(key)
+            changed = changed_count(entry.get("snapshot", {}) if entry else {}, current)
+            if entry and entry.get("refreshed_at"):
+                hours = max((now - entry["refreshed_at"]) / 3600, 1e-3)
+                observed = change_fraction(entry.get("snapshot", {}), current) / hours
+                alpha = self.config["ewma_alpha"]
+                rate = entry.get("change_rate", self.config["default_change_rate"])
+                entry["change_rate"] = round((1 - alpha) * rate + alpha * observed, 6)
+            elif not entry:
+                entry = self.cells[key] = {"change_rate": self.config["default_change_rate"]}
+
+            entry["refreshed_at"] = now
+            entry["refreshed_at_iso"] = datetime.fromtimestamp(now).isoformat()
+            entry["snapshot"] = current
+        return changed
+
+
+def get_scrape_scheduler() -> ScrapeScheduler:
+    """프로세스 공유 스케줄러 (최초 호출 시 파일에서 로드)"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = ScrapeScheduler(SCHEDULE_STATE_FILE)
+    return _scheduler
@@ -0,0 +1,91 @@
+"""
+ARMY Stay Hub - 플랫폼 스크래퍼 레지스트리
+
+플랫폼 이름 → (모듈, 클래스) 매핑만 들고 있다가,
+실제로 그 플랫폼을 쓸 때 모듈을 import하고 인스턴스를 만든다.
+
+- 필요한 플랫폼만 생성 (분산 모드에서 2~3개만 쓰면 2~3개만)
+- 플랫폼당 인스턴스 하나를 만들어 set_city()로 도시 간 재사용
+- 모듈은 처음 필요할 때 importlib로 로드
+"""
+
+import importlib
+import threading
+from typing import Dict, List, Optional
+
+
+# ===== 플랫폼 목록 (정의 순서 = 기본 순서) =====
+PLATFORM_REGISTRY = {
+    # 글로벌 OTA (안정적)
+    "agoda": {"module": "korean_ota_scraper", "class": "AgodaScraper", "weight": 2},
+    "tripcom": {"module": "korean_ota_scraper", "class": "TripComScraper", "weight": 2},
+    "hotelscom": {"module": "korean_ota_scraper", "class": "HotelsComScraper", "weight": 2},
+    "booking": {"module": "korean_ota_scraper", "class": "BookingComScraper", "weight": 2},
+    "expedia": {"module": "korean_ota_scraper", "class": "ExpediaScraper", "weight": 2},
+    # 한국 OTA
+    "naver": {"module": "korean_ota_scraper", "class": "NaverHotelScraper", "weight": 1},
+    "goodchoice": {"module": "korean_ota_scraper", "class": "GoodChoiceScraper", "weight": 1},
+    "yanolja": {"module": "korean_ota_scraper", "class": "YanoljaScraper", "weight": 1},
+    "coupang": {"module": "korean_ota_scraper", "class": "CoupangTravelScraper", "weight": 1},
+}
+
+GLOBAL_PLATFORMS = [name for name, spec in PLATFORM_REGISTRY.items() if spec["weight"] == 2]
+
+_registry: Optional["ScraperRegistry"] = None
+_registry_lock = threading.Lock()
+
+
+class ScraperRegistry:
+    """플랫폼별 스크래퍼 클래스/인스턴스 지연 로딩"""
+
+    def __init__(self, registry: Dict[str, Dict] = None):
+        self.registry = registry or PLATFORM_REGISTRY
+        self._classes: Dict[str, type] = {}
+        self._instances: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def platforms(self) -> List[str]:
+        return list(self.registry)
+
+    def has(self, platform: str) -> bool:
+        return platform in self.registry
+
+    def weight(self, platform: str) -> int:
+        return self.registry[platform]["weight"]
+
+    def scraper_class(self, platform: str) -> type:
+        """플랫폼 클래스 (처음 호출 시 모듈 import)"""
+        if platform not in self._classes:
+            spec = self.registry[platform]
+            module = importlib.import_module(spec["module"])
+            self._classes[platform] = getattr(module, spec["class"])
+        return self._classes[platform]
+
+    def get(self, platform: str, city_key: str = None):
+        """
+        플랫폼 공유 인스턴스 (없으면 생성)
+
+        city_key를 주면 그 도시로 맞춰서 반환. 같은 플랫폼 작업은 한 레인에서
+        순차 실행되므로 인스턴스를 도시 간에 재사용해도 안전하다.
+        """
+        with self._lock:
+            if platform not in self._instances:
+                self._instances[platform] = self.scraper_class(platform)(city_key or "goyang")
+            scraper = self._instances[platform]
+        if city_key:
+            scraper.set_city(city_key)
+        return scraper
+
+    def create(self, platform: str, city_key: str):
+        """독립 인스턴스 생성 (도시/인원 등 상태를 따로 가져야 할 때)"""
+        return self.scraper_class(platform)(city_key)
+
+
+def get_scraper_registry() -> ScraperRegistry:
+    """프로세스 공유 레지스트리"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ScraperRegistry()
+    return _registry
@@ -0,0 +1,267 @@
+"""
+ARMY Stay Hub - 검색 매트릭스 플래너
+
+팬들은 공연 날짜 3일(4/9, 4/11, 4/12) 주변으로, 1~4명 그룹으로 숙소를 찾는다.
+선언적 매트릭스(날짜 × 숙박일수 × 인원 × 도시 × 플랫폼)를 검색 요청으로 펼치고,
+스크래퍼 엔진으로 실행한 뒤 결과를 호텔 × 날짜 × 인원 가격 큐브에 저장한다.
+
+- 같은 URL이 되는 셀은 한 번만 요청 (예: 인원을 URL에 넣지 않는 국내 OTA,
+  서로 다른 공연일에서 겹치는 숙박 기간)
+- 큐브에 아직 신선한 셀은 요청하지 않음
+
+사용:
+    python search_planner.py --dry-run
+    python search_planner.py --engine pipeline
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse
+
+from availability_tracker import hotel_key
+from circuit_breaker import get_circuit_breakers
+from http_cache import HTTP_CACHE_TTL_SEC
+from korean_ota_scraper import KoreanOTAScraper, CITIES
+from request_hedging import get_latency_tracker
+from scraper_registry import get_scraper_registry
+
+
+# ===== 검색 매트릭스 (ConcertHotelRecommender 공연 날짜 기준) =====
+SEARCH_MATRIX = {
+    "concert_dates": ["2026-04-09", "2026-04-11", "2026-04-12"],
+    "checkin_offsets": [1, 0],       # 공연 며칠 전 체크인 (1: 전날, 0: 당일)
+    "nights": [1, 2],                # 숙박일수
+    "adults": [1, 2, 3, 4],          # 인원
+    "cities": ["goyang", "hongdae"],
+    "platforms": ["agoda", "booking", "naver"],
+}
+
+PRICE_CUBE_FILE = "price_cube.json"
+CUBE_FRESH_SEC = HTTP_CACHE_TTL_SEC    # 이 시간 안에 채운 셀은 다시 요청하지 않음
+
+
+def expand_stay_windows(matrix: Dict) -> List[Tuple[str, str]]:
+    """공연 날짜 × 체크인 오프셋 × 숙박일수 → 중복 없는 (체크인, 체크아웃) 목록"""
+    windows = set()
+    for concert in matrix["concert_dates"]:
+        concert_day = datetime.strptime(concert, "%Y-%m-%d")
+        for offset in matrix["checkin_offsets"]:
+            checkin = concert_day - timedelta(days=offset)
+            for nights in matrix["nights"]:
+                checkout = checkin + timedelta(days=nights)
+                windows.add((checkin.strftime("%Y-%m-%d"), checkout.strftime("%Y-%m-%d")))
+    return sorted(windows)
+
+
+def expand_matrix(matrix: Dict) -> List[Dict]:
+    """매트릭스 → 검색 셀 목록"""
+    cells = []
+    for checkin, checkout in expand_stay_windows(matrix):
+        for adults in matrix["adults"]:
+            for city_key in matrix["cities"]:
+                for platform in matrix["platforms"]:
+                    cells.append({
+                        "checkin": checkin,
+                        "checkout": checkout,
+                        "adults": adults,
+                        "city_key": city_key,
+                        "platform": platform,
+                    })
+    return cells
+
+
+def cell_key(cell: Dict) -> str:
+    return f"{cell['checkin']}|{cell['checkout']}|{cell['adults']}|{cell['city_key']}|{cell['platform']}"
+
+
+class PriceCube:
+    """호텔 × 날짜 × 인원 가격 큐브 (JSON 파일 저장)"""
+
+    def __init__(self, cube_file: str = PRICE_CUBE_FILE):
+        self.cube_file = cube_file
+        self.cells: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict:
+        if not os.path.exists(self.cube_file):
+            return {}
+        try:
+            with open(self.cube_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get("cells", {})
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def save(self):
+        tmp_path = f"{self.cube_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"updated_at": datetime.now().isoformat(), "cells": self.cells},
+                      f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.cube_file)
+
+    def is_fresh(self, cell: Dict, max_age_sec: float = CUBE_FRESH_SEC) -> bool:
+        entry = self.cells.get(cell_key(cell))
+        return bool(entry) and time.time() - entry["fetched_at"] < max_age_sec
+
+    def put(self, cell: Dict, hotels: List[Dict], url: str):
+        """셀 결과 저장 (호텔별 가격/재고만 보관)"""
+        self.cells[cell_key(cell)] = {
+            **cell,
+            "url": url,
+            "fetched_at": time.time(),
+            "hotels": {
+                hotel_key(h): {
+                    "name": h.get("name", ""),
+                    "platform": h.get("platform", ""),
+                    "price_krw": h.get("price_krw", 0),
+                    "price_usd": h.get("price_usd", 0),
+                    "rooms_left": h.get("rooms_left", -1),
+                }
+                for h in hotels
+            },
+        }
+
+    def prices_for(self, key: str) -> List[Dict]:
+        """한 호텔의 날짜/인원별 가격"""
+        rows = []
+        for entry in self.cells.values():
+            hotel = entry["hotels"].get(key)
+            if hotel:
+                rows.append({
+                    "checkin": entry["checkin"],
+                    "checkout": entry["checkout"],
+                    "adults": entry["adults"],
+                    "price_krw": hotel["price_krw"],
+                    "rooms_left": hotel["rooms_left"],
+                })
+        return sorted(rows, key=lambda r: (r["checkin"], r["checkout"], r["adults"]))
+
+    def to_rows(self) -> List[Dict]:
+        """큐브를 평평한 행 목록으로 (pandas DataFrame 변환용)"""
+        rows = []
+        for entry in self.cells.values():
+            for key, hotel in entry["hotels"].items():
+                rows.append({
+                    "hotel_key": key,
+                    "name": hotel["name"],
+                    "platform": hotel["platform"],
+                    "city_key": entry["city_key"],
+                    "checkin": entry["checkin"],
+                    "checkout": entry["checkout"],
+                    "adults": entry["adults"],
+                    "price_krw": hotel["price_krw"],
+                    "rooms_left": hotel["rooms_left"],
+                })
+        return rows
+
+
+class SearchPlanner:
+    """검색 매트릭스 → 중복 제거된 요청 → 엔진 실행 → 가격 큐브"""
+
+    def __init__(self, matrix: Dict = None, cube: PriceCube = None,
+                 ota: KoreanOTAScraper = None):
+        self.matrix = matrix or SEARCH_MATRIX
+        self.cube = cube or PriceCube()
+        self.ota = ota or KoreanOTAScraper(cities=self.matrix["cities"])
+        self._scrapers: Dict[Tuple[str, str, int], object] = {}
+
+    def _scraper(self, city_key: str, platform: str, adults: int):
+        """(도시, 플랫폼, 인원)별 스크래퍼 (인원은 인스턴스 속성이라 따로 만든다)"""
+        registry = get_scraper_registry()
+        if not registry.has(platform):
+            return None
+        key = (city_key, platform, adults)
+        if key not in self._scrapers:
+            scraper = registry.create(platform, city_key)
+            scraper.adults = adults
+            self._scrapers[key] = scraper
+        return self._scrapers[key]
+
+    def plan(self) -> Tuple[List[Dict], int]:
+        """
+        검색 요청 목록 생성
+
+        Returns:
+            (요청 목록, 신선해서 건너뛴 셀 수)
+            요청: {"url", "job", "cells"} - 같은 URL의 셀은 하나의 요청으로 묶음
+        """
+        by_url: Dict[str, Dict] = {}
+        skipped = 0
+
+        for cell in expand_matrix(self.matrix):
+            if cell["city_key"] not in CITIES:
+                continue
+            if self.cube.is_fresh(cell):
+                skipped += 1
+                continue
+
+            scraper = self._scraper(cell["city_key"], cell["platform"], cell["adults"])
+            if scraper is None:
+                continue
+
+            checkin = datetime.strptime(cell["checkin"], "%Y-%m-%d")
+            checkout = datetime.strptime(cell["checkout"], "%Y-%m-%d")
+            url = scraper._build_url(checkin, checkout)
+
+            if url not in by_url:
+                by_url[url] = {
+                    "url": url,
+                    "job": {
+                        "city_key": cell["city_key"],
+                        "platform": cell["platform"],
+                        "checkin": checkin,
+                        "checkout": checkout,
+                        "scraper": scraper,
+                        "host": urlparse(scraper.base_url).netloc,
+                    },
+                    "cells": [],
+                }
+            by_url[url]["cells"].append(cell)
+
+        return list(by_url.values()), skipped
+
+    def run(self, engine: str = None) -> PriceCube:
+        """계획 실행 후 큐브 저장"""
+        planned, skipped = self.plan()
+        total_cells = sum(len(r["cells"]) for r in planned)
+        print(f"🧮 검색 매트릭스: {total_cells}개 셀 → {len(planned)}개 요청 (신선한 셀 {skipped}개 건너뜀)")
+
+        if not planned:
+            return self.cube
+
+        outcomes = self.ota.run_jobs([r["job"] for r in planned], engine)
+        for request, hotels in zip(planned, outcomes):
+            if not hotels:
+                continue  # 실패/빈 결과는 다음 실행에서 다시 시도
+            for cell in request["cells"]:
+                self.cube.put(cell, hotels, request["url"])
+
+        self.cube.save()
+        get_circuit_breakers().save()
+        get_latency_tracker().save()
+        print(f"✅ 가격 큐브 저장: {self.cube.cube_file} ({len(self.cube.cells)}개 셀)")
+        return self.cube
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="검색 매트릭스 플래너")
+    parser.add_argument("--engine", choices=["serial", "async", "pipeline"])
+    parser.add_argument("--dry-run", action="store_true", help="요청 계획만 출력")
+    args = parser.parse_args()
+
+    planner = SearchPlanner()
+    if args.dry_run:
+        planned, skipped = planner.plan()
+        for r in planned:
+            print(f"  [{r['job']['platform']}] {r['job']['city_key']} {len(r['cells'])}개 셀: {r['url']}")
+        print(f"🧮 {len(planned)}개 요청 (신선한 셀 {skipped}개 건너뜀)")
+        return
+
+    planner.run(args.engine)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""CircuitBreakers 상태 전이 closed → open → half_open → closed / 재차단"""
+
+import pytest
+
+import circuit_breaker
+from circuit_breaker import CircuitBreakers, CLOSED, OPEN, HALF_OPEN
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker.time, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def breakers(tmp_path, clock):
+    return CircuitBreakers(str(tmp_path / "circuit_state.json"), failure_threshold=3,
+                           cooldown_sec=100, max_cooldown_sec=250)
+
+
+KEYS = ["Agoda"]
+
+
+def trip(breakers):
+    for _ in range(3):
+        assert breakers.allow(KEYS)
+        breakers.record_failure(KEYS)
+
+
+def test_opens_after_consecutive_failures(breakers):
+    breakers.record_failure(KEYS)
+    breakers.record_failure(KEYS)
+    breakers.record_success(KEYS)          # 연속이 끊기면 다시 0부터
+    breakers.record_failure(KEYS)
+    breakers.record_failure(KEYS)
+    assert breakers.state["Agoda"]["state"] == CLOSED
+    breakers.record_failure(KEYS)
+    assert breakers.state["Agoda"]["state"] == OPEN
+    assert not breakers.allow(KEYS)
+    assert breakers.open_keys() == ["Agoda"]
+
+
+def test_half_open_probe_success_closes(breakers, clock):
+    trip(breakers)
+    clock.now += 99
+    assert not breakers.allow(KEYS)
+
+    clock.now += 1
+    assert breakers.is_blocked(KEYS) is False       # 조회는 프로브를 소모하지 않음
+    assert breakers.allow(KEYS)
+    assert breakers.state["Agoda"]["state"] == HALF_OPEN
+    assert not breakers.allow(KEYS)                 # 프로브는 하나만
+    assert breakers.is_blocked(KEYS)
+
+    breakers.record_success(KEYS)
+    assert breakers.state["Agoda"]["state"] == CLOSED
+    assert breakers.state["Agoda"]["failures"] == 0
+    assert breakers.allow(KEYS) and breakers.allow(KEYS)
+
+
+def test_half_open_probe_failure_reopens_with_longer_cooldown(breakers, clock):
+    trip(breakers)
+    clock.now += 100
+    assert breakers.allow(KEYS)
+    breakers.record_failure(KEYS)
+    entry = breakers.state["Agoda"]
+    assert entry["state"] == OPEN and entry["cooldown_sec"] == 200
+
+    clock.now += 199
+    assert not breakers.allow(KEYS)
+    clock.now += 1
+    assert breakers.allow(KEYS)
+    breakers.record_failure(KEYS)
+    assert breakers.state["Agoda"]["cooldown_sec"] == 250      # max_cooldown_sec에서 멈춤
+
+    clock.now += 250
+    assert breakers.allow(KEYS)
+    breakers.record_success(KEYS)
+    assert breakers.state["Agoda"]["cooldown_sec"] == 100      # 복구되면 초기 쿨다운
+
+
+def test_city_key_blocks_without_spending_platform_probe(breakers, clock):
+    city_keys = CircuitBreakers.keys_for("Agoda", "busan")
+    assert city_keys == ["Agoda", "Agoda:busan"]
+    for _ in range(3):
+        breakers.record_failure(["Agoda:busan"])
+
+    assert not breakers.allow(city_keys)
+    assert breakers.allow(CircuitBreakers.keys_for("Agoda", "goyang"))
+
+
+def test_state_survives_reload(breakers, tmp_path, clock):
+    trip(breakers)
+    breakers.save()
+    reloaded = CircuitBreakers(breakers.state_file, cooldown_sec=100)
+    assert not reloaded.allow(KEYS)
+    clock.now += 100
+    assert reloaded.allow(KEYS)
+
+
+def test_probe_without_result_is_released(breakers, clock):
+    """마감 / 요청 슬롯 대기 초과로 프로브가 결과 없이 끝나면 다음 요청이 다시 프로브"""
+    trip(breakers)
+    clock.now += 100
+    assert breakers.allow(KEYS)
+    assert breakers.is_blocked(KEYS)
+
+    breakers.release(KEYS)
+    assert breakers.state["Agoda"]["state"] == HALF_OPEN
+    assert breakers.state["Agoda"]["cooldown_sec"] == 100
+    assert not breakers.is_blocked(KEYS)
+    assert breakers.allow(KEYS)
+    breakers.record_success(KEYS)
+    assert breakers.state["Agoda"]["state"] == CLOSED
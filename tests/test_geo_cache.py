@@ -0,0 +1,47 @@
+"""좌표 캐시 - 배치 크기만큼 늘어나고, 바뀐 항목이 없으면 저장하지 않음"""
+
+import os
+
+import pytest
+
+from geo_cache import GeoFeatureCache
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return str(tmp_path / "geo.json")
+
+
+def coords(n):
+    return [(37.0 + i * 0.001, 127.0) for i in range(n)]
+
+
+def test_reserve_keeps_whole_batch(cache_file):
+    cache = GeoFeatureCache(cache_file, "v1", {"max_entries": 3})
+    cache.reserve(5)
+    for i, (lat, lng) in enumerate(coords(5)):
+        cache.put(lat, lng, {"venue_km": i})
+    assert all(cache.get(lat, lng) is not None for lat, lng in coords(5))
+
+    cache.reserve(2)        # 줄이지는 않음
+    assert cache.config["max_entries"] == 5
+
+
+def test_save_skipped_when_nothing_changed(cache_file):
+    cache = GeoFeatureCache(cache_file, "v1")
+    for i, (lat, lng) in enumerate(coords(3)):
+        cache.put(lat, lng, {"venue_km": i})
+    cache.save()
+    os.utime(cache_file, ns=(0, 0))
+
+    reloaded = GeoFeatureCache(cache_file, "v1")
+    for i, (lat, lng) in enumerate(coords(3)):
+        assert reloaded.get(lat, lng) == {"venue_km": i}
+        reloaded.put(lat, lng, {"venue_km": i})     # 같은 값
+    reloaded.save()
+    assert os.stat(cache_file).st_mtime_ns == 0
+
+    reloaded.put(*coords(1)[0], {"venue_km": 9})
+    reloaded.save()
+    assert os.stat(cache_file).st_mtime_ns != 0
+    assert GeoFeatureCache(cache_file, "v1").get(*coords(1)[0]) == {"venue_km": 9}
@@ -0,0 +1,119 @@
+"""GeoIndex / PoiIndex - 전수 haversine 정렬과 같은 결과인지"""
+
+import random
+
+import pytest
+
+from geo_distance import haversine_km
+from geo_index import GeoIndex, PoiIndex
+
+
+def brute_nearest(points, lat, lng, k, skip=None, precision=1, radius_km=None):
+    """기존 방식: 전부 거리 계산 → (반올림 거리, 입력 순서) stable sort"""
+    hits = []
+    for i, (p_lat, p_lng) in enumerate(points):
+        if skip is not None and skip(i):
+            continue
+        dist = haversine_km(lat, lng, p_lat, p_lng)
+        if radius_km is not None and dist > radius_km:
+            continue
+        hits.append((i, dist))
+    hits.sort(key=lambda hit: round(hit[1], precision) if precision is not None else hit[1])
+    return hits[:k]
+
+
+def clustered_points(rng, n):
+    """공연장 근처에 몰린 점 + 지방 점 + 같은 좌표 중복"""
+    points = []
+    for _ in range(n):
+        if rng.random() < 0.7:
+            points.append((37.6556 + rng.gauss(0, 0.01), 126.7714 + rng.gauss(0, 0.01)))
+        else:
+            points.append((rng.uniform(33.0, 38.5), rng.uniform(125.0, 130.0)))
+    points += [points[0]] * 5 + [points[1]] * 3
+    return points
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("precision", [1, None])
+def test_nearest_matches_brute_force(seed, precision):
+    rng = random.Random(seed)
+    points = clustered_points(rng, rng.randint(1, 400))
+    index = GeoIndex(points, leaf_size=rng.choice([1, 4, 16]))
+    for _ in range(10):
+        lat, lng = rng.choice(points) if rng.random() < 0.5 else (rng.uniform(33, 39), rng.uniform(125, 131))
+        k = rng.randint(1, 12)
+        assert index.nearest(lat, lng, k, precision=precision) == \
+            brute_nearest(points, lat, lng, k, precision=precision)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_nearest_skips_duplicate_ids(seed):
+    """add_nearby처럼 같은 id(자기 자신 / 같은 호텔 다른 플랫폼)는 제외"""
+    rng = random.Random(seed)
+    points = clustered_points(rng, 200)
+    ids = [f"hotel_{rng.randint(0, 60)}" for _ in points]
+    index = GeoIndex(points)
+    for query in rng.sample(range(len(points)), 20):
+        skip = lambda i: ids[i] == ids[query]
+        lat, lng = points[query]
+        assert index.nearest(lat, lng, 3, skip=skip) == brute_nearest(points, lat, lng, 3, skip=skip)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_within_matches_brute_force(seed):
+    rng = random.Random(seed)
+    points = clustered_points(rng, 300)
+    index = GeoIndex(points)
+    lat, lng = rng.choice(points)
+    for radius in (0.5, 2.0, 50.0):
+        assert index.within(lat, lng, radius) == brute_nearest(points, lat, lng, len(points), radius_km=radius)
+        assert index.within(lat, lng, radius, k=4) == brute_nearest(points, lat, lng, 4, radius_km=radius)
+
+
+def test_antimeridian():
+    points = [(0.0, 179.9), (0.0, -179.9), (0.0, 170.0), (0.0, -170.0)]
+    index = GeoIndex(points, leaf_size=1)
+    assert index.nearest(0.0, 179.95, 4) == brute_nearest(points, 0.0, 179.95, 4)
+
+
+def test_empty_and_zero_k():
+    assert GeoIndex([]).nearest(37.0, 127.0, 3) == []
+    assert GeoIndex([(37.0, 127.0)]).nearest(37.0, 127.0, 0) == []
+
+
+def test_poi_index_categories():
+    rng = random.Random(7)
+    spots = [{"lat": lat, "lng": lng, "category": rng.choice(["bts", "cafe", "restaurant"])}
+             for lat, lng in clustered_points(rng, 80)]
+    index = PoiIndex(spots)
+    lat, lng = 37.66, 126.77
+    for category in ("bts", "cafe", "restaurant"):
+        positions = [p for p, s in enumerate(spots) if s["category"] == category]
+        expected = [(positions[i], d) for i, d in
+                    brute_nearest([(spots[p]["lat"], spots[p]["lng"]) for p in positions], lat, lng, 3)]
+        assert index.nearest(lat, lng, category, 3) == expected
+    assert index.nearest(lat, lng, "missing", 3) == []
+    assert index.within(lat, lng, 5.0) == brute_nearest([(s["lat"], s["lng"]) for s in spots], lat, lng,
+                                                        len(spots), radius_km=5.0)
+
+
+def test_add_nearby_matches_full_sort():
+    """run_scraper.add_nearby - 기존 전수 비교 구현과 같은 nearby 목록"""
+    from run_scraper import ARMYStayHubEngine
+
+    engine = ARMYStayHubEngine()
+    rng = random.Random(3)
+    hotels = [{"id": f"hotel_{rng.randint(0, 40):05d}", "name_en": f"H{i}", "price_krw": i,
+               "image_url": "", "lat": lat, "lng": lng}
+              for i, (lat, lng) in enumerate(clustered_points(rng, 120))]
+
+    expected = []
+    for hotel in hotels:
+        nearby = [{"id": o["id"], "name_en": o["name_en"], "price_krw": o["price_krw"],
+                   "distance_km": round(engine._calc_distance(hotel["lat"], hotel["lng"], o["lat"], o["lng"]), 1),
+                   "image_url": o["image_url"]}
+                  for o in hotels if o["id"] != hotel["id"]]
+        expected.append(sorted(nearby, key=lambda x: x["distance_km"])[:3])
+
+    assert [h["nearby"] for h in engine.add_nearby(hotels)] == expected
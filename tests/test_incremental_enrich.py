@@ -0,0 +1,138 @@
+"""증분 enrichment - 해시가 같으면 재사용, 가격만 바뀌면 가격 필드만, 내용이 바뀌면 다시 계산"""
+
+import copy
+import random
+
+import pytest
+
+import run_scraper
+from run_scraper import ARMYStayHubEngine
+
+
+def scraped(name, price=150000, rooms=3, **extra):
+    return {"name": name, "name_en": name, "platform": "Agoda", "price_krw": price, "rooms_left": rooms,
+            "latitude": 37.66 + len(name) * 0.001, "longitude": 126.77, "rating": 8.5,
+            "hotel_type": "hotel", "star_rating": 4, "city_key": "goyang",
+            "scraped_at": "2026-06-01T00:00:00", **extra}
+
+
+RAW = [scraped("Alpha"), scraped("Bravo Hotel"), scraped("Charlie Stay", rooms=0)]
+
+
+def without_last_update(hotels):
+    return [{k: v for k, v in h.items() if k != "last_update"} for h in hotels]
+
+
+@pytest.fixture(autouse=True)
+def in_tmp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)       # 좌표 캐시 / 해시 파일
+    random.seed(0)
+
+
+@pytest.fixture
+def first_run(tmp_path):
+    engine = ARMYStayHubEngine()
+    hotels, changes = engine.enrich_incremental(copy.deepcopy(RAW), [], None, {})
+    engine.save_source_hashes(hotels, {})
+    return hotels, changes
+
+
+def test_first_run_matches_full_enrichment(first_run):
+    hotels, changes = first_run
+    assert without_last_update(hotels) == without_last_update(ARMYStayHubEngine().enrich_hotels(copy.deepcopy(RAW)))
+    assert [c["name_en"] for c in changes["added"]] == ["Alpha", "Bravo Hotel", "Charlie Stay"]
+    assert not any("source_hash" in h for h in hotels)
+
+
+def test_unchanged_records_are_reused(first_run, monkeypatch):
+    previous, _ = first_run
+    engine = ARMYStayHubEngine()
+    monkeypatch.setattr(engine, "enrich_hotels", lambda *a, **k: pytest.fail("nothing should be re-enriched"))
+
+    raw = copy.deepcopy(RAW)
+    for record in raw:
+        record["scraped_at"] = "2026-06-02T00:00:00"     # 수집 시각은 해시에서 제외
+    hotels, changes = engine.enrich_incremental(raw, previous, None, engine.load_source_hashes())
+
+    assert without_last_update(hotels) == without_last_update(previous)
+    assert changes["unchanged"] == 3
+    assert not ARMYStayHubEngine.has_changes(changes)
+
+
+def test_price_change_patches_price_fields_only(first_run, monkeypatch):
+    previous, _ = first_run
+    engine = ARMYStayHubEngine()
+    monkeypatch.setattr(engine, "enrich_hotels", lambda *a, **k: pytest.fail("price change should not re-enrich"))
+
+    raw = copy.deepcopy(RAW)
+    raw[1]["price_krw"] = 99000
+    raw[2]["rooms_left"] = 2
+    hotels, changes = engine.enrich_incremental(raw, previous, None, engine.load_source_hashes())
+
+    assert [c["name_en"] for c in changes["price_changed"]] == ["Bravo Hotel", "Charlie Stay"]
+    assert hotels[1]["price_krw"] == 99000
+    assert hotels[2]["rooms_left"] == 2 and hotels[2]["is_available"]
+    assert without_last_update(hotels) == without_last_update(ARMYStayHubEngine().enrich_hotels(raw))
+
+    # 저장한 해시로 다음 실행에서는 변경 없음
+    engine.save_source_hashes(hotels, {})
+    _, again = ARMYStayHubEngine().enrich_incremental(copy.deepcopy(raw), hotels, None,
+                                                      engine.load_source_hashes())
+    assert again["unchanged"] == 3
+
+
+def test_content_change_and_new_hotel_are_re_enriched(first_run):
+    previous, _ = first_run
+    engine = ARMYStayHubEngine()
+    raw = copy.deepcopy(RAW)
+    raw[0]["rating"] = 9.1
+    raw.append(scraped("Delta Inn"))
+    hotels, changes = engine.enrich_incremental(raw, previous, None, engine.load_source_hashes())
+
+    assert [c["name_en"] for c in changes["changed"]] == ["Alpha"]
+    assert [c["name_en"] for c in changes["added"]] == ["Delta Inn"]
+    assert changes["unchanged"] == 2
+    assert [h["name_en"] for h in hotels] == ["Alpha", "Bravo Hotel", "Charlie Stay", "Delta Inn"]
+    assert hotels[0]["rating"] == 9.1
+
+
+def test_skipped_re_enrichment_keeps_previous_hash(first_run, monkeypatch):
+    """마감으로 다시 계산 못 한 호텔은 이전 해시 유지 → 다음 실행에서 다시 계산"""
+    previous, _ = first_run
+    previous_hashes = ARMYStayHubEngine().load_source_hashes()
+    engine = ARMYStayHubEngine()
+    monkeypatch.setattr(engine, "enrich_hotels", lambda *a, **k: [])
+
+    raw = copy.deepcopy(RAW)
+    raw[0]["rating"] = 9.1
+    hotels, _ = engine.enrich_incremental(raw, previous, None, previous_hashes)
+    assert ("Alpha", "Agoda") not in engine.source_hashes
+
+    engine.save_source_hashes(engine.merge_with_previous(hotels, previous), previous_hashes)
+    _, again = ARMYStayHubEngine().enrich_incremental(raw, previous, None, engine.load_source_hashes())
+    assert [c["name_en"] for c in again["changed"]] == ["Alpha"]
+
+
+def test_enrichment_table_change_invalidates(first_run, monkeypatch):
+    previous, _ = first_run
+    monkeypatch.setattr(run_scraper, "ENRICH_VERSION", run_scraper.ENRICH_VERSION + 1)
+    engine = ARMYStayHubEngine()
+    _, changes = engine.enrich_incremental(copy.deepcopy(RAW), previous, None, engine.load_source_hashes())
+    assert len(changes["changed"]) == 3
+
+
+def test_missing_hash_file_re_enriches(first_run, tmp_path):
+    previous, _ = first_run
+    (tmp_path / run_scraper.SOURCE_HASHES_FILE).unlink()
+    engine = ARMYStayHubEngine()
+    _, changes = engine.enrich_incremental(copy.deepcopy(RAW), previous, None, engine.load_source_hashes())
+    assert len(changes["changed"]) == 3
+
+
+def test_removed_hotels_are_recorded(first_run):
+    previous, _ = first_run
+    engine = ARMYStayHubEngine()
+    changes = {"added": [], "changed": [], "price_changed": [], "unchanged": 0, "removed": []}
+    engine.record_removed(changes, previous, previous[:2])
+    assert changes["removed"] == [{"name_en": "Charlie Stay", "platform": "Agoda"}]
+    assert ARMYStayHubEngine.has_changes(changes)
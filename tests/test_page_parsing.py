@@ -0,0 +1,69 @@
+"""page_parsing - DOM 없이 임베디드 JSON 잘라내기"""
+
+import json
+
+import pytest
+
+from page_parsing import extract_assigned_json, extract_next_data, find_json_end
+
+
+TRICKY = {
+    "text": 'window.__STATE__ = {"a": 1}; };',
+    "quote": 'say \\"hi\\" {',
+    "slash": "C:\\\\path\\\\",
+    "brackets": "]]}}[[{{",
+    "nested": [{"x": [1, {"y": "}"}]}, []],
+    "unicode": "아미 \u003c/script>",
+}
+
+
+@pytest.mark.parametrize("as_bytes", [False, True])
+def test_find_json_end_ignores_brackets_in_strings(as_bytes):
+    blob = json.dumps(TRICKY)
+    page = f'<script>window.__STATE__ = {blob};</script> trailing }};'
+    data = page.encode() if as_bytes else page
+    start = data.index(b"{" if as_bytes else "{")
+    end = find_json_end(data, start)
+    assert json.loads(data[start:end]) == TRICKY
+
+
+@pytest.mark.parametrize("text", [
+    '{"a": "};"}',
+    '{"a": "\\"};\\""}',
+    '{"a": "\\\\"}',
+    '{"a": "\\\\\\"}"}',
+    '[1, "]", {"b": "["}]',
+])
+def test_find_json_end_escaped_quotes(text):
+    data = text + '; {"next": 1}'
+    end = find_json_end(data, 0)
+    assert data[:end] == text
+    json.loads(data[:end])
+
+
+@pytest.mark.parametrize("text", ['{"a": [1, 2', '{"a": "};', '{"a": "\\"}'])
+def test_find_json_end_truncated(text):
+    assert find_json_end(text, 0) == -1
+
+
+@pytest.mark.parametrize("as_bytes", [False, True])
+def test_extract_next_data(as_bytes):
+    html = ('<html><script>var x = "}";</script>'
+            f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(TRICKY)}</script></html>')
+    assert extract_next_data(html.encode() if as_bytes else html) == TRICKY
+    assert extract_next_data("<html></html>") is None
+    assert extract_next_data('<script id="__NEXT_DATA__">{"a": ') is None
+
+
+def test_extract_next_data_broken_json_raises():
+    with pytest.raises(json.JSONDecodeError):
+        extract_next_data('<script id="__NEXT_DATA__">{"a": tru}</script>')
+
+
+@pytest.mark.parametrize("as_bytes", [False, True])
+def test_extract_assigned_json(as_bytes):
+    html = ('<script>window.__OTHER__ = "x";'
+            f' window.__STATE__ = {json.dumps(TRICKY)}; var y = {{}};</script>')
+    data = html.encode() if as_bytes else html
+    assert extract_assigned_json(data, ["__MISSING__", "window.__STATE__"]) == TRICKY
+    assert extract_assigned_json(data, "window.__OTHER__") is None
@@ -0,0 +1,125 @@
+"""hedged_call - 먼저 끝난 요청 사용, 진 요청은 바로 취소"""
+
+import threading
+import time
+
+import pytest
+
+from deadline import Deadline, DeadlineExceeded
+from request_hedging import HedgeCancelled, hedged_call, percentile
+
+
+class FakeResponse:
+    def __init__(self, label):
+        self.label = label
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def slow_send(aborted: threading.Event, seconds: float = 5.0):
+    """본문을 오래 받는 send - 청크마다 취소 이벤트 확인"""
+    def send(cancelled):
+        stop = time.monotonic() + seconds
+        while time.monotonic() < stop:
+            if cancelled is not None and cancelled.is_set():
+                aborted.set()
+                raise HedgeCancelled("lost")
+            time.sleep(0.01)
+        return FakeResponse("slow")
+    return send
+
+
+def test_loser_is_aborted_when_hedge_wins():
+    aborted = threading.Event()
+    slow = slow_send(aborted)
+    calls = []
+
+    def send(cancelled):
+        calls.append(cancelled)
+        if len(calls) == 1:
+            return slow(cancelled)
+        time.sleep(0.05)
+        return FakeResponse("hedge")
+
+    started = time.monotonic()
+    result = hedged_call(send, 0.05, lambda: True, "test")
+    assert result.label == "hedge"
+    assert aborted.wait(1.0), "진 요청이 취소되지 않음"
+    assert time.monotonic() - started < 2.0
+    assert len(calls) == 2 and all(isinstance(c, threading.Event) for c in calls)
+
+
+def test_late_finisher_is_closed():
+    """취소를 확인하기 전에 끝난 진 요청은 응답을 닫음"""
+    late = FakeResponse("late")
+    release = threading.Event()
+    calls = []
+
+    def send(cancelled):
+        calls.append(cancelled)
+        if len(calls) == 1:
+            release.wait(2.0)
+            return late
+        return FakeResponse("hedge")
+
+    assert hedged_call(send, 0.05, lambda: True, "test").label == "hedge"
+    release.set()
+    for _ in range(100):
+        if late.closed:
+            break
+        time.sleep(0.01)
+    assert late.closed
+
+
+def test_no_hedge_without_budget_or_stats():
+    aborted = threading.Event()
+    assert hedged_call(lambda cancelled: FakeResponse(str(cancelled)), None, lambda: True).label == "None"
+    result = hedged_call(slow_send(aborted, 0.2), 0.05, lambda: False, "test")
+    assert result.label == "slow" and not aborted.is_set()
+
+
+def test_deadline_cancels_everything():
+    aborted = threading.Event()
+    with pytest.raises(DeadlineExceeded):
+        hedged_call(slow_send(aborted), 0.05, lambda: False, "test", deadline=Deadline.after(0.2))
+    assert aborted.wait(1.0)
+
+
+def test_read_body_aborts_on_cancel():
+    """_read_body가 청크마다 취소를 확인하고 소켓을 닫는지"""
+    from korean_ota_scraper import NaverHotelScraper
+
+    cancelled = threading.Event()
+
+    class EndlessRaw:
+        closed = False
+        reads = 0
+
+        def read1(self, amt, decode_content=True):
+            self.reads += 1
+            if self.reads == 3:
+                cancelled.set()         # 세 번째 청크를 받는 동안 헤지에서 짐
+            return b"x" * 10
+
+        def close(self):
+            self.closed = True
+
+    class Response:
+        raw = EndlessRaw()
+
+        def close(self):
+            pass
+
+    response = Response()
+    with pytest.raises(HedgeCancelled):
+        NaverHotelScraper()._read_body(response, cancelled)
+    assert response.raw.closed
+    assert response.raw.reads == 3
+    assert response._content == b"x" * 30
+
+
+def test_percentile_censored():
+    assert percentile([1.0, 2.0, 3.0, None], 50) == 2.0
+    assert percentile([1.0, 2.0, 3.0, None], 99) is None
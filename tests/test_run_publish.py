@@ -0,0 +1,63 @@
+"""run() 게시 단계 - 수집 결과가 없을 때 이전 데이터 보존"""
+
+import json
+import shutil
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+import run_scraper
+from deadline import Deadline
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HOTELS_FILE = "korean_ota_hotels.json"
+
+
+def _fake_scraper_module(results):
+    class KoreanOTAScraper:
+        published = False
+
+        def scrape_distributed(self, deadline=None):
+            return list(results)
+
+        def mark_published(self):
+            KoreanOTAScraper.published = True
+
+    module = types.ModuleType("korean_ota_scraper")
+    module.KoreanOTAScraper = KoreanOTAScraper
+    return module
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """커밋된 호텔 파일(전부 48시간 넘게 지난 데이터) 사본에서 실행"""
+    shutil.copy(REPO_ROOT / HOTELS_FILE, tmp_path / HOTELS_FILE)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(run_scraper, "SCRAPING_ENABLED", True)
+    return tmp_path
+
+
+def test_empty_scrape_keeps_previous_file(workdir, monkeypatch):
+    module = _fake_scraper_module([])
+    monkeypatch.setitem(sys.modules, "korean_ota_scraper", module)
+    before = (workdir / HOTELS_FILE).read_bytes()
+    assert json.loads(before)["hotels"]
+
+    assert run_scraper.run(Deadline.after(60)) == 0
+
+    assert (workdir / HOTELS_FILE).read_bytes() == before
+    assert not (workdir / run_scraper.CHANGES_FILE).exists()
+    assert not module.KoreanOTAScraper.published
+
+
+def test_merge_drops_only_stale_previous():
+    engine = run_scraper.ARMYStayHubEngine()
+    fresh = {"name_en": "A", "platform": {"name": "Agoda"}, "last_update": "2099-01-01 00:00:00"}
+    recent = {"name_en": "B", "platform": {"name": "Agoda"}, "last_update": "2099-01-01 00:00:00"}
+    stale = {"name_en": "C", "platform": {"name": "Agoda"}, "last_update": "2000-01-01 00:00:00"}
+    replaced = {"name_en": "A", "platform": {"name": "Agoda"}, "last_update": "2000-01-01 00:00:00"}
+
+    merged = engine.merge_with_previous([fresh], [replaced, recent, stale])
+    assert merged == [fresh, recent]
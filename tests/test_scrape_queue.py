@@ -0,0 +1,82 @@
+"""ScrapeQueue - 수집 도중 죽은 배치 이어서 실행"""
+
+import pytest
+
+import scrape_queue
+from scrape_queue import ScrapeQueue, DONE, FAILED, PENDING, RUNNING
+
+
+CELLS = [
+    {"city_key": city, "platform": "agoda", "checkin": "2026-06-12", "checkout": "2026-06-13", "adults": 2}
+    for city in ("goyang", "hongdae", "seongsu", "busan")
+]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "scrape_queue.db")
+
+
+def crash_mid_run(db_path):
+    """작업 4개 시작 → 첫 작업만 완료 기록하고 프로세스가 죽은 상태"""
+    queue = ScrapeQueue(db_path)
+    batch_id = queue.create_batch(CELLS)
+    jobs = queue.pending_jobs(batch_id)
+    queue.mark_running([job["id"] for job in jobs])
+    queue.complete(jobs[0]["id"], [{"name": "Hotel A"}])
+    queue.release(jobs[3]["id"])        # 마감으로 시작 못 한 작업
+    return batch_id, jobs
+
+
+def test_resume_reruns_unfinished_jobs_only(db_path):
+    batch_id, jobs = crash_mid_run(db_path)
+
+    resumed = ScrapeQueue(db_path)      # 다음 실행 (새 연결)
+    assert resumed.open_batch() == batch_id
+    pending = resumed.pending_jobs(batch_id)
+    assert [job["city_key"] for job in pending] == ["hongdae", "seongsu", "busan"]
+    assert [job["status"] for job in pending] == [RUNNING, RUNNING, PENDING]
+    assert [job["attempts"] for job in pending] == [1, 1, 0]
+    assert resumed.batch_results(batch_id) == [{"name": "Hotel A"}]
+    assert resumed.counts(batch_id) == {DONE: 1, RUNNING: 2, PENDING: 1}
+
+
+def test_results_follow_priority_order(db_path):
+    batch_id, jobs = crash_mid_run(db_path)
+    resumed = ScrapeQueue(db_path)
+    for job in reversed(resumed.pending_jobs(batch_id)):
+        resumed.complete(job["id"], [{"name": job["city_key"]}])
+    assert resumed.batch_results(batch_id) == [
+        {"name": "Hotel A"}, {"name": "hongdae"}, {"name": "seongsu"}, {"name": "busan"}]
+
+
+def test_job_that_keeps_crashing_fails_after_max_attempts(db_path):
+    queue = ScrapeQueue(db_path, {"max_attempts": 2})
+    batch_id = queue.create_batch(CELLS[:1])
+    for _ in range(2):
+        jobs = ScrapeQueue(db_path, {"max_attempts": 2}).pending_jobs(batch_id)
+        assert len(jobs) == 1
+        queue.mark_running([jobs[0]["id"]])
+
+    assert ScrapeQueue(db_path, {"max_attempts": 2}).pending_jobs(batch_id) == []
+    assert queue.counts(batch_id) == {FAILED: 1}
+
+
+def test_published_batch_is_not_resumed(db_path):
+    batch_id, _ = crash_mid_run(db_path)
+    queue = ScrapeQueue(db_path)
+    queue.mark_published(batch_id)
+    assert queue.open_batch() is None
+
+
+def test_stale_batch_expires(db_path, monkeypatch):
+    crash_mid_run(db_path)
+    later = scrape_queue.time.time() + 7 * 3600
+    monkeypatch.setattr(scrape_queue.time, "time", lambda: later)
+    assert ScrapeQueue(db_path).open_batch() is None
+
+
+def test_duplicate_cells_are_ignored(db_path):
+    queue = ScrapeQueue(db_path)
+    batch_id = queue.create_batch(CELLS + CELLS[:2])
+    assert len(queue.pending_jobs(batch_id)) == len(CELLS)
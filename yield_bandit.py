@@ -0,0 +1,143 @@
+"""
+ARMY Stay Hub - 플랫폼 × 도시 수익률(yield) 밴딧
+
+어떤 플랫폼은 JS 전용 렌더링이라 매번 0개를 돌려주고(test_scraper 참고),
+어떤 플랫폼은 요청 한 번에 카드 30개를 준다. 셀(도시 × 플랫폼)마다
+"요청당 / 초당 새로 생기거나 바뀐 호텔 수"를 실행 간에 누적하고,
+UCB1 정책으로 실행당 요청 예산을 잘 나오는 셀 쪽으로 몰아준다.
+
+- 보상: 요청당 새/변경 호텔 수 ÷ reward_scale (0~1로 자름)
+- UCB = 평균 보상 + exploration × sqrt(2 ln(전체 시도) / 셀 시도)
+  → 덜 시도한 셀은 보너스로 계속 탐색
+- 오래된 기록은 decay로 줄여서 플랫폼 상태 변화(차단 해제, 마크업 변경)에 적응
+- 요청 없이 캐시로 끝난 작업은 비용 정보가 없으므로 기록하지 않음
+
+상태는 JSON 파일에 저장해서 크론 실행 간에 정책이 개선된다.
+"""
+
+import json
+import math
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# ===== 밴딧 설정 =====
+YIELD_STATS_FILE = "yield_stats.json"
+BANDIT_CONFIG = {
+    "exploration": 0.2,      # UCB 탐색 보너스 계수
+    "reward_scale": 30,      # 요청당 이만큼 나오면 보상 1.0 (페이지당 카드 수)
+    "decay": 0.98,           # 기록할 때마다 기존 누적값에 곱하는 감쇠
+}
+
+_bandit: Optional["YieldBandit"] = None
+_bandit_lock = threading.Lock()
+
+
+class YieldBandit:
+    """셀별 수익률 통계 + UCB1 가중치"""
+
+    def __init__(self, stats_file: str = YIELD_STATS_FILE, config: Dict = None):
+        self.stats_file = stats_file
+        self.config = {**BANDIT_CONFIG, **(config or {})}
+        self._lock = threading.Lock()
+        self.arms: Dict[str, Dict] = self._load_stats()
+
+    # ----- 저장 -----
+
+    def _load_stats(self) -> Dict:
+        if not os.path.exists(self.stats_file):
+            return {}
+        try:
+            with open(self.stats_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get("arms", {})
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def save(self):
+        """통계 저장 (임시 파일 → 교체)"""
+        with self._lock:
+            tmp_path = f"{self.stats_file}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"updated_at": datetime.now().isoformat(), "arms": self.arms},
+                          f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.stats_file)
+
+    # ----- 기록 -----
+
+    def record(self, key: str, yielded: int, requests: int, seconds: float):
+        """
+        셀 한 번 수집 결과 기록
+
+        Args:
+            key: 셀 키 ("city:platform")
+            yielded: 새로 생기거나 바뀐 호텔 수
+            requests: 실제 네트워크 요청 수
+            seconds: 소요 시간
+        """
+        if requests <= 0:
+            return
+        reward = min(1.0, yielded / requests / self.config["reward_scale"])
+        decay = self.config["decay"]
+
+        with self._lock:
+            arm = self.arms.setdefault(key, {
+                "pulls": 0.0, "reward_sum": 0.0,
+                "hotels": 0.0, "requests": 0.0, "seconds": 0.0,
+            })
+            for field in ("pulls", "reward_sum", "hotels", "requests", "seconds"):
+                arm[field] *= decay
+            arm["pulls"] += 1
+            arm["reward_sum"] += reward
+            arm["hotels"] += yielded
+            arm["requests"] += requests
+            arm["seconds"] += seconds
+
+    # ----- 정책 -----
+
+    def yield_per_request(self, key: str) -> float:
+        arm = self.arms.get(key)
+        return arm["hotels"] / arm["requests"] if arm and arm["requests"] else 0.0
+
+    def yield_per_second(self, key: str) -> float:
+        arm = self.arms.get(key)
+        return arm["hotels"] / arm["seconds"] if arm and arm["seconds"] else 0.0
+
+    def ucb(self, key: str, total_pulls: float) -> float:
+        """
+        셀의 UCB1 값
+
+        한 번도 시도하지 않은 셀은 "보상 1.0을 한 번 받은 셀"로 보고 낙관적으로 평가
+        (무한대 대신 유한값이라 스케줄러 점수에 곱해도 순서가 유지된다)
+        """
+        bonus_log = math.log(max(total_pulls, 1.0) + 1)
+        arm = self.arms.get(key)
+        if not arm or arm["pulls"] < 1e-9:
+            return 1.0 + self.config["exploration"] * math.sqrt(2 * bonus_log)
+        mean = arm["reward_sum"] / arm["pulls"]
+        return mean + self.config["exploration"] * math.sqrt(2 * bonus_log / arm["pulls"])
+
+    def weights(self, keys: List[str]) -> Dict[str, float]:
+        """셀 키 목록 → UCB 가중치 (스케줄러 점수에 곱함)"""
+        with self._lock:
+            total = sum(self.arms[k]["pulls"] for k in keys if k in self.arms)
+            return {key: self.ucb(key, total) for key in keys}
+
+    def report(self, keys: List[str]):
+        """셀별 수익률 출력 (요청당 / 초당)"""
+        rows = [(k, self.yield_per_request(k), self.yield_per_second(k)) for k in keys if k in self.arms]
+        if not rows:
+            return
+        print("📈 셀별 수익률 (요청당 / 초당 새·변경 호텔):")
+        for key, per_request, per_second in sorted(rows, key=lambda r: -r[1]):
+            print(f"   - {key}: {per_request:.1f} / {per_second:.2f}")
+
+
+def get_yield_bandit() -> YieldBandit:
+    """프로세스 공유 밴딧 (최초 호출 시 파일에서 로드)"""
+    global _bandit
+    if _bandit is None:
+        with _bandit_lock:
+            if _bandit is None:
+                _bandit = YieldBandit(YIELD_STATS_FILE)
+    return _bandit